@@ -26,7 +26,7 @@ target=${1-:app}
 printf "Running ${target} ...\n"
 
 if [[ "${target}" == iris-worker ]] ; then
-    celery -A app.celery worker -E -B -l INFO &
+    IRIS_COMPONENT=worker celery -A app.celery worker -E -B -l INFO &
 else
     gunicorn app:app --worker-class eventlet --bind 0.0.0.0:8000 --timeout 180 --worker-connections 1000 --log-level=info &
 fi
@@ -132,4 +132,7 @@ socket_io.on_namespace(alerts_namespace)
 def shutdown_session(exception=None):
     db.session.remove()
 
-from app import views
+if app.config.get('IRIS_COMPONENT') == 'worker':
+    from app import worker
+else:
+    from app import views
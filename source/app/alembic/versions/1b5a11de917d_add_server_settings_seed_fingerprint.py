@@ -0,0 +1,35 @@
+"""Add server settings seed fingerprint
+
+Revision ID: 1b5a11de917d
+Revises: f8a03d6b2c19
+Create Date: 2026-10-19 18:12:40.530217
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.alembic.alembic_utils import _table_has_column
+
+
+# revision identifiers, used by Alembic.
+revision = '1b5a11de917d'
+down_revision = 'f8a03d6b2c19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fingerprint of the base objects last created at startup, so unchanged ones are not created again
+    if not _table_has_column('server_settings', 'seed_fingerprint'):
+        op.add_column('server_settings',
+                      sa.Column('seed_fingerprint', sa.Text, nullable=True)
+                      )
+
+    pass
+
+
+def downgrade():
+    if _table_has_column('server_settings', 'seed_fingerprint'):
+        op.drop_column('server_settings', 'seed_fingerprint')
+
+    pass
@@ -0,0 +1,53 @@
+"""Add IOC and asset IP network indexes
+
+Revision ID: 5d2b8f0e6c13
+Revises: 9c4e71d2a5b8
+Create Date: 2026-10-19 21:14:52.318406
+
+"""
+from alembic import op
+
+from app.alembic.alembic_utils import _table_has_column
+from app.models.models import TEXT_TO_INET_FUNCTION_SQL
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2b8f0e6c13'
+down_revision = '9c4e71d2a5b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # IP addresses and networks held by the IOC values and assets, computed by the database on every write
+    op.execute(TEXT_TO_INET_FUNCTION_SQL)
+
+    if not _table_has_column('ioc', 'ioc_value_inet'):
+        op.execute('ALTER TABLE ioc ADD COLUMN ioc_value_inet inet '
+                   'GENERATED ALWAYS AS (iris_text_to_inet(ioc_value)) STORED')
+
+    if not _table_has_column('case_assets', 'asset_ip_inet'):
+        op.execute('ALTER TABLE case_assets ADD COLUMN asset_ip_inet inet '
+                   'GENERATED ALWAYS AS (iris_text_to_inet(asset_ip)) STORED')
+
+    op.execute('CREATE INDEX IF NOT EXISTS ix_ioc_value_inet ON ioc '
+               'USING gist (ioc_value_inet inet_ops) WHERE ioc_value_inet IS NOT NULL')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_case_assets_asset_ip_inet ON case_assets '
+               'USING gist (asset_ip_inet inet_ops) WHERE asset_ip_inet IS NOT NULL')
+
+    pass
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_case_assets_asset_ip_inet')
+    op.execute('DROP INDEX IF EXISTS ix_ioc_value_inet')
+
+    if _table_has_column('case_assets', 'asset_ip_inet'):
+        op.drop_column('case_assets', 'asset_ip_inet')
+
+    if _table_has_column('ioc', 'ioc_value_inet'):
+        op.drop_column('ioc', 'ioc_value_inet')
+
+    op.execute('DROP FUNCTION IF EXISTS iris_text_to_inet(text)')
+
+    pass
@@ -0,0 +1,75 @@
+"""Move modification history to object history table
+
+Revision ID: 6a1f0b3c8e54
+Revises: d3f81c0a6e27
+Create Date: 2026-10-19 11:34:05.918273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+from app.alembic.alembic_utils import _table_has_column
+
+# revision identifiers, used by Alembic.
+revision = '6a1f0b3c8e54'
+down_revision = 'd3f81c0a6e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _has_table('object_history'):
+        op.create_table('object_history',
+                        sa.Column('id', sa.BigInteger, primary_key=True),
+                        sa.Column('object_type', sa.Text, nullable=False),
+                        sa.Column('object_id', sa.BigInteger, nullable=False),
+                        sa.Column('ts', sa.TIMESTAMP, nullable=False),
+                        sa.Column('user_id', sa.BigInteger, sa.ForeignKey('user.id'), nullable=True),
+                        sa.Column('user_name', sa.Text),
+                        sa.Column('action', sa.Text)
+                        )
+        op.create_index('ix_object_history_object_type_object_id_ts', 'object_history',
+                        ['object_type', 'object_id', 'ts'])
+
+    # Table name -> primary key of the objects holding a modification_history column
+    tables = {
+        'cases': 'case_id',
+        'alerts': 'alert_id',
+        'ioc': 'ioc_id',
+        'case_assets': 'asset_id',
+        'case_received_file': 'id',
+        'case_tasks': 'id',
+        'notes': 'note_id',
+        'cases_events': 'event_id',
+        'data_store_file': 'file_id'
+    }
+
+    conn = op.get_bind()
+    for table, primary_key in tables.items():
+        if not _table_has_column(table, 'modification_history'):
+            continue
+
+        # Each key of the JSON blob is the timestamp of an entry
+        conn.execute(text(f"""
+            INSERT INTO object_history (object_type, object_id, ts, user_id, user_name, action)
+            SELECT '{table}', t.{primary_key}, to_timestamp(h.key::double precision) AT TIME ZONE 'UTC',
+                   u.id, h.value->>'user', h.value->>'action'
+            FROM "{table}" t
+            CROSS JOIN LATERAL json_each(t.modification_history::json) h
+            LEFT JOIN "user" u ON u.id::text = h.value->>'user_id'
+            WHERE t.modification_history IS NOT NULL
+              AND json_typeof(t.modification_history::json) = 'object'
+              AND h.key ~ '^[0-9]+(\\.[0-9]+)?$'
+        """))
+
+        conn.execute(text(f"""
+            UPDATE "{table}" SET modification_history = NULL WHERE modification_history IS NOT NULL
+        """))
+
+    pass
+
+
+def downgrade():
+    pass
@@ -0,0 +1,48 @@
+"""Add IOC value hash and pattern indexes
+
+Revision ID: 9c4e71d2a5b8
+Revises: 1b5a11de917d
+Create Date: 2026-10-19 20:31:12.604518
+
+"""
+from alembic import op
+
+from app.alembic.alembic_utils import _table_has_column
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e71d2a5b8'
+down_revision = '1b5a11de917d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Normalized hash of the IOC values, computed by the database so every write path maintains it
+    if not _table_has_column('ioc', 'ioc_value_hash'):
+        op.execute('ALTER TABLE ioc ADD COLUMN ioc_value_hash uuid '
+                   'GENERATED ALWAYS AS (md5(lower(btrim(ioc_value)))::uuid) STORED')
+
+    op.execute('CREATE INDEX IF NOT EXISTS ix_ioc_value_hash_type_id ON ioc (ioc_value_hash, ioc_type_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_ioc_value_prefix '
+               'ON ioc (left(lower(ioc_value), 255) text_pattern_ops)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_ioc_value_suffix '
+               'ON ioc (left(reverse(lower(ioc_value)), 255) text_pattern_ops)')
+
+    op.execute('CREATE INDEX IF NOT EXISTS ix_ioc_link_ioc_id_case_id ON ioc_link (ioc_id, case_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_ioc_link_case_id ON ioc_link (case_id)')
+
+    pass
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_ioc_link_case_id')
+    op.execute('DROP INDEX IF EXISTS ix_ioc_link_ioc_id_case_id')
+    op.execute('DROP INDEX IF EXISTS ix_ioc_value_suffix')
+    op.execute('DROP INDEX IF EXISTS ix_ioc_value_prefix')
+    op.execute('DROP INDEX IF EXISTS ix_ioc_value_hash_type_id')
+
+    if _table_has_column('ioc', 'ioc_value_hash'):
+        op.drop_column('ioc', 'ioc_value_hash')
+
+    pass
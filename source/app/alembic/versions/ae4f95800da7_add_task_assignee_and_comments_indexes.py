@@ -0,0 +1,30 @@
+"""Add task assignee and task comments indexes
+
+Revision ID: ae4f95800da7
+Revises: 9e4947a207a6
+Create Date: 2026-10-19 09:12:41.203518
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'ae4f95800da7'
+down_revision = '9e4947a207a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tasks listing fetches assignees and comments counts of all the tasks of a case with IN queries
+    op.execute('CREATE INDEX IF NOT EXISTS ix_task_assignee_task_id ON task_assignee (task_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_task_comments_comment_task_id ON task_comments (comment_task_id)')
+
+    pass
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_task_assignee_task_id')
+    op.execute('DROP INDEX IF EXISTS ix_task_comments_comment_task_id')
+
+    pass
@@ -0,0 +1,57 @@
+"""Add assets and similar alerts correlation hashes
+
+Revision ID: b3e92a64f7d1
+Revises: 5d2b8f0e6c13
+Create Date: 2026-10-19 22:02:37.941263
+
+"""
+from alembic import op
+
+from app.alembic.alembic_utils import _table_has_column
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e92a64f7d1'
+down_revision = '5d2b8f0e6c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Normalized hashes of the correlated values, so the assets and alerts matching a value are index lookups
+    if not _table_has_column('case_assets', 'asset_name_hash'):
+        op.execute('ALTER TABLE case_assets ADD COLUMN asset_name_hash uuid '
+                   'GENERATED ALWAYS AS (md5(lower(btrim(asset_name)))::uuid) STORED')
+
+    if not _table_has_column('similar_alerts_cache', 'asset_name_hash'):
+        op.execute('ALTER TABLE similar_alerts_cache ADD COLUMN asset_name_hash uuid '
+                   'GENERATED ALWAYS AS (md5(lower(btrim(asset_name)))::uuid) STORED')
+
+    if not _table_has_column('similar_alerts_cache', 'ioc_value_hash'):
+        op.execute('ALTER TABLE similar_alerts_cache ADD COLUMN ioc_value_hash uuid '
+                   'GENERATED ALWAYS AS (md5(lower(btrim(ioc_value)))::uuid) STORED')
+
+    op.execute('CREATE INDEX IF NOT EXISTS ix_case_assets_asset_name_hash_type_id '
+               'ON case_assets (asset_name_hash, asset_type_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_similar_alerts_cache_customer_id_ioc '
+               'ON similar_alerts_cache (customer_id, ioc_value_hash, ioc_type_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_similar_alerts_cache_customer_id_asset '
+               'ON similar_alerts_cache (customer_id, asset_name_hash, asset_type_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_similar_alerts_cache_alert_id ON similar_alerts_cache (alert_id)')
+
+    pass
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_similar_alerts_cache_alert_id')
+    op.execute('DROP INDEX IF EXISTS ix_similar_alerts_cache_customer_id_asset')
+    op.execute('DROP INDEX IF EXISTS ix_similar_alerts_cache_customer_id_ioc')
+    op.execute('DROP INDEX IF EXISTS ix_case_assets_asset_name_hash_type_id')
+
+    for table, column in (('similar_alerts_cache', 'ioc_value_hash'),
+                          ('similar_alerts_cache', 'asset_name_hash'),
+                          ('case_assets', 'asset_name_hash')):
+        if _table_has_column(table, column):
+            op.drop_column(table, column)
+
+    pass
@@ -0,0 +1,50 @@
+"""Add case stats table
+
+Revision ID: b7a4e2c91d05
+Revises: ae4f95800da7
+Create Date: 2026-10-19 10:02:17.481265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = 'b7a4e2c91d05'
+down_revision = 'ae4f95800da7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _has_table('case_stats'):
+        op.create_table('case_stats',
+                        sa.Column('case_id', sa.BigInteger, sa.ForeignKey('cases.case_id', ondelete='CASCADE'),
+                                  primary_key=True),
+                        sa.Column('owner_id', sa.BigInteger, sa.ForeignKey('user.id'), nullable=True, index=True),
+                        sa.Column('case_open', sa.Boolean, nullable=False, server_default=text('true')),
+                        sa.Column('open_tasks', sa.Integer, nullable=False, server_default=text('0')),
+                        sa.Column('closed_tasks', sa.Integer, nullable=False, server_default=text('0')),
+                        sa.Column('iocs_count', sa.Integer, nullable=False, server_default=text('0')),
+                        sa.Column('assets_count', sa.Integer, nullable=False, server_default=text('0')),
+                        sa.Column('events_count', sa.Integer, nullable=False, server_default=text('0')),
+                        sa.Column('last_activity', sa.TIMESTAMP, nullable=True),
+                        sa.Column('stale', sa.Boolean, nullable=False, server_default=text('true'), index=True),
+                        sa.Column('refreshed_at', sa.TIMESTAMP, nullable=True)
+                        )
+
+    # Existing cases are flagged as stale, so their stats are computed on first read
+    conn = op.get_bind()
+    conn.execute(text("""
+        INSERT INTO case_stats (case_id, owner_id, case_open, stale)
+        SELECT case_id, owner_id, close_date IS NULL, true FROM cases
+        ON CONFLICT (case_id) DO NOTHING
+    """))
+
+    pass
+
+
+def downgrade():
+    pass
@@ -0,0 +1,32 @@
+"""Add user activity indexes
+
+Revision ID: d3f81c0a6e27
+Revises: b7a4e2c91d05
+Create Date: 2026-10-19 10:48:53.307412
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3f81c0a6e27'
+down_revision = 'b7a4e2c91d05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Activities are paginated on (activity_date, id) and fetched per case for the reports
+    op.execute('CREATE INDEX IF NOT EXISTS ix_user_activity_activity_date_id '
+               'ON user_activity (activity_date, id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_user_activity_case_id_activity_date '
+               'ON user_activity (case_id, activity_date)')
+
+    pass
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_user_activity_activity_date_id')
+    op.execute('DROP INDEX IF EXISTS ix_user_activity_case_id_activity_date')
+
+    pass
@@ -0,0 +1,44 @@
+"""Add datastore blob store
+
+Revision ID: e52c7a9d1f38
+Revises: 6a1f0b3c8e54
+Create Date: 2026-10-19 15:02:17.480312
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.alembic.alembic_utils import _has_table
+
+
+# revision identifiers, used by Alembic.
+revision = 'e52c7a9d1f38'
+down_revision = '6a1f0b3c8e54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _has_table('data_store_blob'):
+        op.create_table('data_store_blob',
+                        sa.Column('blob_id', sa.BigInteger(), primary_key=True),
+                        sa.Column('blob_sha256', sa.Text(), nullable=False),
+                        sa.Column('blob_password', sa.Text(), nullable=False, server_default=sa.text("''")),
+                        sa.Column('blob_local_name', sa.Text(), nullable=False, unique=True),
+                        sa.Column('blob_size', sa.BigInteger(), nullable=True),
+                        sa.Column('blob_ref_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+                        sa.Column('blob_date_added', sa.DateTime(), nullable=True),
+                        sa.UniqueConstraint('blob_sha256', 'blob_password',
+                                            name='uq_data_store_blob_sha256_password')
+                        )
+
+    # Files stored before the blob store keep their own location and are deleted directly
+    op.execute('CREATE INDEX IF NOT EXISTS ix_data_store_file_file_sha256 ON data_store_file (file_sha256)')
+
+    pass
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_data_store_file_file_sha256')
+
+    pass
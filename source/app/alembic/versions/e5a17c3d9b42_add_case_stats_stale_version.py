@@ -0,0 +1,35 @@
+"""Add case stats stale version
+
+Revision ID: e5a17c3d9b42
+Revises: b3e92a64f7d1
+Create Date: 2026-10-19 23:41:05.127394
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _table_has_column
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a17c3d9b42'
+down_revision = 'b3e92a64f7d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bumped when the stats are flagged as stale, so a refresh only clears the flag if no change happened meanwhile
+    if not _table_has_column('case_stats', 'stale_version'):
+        op.add_column('case_stats',
+                      sa.Column('stale_version', sa.Integer, nullable=False, server_default=text('0')))
+
+    pass
+
+
+def downgrade():
+    if _table_has_column('case_stats', 'stale_version'):
+        op.drop_column('case_stats', 'stale_version')
+
+    pass
@@ -0,0 +1,30 @@
+"""Add datastore folders and files parent indexes
+
+Revision ID: f8a03d6b2c19
+Revises: e52c7a9d1f38
+Create Date: 2026-10-19 16:47:05.118342
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a03d6b2c19'
+down_revision = 'e52c7a9d1f38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The datastore can be listed folder by folder
+    op.execute('CREATE INDEX IF NOT EXISTS ix_data_store_path_path_parent_id ON data_store_path (path_parent_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_data_store_file_file_parent_id ON data_store_file (file_parent_id)')
+
+    pass
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_data_store_path_path_parent_id')
+    op.execute('DROP INDEX IF EXISTS ix_data_store_file_file_parent_id')
+
+    pass
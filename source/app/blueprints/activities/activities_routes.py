@@ -21,15 +21,19 @@ import os
 from flask import Blueprint
 from flask import redirect
 from flask import render_template
+from flask import request
 from flask import url_for
 from flask_wtf import FlaskForm
 
 import app
+from app.datamgmt.activities.activities_db import decode_activities_cursor
+from app.datamgmt.activities.activities_db import get_activities_page
 from app.datamgmt.activities.activities_db import get_all_users_activities
 from app.datamgmt.activities.activities_db import get_users_activities
 from app.models.authorization import Permissions
 from app.util import ac_api_requires
 from app.util import ac_requires
+from app.util import response_error
 from app.util import response_success
 
 activities_blueprint = Blueprint(
@@ -53,27 +57,37 @@ def activities_index(caseid: int, url_redir):
     return render_template('activities.html', form=form)
 
 
+def _list_activities(include_unbound):
+    per_page = request.args.get('per_page', type=int)
+    if per_page is None:
+        data = get_all_users_activities() if include_unbound else get_users_activities()
+        return response_success("", data=data)
+
+    cursor = request.args.get('cursor', type=str)
+    if cursor:
+        cursor = decode_activities_cursor(cursor)
+        if cursor is None:
+            return response_error("Invalid cursor")
+
+    activities, next_cursor = get_activities_page(include_unbound=include_unbound,
+                                                  per_page=min(max(per_page, 1), 10000),
+                                                  cursor=cursor)
+
+    return response_success("", data={
+        "activities": activities,
+        "next_cursor": next_cursor
+    })
+
+
 @activities_blueprint.route('/activities/list', methods=['GET'])
 @ac_api_requires(Permissions.activities_read, Permissions.all_activities_read)
 def list_activities(caseid):
     # Get User activities from database
-
-    user_activities = get_users_activities()
-
-    data = [row._asdict() for row in user_activities]
-    data = sorted(data, key=lambda i: i['activity_date'], reverse=True)
-
-    return response_success("", data=data)
+    return _list_activities(include_unbound=False)
 
 
 @activities_blueprint.route('/activities/list-all', methods=['GET'])
 @ac_api_requires(Permissions.all_activities_read)
 def list_all_activities(caseid):
     # Get User activities from database
-
-    user_activities = get_all_users_activities()
-
-    data = [row._asdict() for row in user_activities]
-    data = sorted(data, key=lambda i: i['activity_date'], reverse=True)
-
-    return response_success("", data=data)
+    return _list_activities(include_unbound=True)
@@ -32,6 +32,8 @@ from app.datamgmt.alerts.alerts_db import get_filtered_alerts, get_alert_by_id,
     get_alert_comments, delete_alert_comment, get_alert_comment, delete_similar_alert_cache, delete_alerts, \
     create_case_from_alerts
 from app.datamgmt.case.case_db import get_case
+from app.datamgmt.history.history_db import get_object_history
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.manage.manage_access_control_db import check_ua_case_client, user_has_client_access
 from app.iris_engine.access_control.utils import ac_set_new_case_access
 from app.iris_engine.module_handler.module_handler import call_modules_hook
@@ -41,6 +43,7 @@ from app.models.authorization import Permissions
 from app.schema.marshables import AlertSchema, CaseSchema, CommentSchema, CaseAssetsSchema, IocSchema
 from app.util import ac_api_requires, response_error, add_obj_history_entry, ac_requires
 from app.util import response_success
+from app.util import response_success_stream
 
 alerts_blueprint = Blueprint(
     'alerts',
@@ -137,13 +140,13 @@ def alerts_list_route(caseid) -> Response:
 
     alerts = {
         'total': filtered_data.total,
-        'alerts': alert_schema.dump(filtered_data.items, many=True),
+        'alerts': (alert_schema.dump(alert) for alert in filtered_data.items),
         'last_page': filtered_data.pages,
         'current_page': filtered_data.page,
         'next_page': filtered_data.next_num if filtered_data.has_next else None,
     }
 
-    return response_success(data=alerts)
+    return response_success_stream(data=alerts)
 
 
 @alerts_blueprint.route('/alerts/add', methods=['POST'])
@@ -245,6 +248,7 @@ def alerts_get_route(caseid, alert_id) -> Response:
         return response_error('Alert not found')
 
     alert_dump = alert_schema.dump(alert)
+    alert_dump['modification_history'] = get_object_history_dict('alerts', alert_id)
 
     # Get similar alerts
     similar_alerts = get_related_alerts(alert.alert_customer_id, alert.assets, alert.iocs)
@@ -253,6 +257,45 @@ def alerts_get_route(caseid, alert_id) -> Response:
     return response_success(data=alert_dump)
 
 
+@alerts_blueprint.route('/alerts/<int:alert_id>/history', methods=['GET'])
+@ac_api_requires(Permissions.alerts_read, no_cid_required=True)
+def alerts_history_route(caseid, alert_id) -> Response:
+    """
+    Get a page of the modification history of an alert, most recent entries first
+
+    args:
+        caseid (str): The case id
+        alert_id (int): The alert id
+
+    returns:
+        Response: The response
+    """
+    alert = get_alert_by_id(alert_id)
+    if alert is None:
+        return response_error('Alert not found')
+
+    if not user_has_client_access(current_user.id, alert.alert_customer_id):
+        return response_error('Alert not found')
+
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 50, type=int)
+
+    history = get_object_history('alerts', alert_id, page=page, per_page=per_page)
+
+    return response_success(data={
+        'total': history.total,
+        'history': [{
+            'date': entry.ts,
+            'user': entry.user_name,
+            'user_id': entry.user_id,
+            'action': entry.action
+        } for entry in history.items],
+        'last_page': history.pages,
+        'current_page': history.page,
+        'next_page': history.next_num if history.has_next else None
+    })
+
+
 @alerts_blueprint.route('/alerts/similarities/<int:alert_id>', methods=['GET'])
 @ac_api_requires(Permissions.alerts_read, no_cid_required=True)
 def alerts_similarities_route(caseid, alert_id) -> Response:
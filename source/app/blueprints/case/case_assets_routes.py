@@ -16,7 +16,6 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import csv
 # IMPORTS ------------------------------------------------
 from datetime import datetime
 
@@ -28,6 +27,7 @@ from flask import request
 from flask import url_for
 from flask_login import current_user
 
+from app import app
 from app import db
 from app.blueprints.case.case_comments import case_comment_update
 from app.datamgmt.case.case_assets_db import add_comment_to_asset
@@ -36,7 +36,6 @@ from app.datamgmt.case.case_assets_db import delete_asset
 from app.datamgmt.case.case_assets_db import delete_asset_comment
 from app.datamgmt.case.case_assets_db import get_analysis_status_list
 from app.datamgmt.case.case_assets_db import get_asset
-from app.datamgmt.case.case_assets_db import get_asset_type_id
 from app.datamgmt.case.case_assets_db import get_assets
 from app.datamgmt.case.case_assets_db import get_assets_ioc_links
 from app.datamgmt.case.case_assets_db import get_assets_types
@@ -46,11 +45,12 @@ from app.datamgmt.case.case_assets_db import get_case_assets_comments_count
 from app.datamgmt.case.case_assets_db import get_compromise_status_list
 from app.datamgmt.case.case_assets_db import get_linked_iocs_finfo_from_asset
 from app.datamgmt.case.case_assets_db import get_linked_iocs_id_from_asset
-from app.datamgmt.case.case_assets_db import get_similar_assets
 from app.datamgmt.case.case_assets_db import set_ioc_links
 from app.datamgmt.case.case_db import get_case
 from app.datamgmt.case.case_db import get_case_client_id
 from app.datamgmt.case.case_iocs_db import get_iocs
+from app.datamgmt.correlations.correlations_db import get_case_assets_correlations
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
 from app.datamgmt.manage.manage_users_db import get_user_cases_fast
 from app.datamgmt.states import get_assets_state
@@ -58,8 +58,13 @@ from app.datamgmt.states import update_assets_state
 from app.forms import AssetBasicForm
 from app.forms import ModalAddCaseAssetForm
 from app.iris_engine.module_handler.module_handler import call_modules_hook
+from app.iris_engine.tasker.tasks import task_bulk_import_assets
+from app.iris_engine.utils.bulk_import import bulk_import_assets
+from app.iris_engine.utils.bulk_import import count_import_rows
+from app.iris_engine.utils.bulk_import import import_message
+from app.iris_engine.utils.bulk_import import remove_import_csv
+from app.iris_engine.utils.bulk_import import save_import_csv
 from app.iris_engine.utils.tracker import track_activity
-from app.models import AnalysisStatus
 from app.models.authorization import CaseAccessLevel
 from app.schema.marshables import CaseAssetsSchema
 from app.schema.marshables import CommentSchema
@@ -67,6 +72,7 @@ from app.util import ac_api_case_requires
 from app.util import ac_case_requires
 from app.util import response_error
 from app.util import response_success
+from app.util import response_success_stream
 
 case_assets_blueprint = Blueprint('case_assets',
                                   __name__,
@@ -105,9 +111,6 @@ def case_list_assets(caseid):
     assets = get_assets(caseid)
     customer_id = get_case_client_id(caseid)
 
-    ret = {}
-    ret['assets'] = []
-
     ioc_links_req = get_assets_ioc_links(caseid)
 
     cache_ioc_link = {}
@@ -118,25 +121,24 @@ def case_list_assets(caseid):
         else:
             cache_ioc_link[ioc.asset_id].append(ioc._asdict())
 
-    cases_access = get_user_cases_fast(current_user.id)
+    # Find similar assets from other cases with the same customer
+    assets_links = get_case_assets_correlations(caseid, customer_id, get_user_cases_fast(current_user.id))
 
-    for asset in assets:
-        asset = asset._asdict()
+    def iter_assets():
+        for asset in assets:
+            asset = asset._asdict()
 
-        if len(assets) < 300:
-            # Find similar assets from other cases with the same customer
-            asset['link'] = list(get_similar_assets(
-                asset['asset_name'], asset['asset_type_id'], caseid, customer_id, cases_access))
-        else:
-            asset['link'] = []
+            asset['link'] = assets_links.get(asset['asset_id'], [])
 
-        asset['ioc_links'] = cache_ioc_link.get(asset['asset_id'])
+            asset['ioc_links'] = cache_ioc_link.get(asset['asset_id'])
 
-        ret['assets'].append(asset)
+            yield asset
 
+    ret = {}
+    ret['assets'] = iter_assets()
     ret['state'] = get_assets_state(caseid=caseid)
 
-    return response_success("", data=ret)
+    return response_success_stream("", data=ret)
 
 
 @case_assets_blueprint.route('/case/assets/state', methods=['GET'])
@@ -201,98 +203,28 @@ def add_asset(caseid):
 @case_assets_blueprint.route('/case/assets/upload', methods=['POST'])
 @ac_api_case_requires(CaseAccessLevel.full_access)
 def case_upload_ioc(caseid):
+    jsdata = request.get_json()
+    csv_data = jsdata.get("CSVData") if isinstance(jsdata, dict) else None
+    if not isinstance(csv_data, str) or not csv_data.strip():
+        return response_error("No CSV data provided")
 
-    try:
-        # validate before saving
-        add_asset_schema = CaseAssetsSchema()
-        jsdata = request.get_json()
-
-        # get IOC list from request
-        csv_lines = jsdata["CSVData"].splitlines() # unavoidable since the file is passed as a string
-
-        headers = "asset_name,asset_type_name,asset_description,asset_ip,asset_domain,asset_tags"
-
-        if csv_lines[0].lower() != headers:
-            csv_lines.insert(0, headers)
-
-        # convert list of strings into CSV
-        csv_data = csv.DictReader(csv_lines, delimiter=',')
-
-        ret = []
-        errors = []
-
-        analysis_status = AnalysisStatus.query.filter(AnalysisStatus.name == 'Unspecified').first()
-        analysis_status_id = analysis_status.id
-
-        index = 0
-        for row in csv_data:
-            missing_field = False
-            for e in headers.split(','):
-                if row.get(e) is None:
-                    errors.append(f"{e} is missing for row {index}")
-                    missing_field = True
-                    continue
+    is_from_api = request.cookies.get('session') is None
 
-            if missing_field:
-                continue
+    if count_import_rows(csv_data) > app.config.get('BULK_IMPORT_SYNC_MAX_ROWS'):
+        csv_path = save_import_csv(csv_data)
+        try:
+            task = task_bulk_import_assets.delay(caseid=caseid, user_id=current_user.id, init_user=current_user.name,
+                                                 csv_path=csv_path, is_from_api=is_from_api)
+        except Exception:
+            remove_import_csv(csv_path)
+            raise
 
-            # Asset name must not be empty
-            if not row.get("asset_name"):
-                errors.append(f"Empty asset name for row {index}")
-                track_activity(f"Attempted to upload an empty asset name")
-                index += 1
-                continue
+        return response_success(msg="Import queued", data={'task_id': task.id})
 
-            if row.get("asset_tags"):
-                row["asset_tags"] = row.get("asset_tags").replace("|", ",")  # Reformat Tags
+    imported, errors = bulk_import_assets(csv_data, case_id=caseid, user_id=current_user.id,
+                                          user_name=current_user.name, is_from_api=is_from_api)
 
-            if not row.get('asset_type_name'):
-                errors.append(f"Empty asset type for row {index}")
-                track_activity(f"Attempted to upload an empty asset type")
-                index += 1
-                continue
-
-            type_id = get_asset_type_id(row['asset_type_name'].lower())
-            if not type_id:
-                errors.append(f"{row.get('asset_name')} (invalid asset type: {row.get('asset_type_name')}) for row {index}")
-                track_activity(f"Attempted to upload unrecognized asset type \"{row.get('asset_type_name')}\"")
-                index += 1
-                continue
-
-            row['asset_type_id'] = type_id.asset_id
-            row.pop('asset_type_name', None)
-
-            row['analysis_status_id'] = analysis_status_id
-
-            request_data = call_modules_hook('on_preload_asset_create', data=row, caseid=caseid)
-            asset_sc = add_asset_schema.load(request_data)
-            asset_sc.custom_attributes = get_default_custom_attributes('asset')
-            asset = create_asset(asset=asset_sc,
-                                 caseid=caseid,
-                                 user_id=current_user.id
-                                 )
-
-            asset = call_modules_hook('on_postload_asset_create', data=asset, caseid=caseid)
-
-            if not asset:
-                errors.append(f"Unable to add asset for internal reason")
-                index += 1
-                continue
-
-            ret.append(request_data)
-            track_activity(f"added asset {asset.asset_name}", caseid=caseid)
-
-            index += 1
-
-        if len(errors) == 0:
-            msg = "Successfully imported data."
-        else:
-            msg = "Data is imported but we got errors with the following rows:\n- " + "\n- ".join(errors)
-
-        return response_success(msg=msg, data=ret)
-
-    except marshmallow.exceptions.ValidationError as e:
-        return response_error(msg="Data error", data=e.messages, status=400)
+    return response_success(msg=import_message(errors), data=CaseAssetsSchema(many=True).dump(imported))
 
 
 @case_assets_blueprint.route('/case/assets/<int:cur_id>', methods=['GET'])
@@ -311,6 +243,7 @@ def asset_view(cur_id, caseid):
     asset_schema = CaseAssetsSchema()
     data = asset_schema.dump(asset)
     data['linked_ioc'] = ioc_prefill
+    data['modification_history'] = get_object_history_dict('case_assets', cur_id)
 
     return response_success(data=data)
 
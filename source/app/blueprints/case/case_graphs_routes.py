@@ -16,8 +16,6 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import itertools
-from datetime import datetime
 from flask import Blueprint
 from flask import redirect
 from flask import render_template
@@ -25,9 +23,15 @@ from flask import url_for
 from flask_login import current_user
 from flask_wtf import FlaskForm
 
+from app import app
+from app import cache
 from app.datamgmt.case.case_db import get_case
 from app.datamgmt.case.case_events_db import get_case_events_assets_graph
 from app.datamgmt.case.case_events_db import get_case_events_ioc_graph
+from app.datamgmt.states import get_assets_state
+from app.datamgmt.states import get_ioc_state
+from app.datamgmt.states import get_timeline_state
+from app.iris_engine.utils.case_graph import CaseGraphBuilder
 from app.models.authorization import CaseAccessLevel
 from app.util import ac_api_case_requires
 from app.util import ac_case_requires
@@ -54,97 +58,25 @@ def case_graph(caseid, url_redir):
 @case_graph_blueprint.route('/case/graph/getdata', methods=['GET'])
 @ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
 def case_graph_get_data(caseid):
-    events = get_case_events_assets_graph(caseid)
-    events.extend(get_case_events_ioc_graph(caseid))
-
-    nodes = []
-    edges = []
-    dates = {
-        "human": [],
-        "machine": []
-    }
-
-    tmp = {}
-    for event in events:
-        if hasattr(event, 'asset_compromise_status_id'):
-            if event.asset_compromise_status_id == 1:
-                img = event.asset_icon_compromised
-
-            else:
-                img = event.asset_icon_not_compromised
-
-            if event.asset_ip:
-                title = "{} -{}".format(event.asset_ip, event.asset_description)
-            else:
-                title = "{}".format(event.asset_description)
-            label = event.asset_name
-            idx = f'a{event.asset_id}'
-            node_type = 'asset'
-
-        else:
-            img = 'virus-covid-solid.png'
-            label = event.ioc_value
-            title = event.ioc_description
-            idx = f'b{event.ioc_id}'
-            node_type = 'ioc'
-
-        try:
-            date = "{}-{}-{}".format(event.event_date.day, event.event_date.month, event.event_date.year)
-        except:
-            date = '15-05-2021'
-
-        if date not in dates:
-            dates['human'].append(date)
-            dates['machine'].append(datetime.timestamp(event.event_date))
-
-        new_node = {
-            'id': idx,
-            'label': label,
-            'image': '/static/assets/img/graph/' + img,
-            'shape': 'image',
-            'title': title,
-            'value': 1
-        }
-
-        if current_user.in_dark_mode:
-            new_node['font'] = "12px verdana white"
-
-        if not any(node['id'] == idx for node in nodes):
-            nodes.append(new_node)
-
-        ak = {
-            'node_id': idx,
-            'node_title': "{} - {}".format(event.event_date, event.event_title),
-            'node_name': label,
-            'node_type': node_type
-        }
-        if tmp.get(event.event_id):
-            tmp[event.event_id]['list'].append(ak)
-
-        else:
-            tmp[event.event_id] = {
-                'master_node':  [],
-                'list': [ak]
-            }
-
-    for event_id in tmp:
-        for subset in itertools.combinations(tmp[event_id]['list'], 2):
-
-            if subset[0]['node_type'] == 'ioc' and subset[1]['node_type'] == 'ioc' and len(tmp[event_id]['list']) != 2:
-                continue
-                
-            edge = {
-                'from': subset[0]['node_id'],
-                'to': subset[1]['node_id'],
-                'title': subset[0]['node_title'],
-                'dashes': subset[0]['node_type'] == 'ioc' or subset[1]['node_type'] == 'ioc'
-            }
-            edges.append(edge)
-
-    resp = {
-        'nodes': nodes,
-        'edges': edges,
-        'dates': dates
-    }
+    states = (get_timeline_state(caseid), get_assets_state(caseid), get_ioc_state(caseid))
+    cache_key = 'case_graph_{}_{}_{}'.format(
+        caseid,
+        '_'.join(str(state.get('object_state')) if state else '-1' for state in states),
+        current_user.in_dark_mode
+    )
+
+    resp = cache.get(cache_key)
+    if resp is None:
+        graph = CaseGraphBuilder(dark_mode=current_user.in_dark_mode,
+                                 max_event_edges=app.config.get('GRAPH_MAX_EVENT_EDGES'))
+
+        for event in get_case_events_assets_graph(caseid):
+            graph.add_link(event)
+
+        for event in get_case_events_ioc_graph(caseid):
+            graph.add_link(event)
+
+        resp = graph.build()
+        cache.set(cache_key, resp)
 
     return response_success("", data=resp)
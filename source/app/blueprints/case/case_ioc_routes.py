@@ -19,8 +19,6 @@
 # IMPORTS ------------------------------------------------
 from datetime import datetime
 
-import csv
-import logging as log
 import marshmallow
 from flask import Blueprint
 from flask import redirect
@@ -29,6 +27,7 @@ from flask import request
 from flask import url_for
 from flask_login import current_user
 
+from app import app
 from app import db
 from app.blueprints.case.case_comments import case_comment_update
 from app.datamgmt.case.case_assets_db import get_assets_types
@@ -44,17 +43,23 @@ from app.datamgmt.case.case_iocs_db import get_case_ioc_comments
 from app.datamgmt.case.case_iocs_db import get_case_iocs_comments_count
 from app.datamgmt.case.case_iocs_db import get_detailed_iocs
 from app.datamgmt.case.case_iocs_db import get_ioc
-from app.datamgmt.case.case_iocs_db import get_ioc_links
-from app.datamgmt.case.case_iocs_db import get_ioc_type_id
 from app.datamgmt.case.case_iocs_db import get_ioc_types_list
 from app.datamgmt.case.case_iocs_db import get_tlps
-from app.datamgmt.case.case_iocs_db import get_tlps_dict
+from app.datamgmt.correlations.correlations_db import get_case_iocs_correlations
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
 from app.datamgmt.states import get_ioc_state
 from app.datamgmt.states import update_ioc_state
 from app.forms import ModalAddCaseAssetForm
 from app.forms import ModalAddCaseIOCForm
+from app.iris_engine.access_control.utils import ac_get_fast_user_cases_access
 from app.iris_engine.module_handler.module_handler import call_modules_hook
+from app.iris_engine.tasker.tasks import task_bulk_import_iocs
+from app.iris_engine.utils.bulk_import import bulk_import_iocs
+from app.iris_engine.utils.bulk_import import count_import_rows
+from app.iris_engine.utils.bulk_import import import_message
+from app.iris_engine.utils.bulk_import import remove_import_csv
+from app.iris_engine.utils.bulk_import import save_import_csv
 from app.iris_engine.utils.tracker import track_activity
 from app.models.authorization import CaseAccessLevel
 from app.models.models import Ioc
@@ -64,6 +69,7 @@ from app.util import ac_api_case_requires
 from app.util import ac_case_requires
 from app.util import response_error
 from app.util import response_success
+from app.util import response_success_stream
 
 case_ioc_blueprint = Blueprint(
     'case_ioc',
@@ -93,24 +99,24 @@ def case_ioc(caseid, url_redir):
 def case_list_ioc(caseid):
     iocs = get_detailed_iocs(caseid)
 
-    ret = {}
-    ret['ioc'] = []
-
-    for ioc in iocs:
-        out = ioc._asdict()
+    # Get links of the IoCs seen in other cases
+    iocs_links = get_case_iocs_correlations(caseid, ac_get_fast_user_cases_access(current_user.id))
 
-        # Get links of the IoCs seen in other cases
-        ial = get_ioc_links(ioc.ioc_id, caseid)
+    def iter_iocs():
+        for ioc in iocs:
+            out = ioc._asdict()
 
-        out['link'] = [row._asdict() for row in ial]
-        # Legacy, must be changed next version
-        out['misp_link'] = None
+            out['link'] = iocs_links.get(ioc.ioc_id, [])
+            # Legacy, must be changed next version
+            out['misp_link'] = None
 
-        ret['ioc'].append(out)
+            yield out
 
+    ret = {}
+    ret['ioc'] = iter_iocs()
     ret['state'] = get_ioc_state(caseid=caseid)
 
-    return response_success("", data=ret)
+    return response_success_stream("", data=ret)
 
 
 @case_ioc_blueprint.route('/case/ioc/state', methods=['GET'])
@@ -165,96 +171,28 @@ def case_add_ioc(caseid):
 @case_ioc_blueprint.route('/case/ioc/upload', methods=['POST'])
 @ac_api_case_requires(CaseAccessLevel.full_access)
 def case_upload_ioc(caseid):
-    try:
-        # validate before saving
-        add_ioc_schema = IocSchema()
-        jsdata = request.get_json()
-
-        # get IOC list from request
-        headers = "ioc_value,ioc_type,ioc_description,ioc_tags,ioc_tlp"
-        csv_lines = jsdata["CSVData"].splitlines()  # unavoidable since the file is passed as a string
-        if csv_lines[0].lower() != headers:
-            csv_lines.insert(0, headers)
-
-        # convert list of strings into CSV
-        csv_data = csv.DictReader(csv_lines, quotechar='"', delimiter=',')
-
-        # build a Dict of possible TLP
-        tlp_dict = get_tlps_dict()
-        ret = []
-        errors = []
-
-        index = 0
-        for row in csv_data:
-
-            for e in headers.split(','):
-                if row.get(e) is None:
-                    errors.append(f"{e} is missing for row {index}")
-                    index += 1
-                    continue
-
-            # IOC value must not be empty
-            if not row.get("ioc_value"):
-                errors.append(f"Empty IOC value for row {index}")
-                track_activity(f"Attempted to upload an empty IOC value")
-                index += 1
-                continue
-
-            row["ioc_tags"] = row["ioc_tags"].replace("|", ",")  # Reformat Tags
-
-            # Convert TLP into TLP id
-            if row["ioc_tlp"] in tlp_dict:
-                row["ioc_tlp_id"] = tlp_dict[row["ioc_tlp"]]
-            else:
-                row["ioc_tlp_id"] = ""
-            row.pop("ioc_tlp", None)
-
-            type_id = get_ioc_type_id(row['ioc_type'].lower())
-            if not type_id:
-                errors.append(f"{row['ioc_value']} (invalid ioc type: {row['ioc_type']}) for row {index}")
-                log.error(f'Unrecognised IOC type {row["ioc_type"]}')
-                index += 1
-                continue
-
-            row['ioc_type_id'] = type_id.type_id
-            row.pop('ioc_type', None)
-
-            request_data = call_modules_hook('on_preload_ioc_create', data=row, caseid=caseid)
-
-            ioc = add_ioc_schema.load(request_data)
-            ioc.custom_attributes = get_default_custom_attributes('ioc')
-            ioc, existed = add_ioc(ioc=ioc,
-                                   user_id=current_user.id,
-                                   caseid=caseid
-                                   )
-            link_existed = add_ioc_link(ioc.ioc_id, caseid)
-
-            if link_existed:
-                errors.append(f"{ioc.ioc_value} (already exists and linked to this case)")
-                log.error(f"IOC {ioc.ioc_value} already exists and linked to this case")
-                index += 1
-                continue
-
-            if ioc:
-                ioc = call_modules_hook('on_postload_ioc_create', data=ioc, caseid=caseid)
-                ret.append(request_data)
-                track_activity(f"added ioc \"{ioc.ioc_value}\"", caseid=caseid)
-
-            else:
-                errors.append(f"{ioc.ioc_value} (internal reasons)")
-                log.error(f"Unable to create IOC {ioc.ioc_value} for internal reasons")
-
-            index += 1
-
-        if len(errors) == 0:
-            msg = "Successfully imported data."
-        else:
-            msg = "Data is imported but we got errors with the following rows:\n- " + "\n- ".join(errors)
-
-        return response_success(msg=msg, data=ret)
+    jsdata = request.get_json()
+    csv_data = jsdata.get("CSVData") if isinstance(jsdata, dict) else None
+    if not isinstance(csv_data, str) or not csv_data.strip():
+        return response_error("No CSV data provided")
 
-    except marshmallow.exceptions.ValidationError as e:
-        return response_error(msg="Data error", data=e.messages, status=400)
+    is_from_api = request.cookies.get('session') is None
+
+    if count_import_rows(csv_data) > app.config.get('BULK_IMPORT_SYNC_MAX_ROWS'):
+        csv_path = save_import_csv(csv_data)
+        try:
+            task = task_bulk_import_iocs.delay(caseid=caseid, user_id=current_user.id, init_user=current_user.name,
+                                               csv_path=csv_path, is_from_api=is_from_api)
+        except Exception:
+            remove_import_csv(csv_path)
+            raise
+
+        return response_success(msg="Import queued", data={'task_id': task.id})
+
+    imported, errors = bulk_import_iocs(csv_data, case_id=caseid, user_id=current_user.id,
+                                        user_name=current_user.name, is_from_api=is_from_api)
+
+    return response_success(msg=import_message(errors), data=IocSchema(many=True).dump(imported))
 
 
 @case_ioc_blueprint.route('/case/ioc/add/modal', methods=['GET'])
@@ -321,7 +259,10 @@ def case_view_ioc(cur_id, caseid):
     if not ioc:
         return response_error("Invalid IOC ID for this case")
 
-    return response_success(data=ioc_schema.dump(ioc))
+    data = ioc_schema.dump(ioc)
+    data['modification_history'] = get_object_history_dict('ioc', cur_id)
+
+    return response_success(data=data)
 
 
 @case_ioc_blueprint.route('/case/ioc/update/<int:cur_id>', methods=['POST'])
@@ -40,8 +40,13 @@ from app.datamgmt.case.case_notes_db import delete_note_comment
 from app.datamgmt.case.case_notes_db import get_case_note_comment
 from app.datamgmt.case.case_notes_db import get_case_note_comments
 from app.datamgmt.case.case_notes_db import get_note
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.states import get_notes_state
 from app.iris_engine.module_handler.module_handler import call_modules_hook
+from app.iris_engine.utils.collab import collab_clear_document
+from app.iris_engine.utils.collab import collab_get_snapshot
+from app.iris_engine.utils.collab import collab_mark_saved
+from app.iris_engine.utils.collab import collab_push_delta
 from app.iris_engine.utils.tracker import track_activity
 from app.models import Notes
 from app.models.authorization import CaseAccessLevel
@@ -50,6 +55,7 @@ from app.schema.marshables import CaseNoteSchema
 from app.schema.marshables import CommentSchema
 from app.util import ac_api_case_requires, ac_socket_requires, endpoint_deprecated, add_obj_history_entry
 from app.util import ac_case_requires
+from app.util import get_socket_user_login
 from app.util import response_error
 from app.util import response_success
 
@@ -119,6 +125,7 @@ def case_note_detail(cur_id, caseid):
 
         note = note_schema.dump(note)
         note['comments'] = comments_schema.dump(note_comments)
+        note['modification_history'] = get_object_history_dict('notes', cur_id)
 
         return response_success(data=note)
 
@@ -464,19 +471,27 @@ def case_comment_note_delete(cur_id, com_id, caseid):
     return response_success(msg)
 
 
+def _socket_note_id(data):
+    try:
+        return int(data.get('note_id'))
+    except (TypeError, ValueError):
+        return None
+
+
 @socket_io.on('change-note')
 @ac_socket_requires(CaseAccessLevel.full_access)
 def socket_change_note(data):
 
-    data['last_change'] = current_user.user
-    emit('change-note', data, to=data['channel'], skip_sid=request.sid, room=data['channel'])
+    collab_push_delta('change-note', data['channel'], _socket_note_id(data), data.get('delta'), request.sid,
+                      get_socket_user_login())
 
 
 @socket_io.on('save-note')
 @ac_socket_requires(CaseAccessLevel.full_access)
 def socket_save_note(data):
 
-    data['last_saved'] = current_user.user
+    collab_mark_saved('change-note', data['channel'], _socket_note_id(data))
+    data['last_saved'] = get_socket_user_login()
     emit('save-note', data, to=data['channel'], skip_sid=request.sid, room=data['channel'])
 
 
@@ -484,9 +499,17 @@ def socket_save_note(data):
 @ac_socket_requires(CaseAccessLevel.full_access)
 def socket_clear_buffer_note(message):
 
+    collab_clear_document('change-note', message['channel'], _socket_note_id(message))
     emit('clear_buffer-note', message, room=message['channel'])
 
 
+@socket_io.on('snapshot-note')
+@ac_socket_requires(CaseAccessLevel.full_access)
+def socket_snapshot_note(data):
+
+    emit('snapshot-note', collab_get_snapshot('change-note', data['channel'], _socket_note_id(data)))
+
+
 @socket_io.on('join-notes')
 @ac_socket_requires(CaseAccessLevel.full_access)
 def socket_join_note(data):
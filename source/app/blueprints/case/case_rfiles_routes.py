@@ -41,6 +41,7 @@ from app.datamgmt.case.case_rfiles_db import get_case_evidence_comments_count
 from app.datamgmt.case.case_rfiles_db import get_rfile
 from app.datamgmt.case.case_rfiles_db import get_rfiles
 from app.datamgmt.case.case_rfiles_db import update_rfile
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
 from app.datamgmt.states import get_evidences_state
 from app.iris_engine.module_handler.module_handler import call_modules_hook
@@ -133,7 +134,10 @@ def case_get_evidence(cur_id, caseid):
         return response_error("Invalid evidence ID for this case")
 
     evidence_schema = CaseEvidenceSchema()
-    return response_success(data=evidence_schema.dump(crf))
+    data = evidence_schema.dump(crf)
+    data['modification_history'] = get_object_history_dict('case_received_file', cur_id)
+
+    return response_success(data=data)
 
 
 @case_rfiles_blueprint.route('/case/evidences/<int:cur_id>/modal', methods=['GET'])
@@ -60,6 +60,10 @@ from app.iris_engine.access_control.utils import ac_get_all_access_level, ac_fas
     ac_fast_check_user_has_case_access
 from app.iris_engine.access_control.utils import ac_set_case_access_for_users
 from app.iris_engine.module_handler.module_handler import list_available_pipelines
+from app.iris_engine.utils.collab import collab_clear_document
+from app.iris_engine.utils.collab import collab_get_snapshot
+from app.iris_engine.utils.collab import collab_mark_saved
+from app.iris_engine.utils.collab import collab_push_delta
 from app.iris_engine.utils.tracker import track_activity
 from app.models import CaseStatus, ReviewStatusList
 from app.models import UserActivity
@@ -69,8 +73,10 @@ from app.schema.marshables import TaskLogSchema, CaseSchema, CaseDetailsSchema
 from app.util import ac_api_case_requires, add_obj_history_entry
 from app.util import ac_case_requires
 from app.util import ac_socket_requires
+from app.util import get_socket_user_login
 from app.util import response_error
 from app.util import response_success
+from app.util import response_success_stream
 
 app.register_blueprint(case_timeline_blueprint)
 app.register_blueprint(case_notes_blueprint)
@@ -154,25 +160,33 @@ def case_pipelines_modal(caseid, url_redir):
 @ac_socket_requires(CaseAccessLevel.full_access)
 def socket_summary_onchange(data):
 
-    data['last_change'] = current_user.user
-    emit('change', data, to=data['channel'], skip_sid=request.sid)
+    collab_push_delta('change', data['channel'], None, data.get('delta'), request.sid, get_socket_user_login())
 
 
 @socket_io.on('save')
 @ac_socket_requires(CaseAccessLevel.full_access)
 def socket_summary_onsave(data):
 
-    data['last_saved'] = current_user.user
+    collab_mark_saved('change', data['channel'], None)
+    data['last_saved'] = get_socket_user_login()
     emit('save', data, to=data['channel'], skip_sid=request.sid)
 
 
 @socket_io.on('clear_buffer')
 @ac_socket_requires(CaseAccessLevel.full_access)
-def socket_summary_onchange(message):
+def socket_summary_onclear(message):
 
+    collab_clear_document('change', message['channel'], None)
     emit('clear_buffer', message)
 
 
+@socket_io.on('snapshot')
+@ac_socket_requires(CaseAccessLevel.full_access)
+def socket_summary_snapshot(data):
+
+    emit('snapshot', collab_get_snapshot('change', data['channel'], None))
+
+
 @socket_io.on('join')
 @ac_socket_requires(CaseAccessLevel.full_access)
 def get_message(data):
@@ -202,6 +216,7 @@ def desc_fetch(caseid):
             "case_description": case.description,
             "last_saved": current_user.user
         }
+        collab_mark_saved('change', f"case-{caseid}", None)
         socket_io.emit('save', data, to=f"case-{caseid}")
 
     return response_success("Summary updated", data=crc)
@@ -240,7 +255,7 @@ def activity_fetch(caseid):
 @case_blueprint.route("/case/export", methods=['GET'])
 @ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
 def export_case(caseid):
-    return response_success('', data=export_case_json(caseid))
+    return response_success_stream('', data=export_case_json(caseid, stream=True))
 
 
 @case_blueprint.route("/case/meta", methods=['GET'])
@@ -260,7 +275,7 @@ def case_add_tasklog(caseid):
 
         log_data = log_schema.load(request.get_json())
 
-        ua = track_activity(log_data.get('log_content'), caseid, user_input=True)
+        ua = track_activity(log_data.get('log_content'), caseid, user_input=True, sync=True)
 
     except marshmallow.exceptions.ValidationError as e:
         return response_error(msg="Data error", data=e.messages, status=400)
@@ -268,6 +283,35 @@ def case_add_tasklog(caseid):
     return response_success("Log saved", data=ua)
 
 
+@case_blueprint.route('/case/import/status/<task_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
+def case_import_status(task_id, caseid):
+    task = app.celery.AsyncResult(task_id)
+    info = task.info
+
+    if task.state == 'PENDING':
+        return response_success("Import pending", data={'state': 'pending'})
+
+    if task.state == 'FAILURE':
+        return response_error("Import failed", data={'state': 'failure'})
+
+    if not isinstance(info, dict) or info.get('case_id') != caseid:
+        return response_error("Invalid import task")
+
+    if task.state == 'PROGRESS':
+        return response_success("Import in progress", data={
+            'state': 'progress',
+            'current': info.get('current'),
+            'total': info.get('total')
+        })
+
+    return response_success(info.get('message'), data={
+        'state': task.state.lower(),
+        'imported': info.get('imported'),
+        'errors': info.get('errors')
+    })
+
+
 @case_blueprint.route('/case/users/list', methods=['GET'])
 @ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
 def case_get_users(caseid):
@@ -44,6 +44,7 @@ from app.datamgmt.case.case_tasks_db import get_tasks_status
 from app.datamgmt.case.case_tasks_db import get_tasks_with_assignees
 from app.datamgmt.case.case_tasks_db import update_task_assignees
 from app.datamgmt.case.case_tasks_db import update_task_status
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
 from app.datamgmt.states import get_tasks_state
 from app.datamgmt.states import update_tasks_state
@@ -182,8 +183,10 @@ def case_task_view(cur_id, caseid):
         return response_error("Invalid task ID for this case")
 
     task_schema = CaseTaskSchema()
+    data = task_schema.dump(task)
+    data['modification_history'] = get_object_history_dict('case_tasks', cur_id)
 
-    return response_success(data=task_schema.dump(task))
+    return response_success(data=data)
 
 
 @case_tasks_blueprint.route('/case/tasks/<int:cur_id>/modal', methods=['GET'])
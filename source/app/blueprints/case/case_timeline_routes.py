@@ -44,6 +44,7 @@ from app.datamgmt.case.case_events_db import get_case_event
 from app.datamgmt.case.case_events_db import get_case_event_comment
 from app.datamgmt.case.case_events_db import get_case_event_comments
 from app.datamgmt.case.case_events_db import get_case_events_comments_count
+from app.datamgmt.case.case_events_db import get_case_events_comments_ids
 from app.datamgmt.case.case_events_db import get_case_iocs_for_tm
 from app.datamgmt.case.case_events_db import get_default_cat
 from app.datamgmt.case.case_events_db import get_event_assets_ids
@@ -54,6 +55,7 @@ from app.datamgmt.case.case_events_db import save_event_category
 from app.datamgmt.case.case_events_db import update_event_assets
 from app.datamgmt.case.case_events_db import update_event_iocs
 from app.datamgmt.case.case_iocs_db import get_ioc_by_value
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
 from app.datamgmt.states import get_timeline_state
 from app.datamgmt.states import update_timeline_state
@@ -81,6 +83,7 @@ from app.util import ac_case_requires
 from app.util import add_obj_history_entry
 from app.util import response_error
 from app.util import response_success
+from app.util import response_success_stream
 
 
 event_tags = ["Network", "Server", "ActiveDirectory", "Computer", "Malware", "User Interaction"]
@@ -325,15 +328,7 @@ def case_gettimeline_api(asset_id, caseid):
         CasesEvent.event_date
     ).outerjoin(
         CasesEvent.category
-    ).all()
-
-    assets_cache = CaseAssets.query.with_entities(
-        CaseAssets.asset_id,
-        CaseAssets.asset_name,
-        CaseEventsAssets.event_id
-    ).filter(
-        CaseEventsAssets.case_id == caseid,
-    ).join(CaseEventsAssets.asset).all()
+    ).yield_per(app.config.get('STREAM_YIELD_PER'))
 
     iocs_cache = CaseEventsIoc.query.with_entities(
         Ioc.ioc_id,
@@ -345,40 +340,26 @@ def case_gettimeline_api(asset_id, caseid):
         CaseEventsIoc.ioc
     ).all()
 
-    tim = []
-    for row in timeline:
-        ras = row._asdict()
-        ras['event_date'] = ras['event_date'].strftime('%Y-%m-%dT%H:%M:%S.%f')
-        ras['event_date_wtz'] = ras['event_date_wtz'].strftime('%Y-%m-%dT%H:%M:%S.%f')
-
-        alki = []
-        cache = {}
-        for asset in assets_cache:
-            if asset.event_id == ras['event_id']:
-                if asset.asset_id not in cache:
-                    cache[asset.asset_id] = asset.asset_name
-
-                alki.append(asset._asdict())
+    events_iocs = {}
+    for ioc in iocs_cache:
+        events_iocs.setdefault(ioc.event_id, []).append(ioc._asdict())
 
-        alki = []
-        cache = {}
-        for ioc in iocs_cache:
-            if ioc.event_id == ras['event_id']:
-                if ioc.ioc_id not in cache:
-                    cache[ioc.ioc_id] = ioc.ioc_value
+    def iter_timeline():
+        for row in timeline:
+            ras = row._asdict()
+            ras['event_date'] = ras['event_date'].strftime('%Y-%m-%dT%H:%M:%S.%f')
+            ras['event_date_wtz'] = ras['event_date_wtz'].strftime('%Y-%m-%dT%H:%M:%S.%f')
 
-                alki.append(ioc._asdict())
+            ras['iocs'] = events_iocs.get(ras['event_id'], [])
 
-        ras['iocs'] = alki
-
-        tim.append(ras)
+            yield ras
 
     resp = {
-        "timeline": tim,
+        "timeline": iter_timeline(),
         "state": get_timeline_state(caseid=caseid)
     }
 
-    return response_success("", data=resp)
+    return response_success_stream("", data=resp)
 
 
 @case_timeline_blueprint.route('/case/timeline/advanced-filter', methods=['GET'])
@@ -507,7 +488,7 @@ def case_filter_timeline(caseid):
         CasesEvent.category
     ).join(
         CasesEvent.user
-    ).all()
+    ).yield_per(app.config.get('STREAM_YIELD_PER'))
 
     assets_cache_condition = and_(
         CaseEventsAssets.case_id == caseid
@@ -554,6 +535,7 @@ def case_filter_timeline(caseid):
     ).all()
 
     assets_map = {}
+    events_assets = {}
     cache = {}
     for asset in assets_cache:
         if asset.asset_id not in cache:
@@ -566,7 +548,16 @@ def case_filter_timeline(caseid):
             else:
                 assets_map[asset.event_id] = 1
 
-    assets_filter = []
+        events_assets.setdefault(asset.event_id, []).append(
+            {
+                "name": "{} ({})".format(asset.asset_name, asset.type),
+                "ip": asset.asset_ip,
+                "description": asset.asset_description,
+                "compromised": asset.asset_compromise_status_id == CompromiseStatus.compromised.value
+            }
+        )
+
+    assets_filter = set()
     len_assets = 0
     if assets:
         len_assets += len(assets)
@@ -575,70 +566,49 @@ def case_filter_timeline(caseid):
 
     for event_id in assets_map:
         if assets_map[event_id] == len_assets:
-            assets_filter.append(event_id)
-
-    iocs_filter = []
-    if iocs:
-        for ioc in iocs_cache:
-            if ioc.event_id not in iocs_filter and ioc.ioc_value.lower() in iocs:
-                iocs_filter.append(ioc.event_id)
-
-    tim = []
-    events_list = []
-    for row in timeline:
-        if assets is not None or assets_id is not None:
-            if row.event_id not in assets_filter:
-                continue
-
-        if iocs is not None:
-            if row.event_id not in iocs_filter:
-                continue
-
-        ras = row._asdict()
-
-        ras['event_date'] = ras['event_date'].strftime('%Y-%m-%dT%H:%M:%S.%f')
-        ras['event_date_wtz'] = ras['event_date_wtz'].strftime('%Y-%m-%dT%H:%M:%S.%f') if ras[
-            'event_date_wtz'] else None
-        ras['event_added'] = ras['event_added'].strftime('%Y-%m-%dT%H:%M:%S')
-
-        if row.event_id not in events_list:
-            events_list.append(row.event_id)
-
-        alki = []
-        for asset in assets_cache:
+            assets_filter.add(event_id)
+
+    iocs_filter = set()
+    events_iocs = {}
+    for ioc in iocs_cache:
+        if ioc.ioc_id not in cache:
+            cache[ioc.ioc_id] = [ioc.ioc_value]
+
+        if iocs and ioc.ioc_value.lower() in iocs:
+            iocs_filter.add(ioc.event_id)
+
+        events_iocs.setdefault(ioc.event_id, []).append(
+            {
+                "name": "{}".format(ioc.ioc_value),
+                "description": ioc.ioc_description
+            }
+        )
 
-            if asset.event_id == ras['event_id']:
-                alki.append(
-                    {
-                        "name": "{} ({})".format(asset.asset_name, asset.type),
-                        "ip": asset.asset_ip,
-                        "description": asset.asset_description,
-                        "compromised": asset.asset_compromise_status_id == CompromiseStatus.compromised.value
-                    }
-                )
+    def iter_timeline():
+        for row in timeline:
+            if assets is not None or assets_id is not None:
+                if row.event_id not in assets_filter:
+                    continue
 
-        ras['assets'] = alki
+            if iocs is not None:
+                if row.event_id not in iocs_filter:
+                    continue
 
-        alki = []
-        for ioc in iocs_cache:
-            if ioc.event_id == ras['event_id']:
-                if ioc.ioc_id not in cache:
-                    cache[ioc.ioc_id] = [ioc.ioc_value]
+            ras = row._asdict()
 
-                alki.append(
-                    {
-                        "name": "{}".format(ioc.ioc_value),
-                        "description": ioc.ioc_description
-                    }
-                )
+            ras['event_date'] = ras['event_date'].strftime('%Y-%m-%dT%H:%M:%S.%f')
+            ras['event_date_wtz'] = ras['event_date_wtz'].strftime('%Y-%m-%dT%H:%M:%S.%f') if ras[
+                'event_date_wtz'] else None
+            ras['event_added'] = ras['event_added'].strftime('%Y-%m-%dT%H:%M:%S')
 
-        ras['iocs'] = alki
+            ras['assets'] = events_assets.get(row.event_id, [])
+            ras['iocs'] = events_iocs.get(row.event_id, [])
 
-        tim.append(ras)
+            yield ras
 
     if request.cookies.get('session'):
 
-        iocs = IocLink.query.with_entities(
+        case_iocs = IocLink.query.with_entities(
             Ioc.ioc_id,
             Ioc.ioc_value,
             Ioc.ioc_description,
@@ -647,27 +617,27 @@ def case_filter_timeline(caseid):
             Ioc.ioc_id == IocLink.ioc_id
         ).all()
 
+        # The events are streamed, so the comments are counted for all the events of the case
         events_comments_map = {}
-        events_comments_set = get_case_events_comments_count(events_list)
-        for k, v in events_comments_set:
+        for k, v in get_case_events_comments_ids(caseid):
             events_comments_map.setdefault(k, []).append(v)
 
         resp = {
-            "tim": tim,
+            "tim": iter_timeline(),
             "comments_map": events_comments_map,
             "assets": cache,
-            "iocs": [ioc._asdict() for ioc in iocs],
+            "iocs": [ioc._asdict() for ioc in case_iocs],
             "categories": [cat.name for cat in get_events_categories()],
             "state": get_timeline_state(caseid=caseid)
         }
 
     else:
         resp = {
-            "timeline": tim,
+            "timeline": iter_timeline(),
             "state": get_timeline_state(caseid=caseid)
         }
 
-    return response_success("ok", data=resp)
+    return response_success_stream("ok", data=resp)
 
 
 @case_timeline_blueprint.route('/case/timeline/events/delete/<int:cur_id>', methods=['POST'])
@@ -722,6 +692,7 @@ def event_view(cur_id, caseid):
     output['event_iocs'] = linked_iocs
     output['event_category_id'] = event.category[0].id if event.category else None
     output['event_comments_map'] = [c._asdict() for c in get_case_events_comments_count([cur_id])]
+    output['modification_history'] = get_object_history_dict('cases_events', cur_id)
 
     return response_success(data=output)
 
@@ -759,7 +730,8 @@ def event_view_modal(cur_id, caseid, url_redir):
     return render_template("modal_add_case_event.html", form=form, event=event, user_name=usr_name, tags=event_tags,
                            assets=assets, iocs=iocs, comments_map=comments_map,
                            assets_prefill=assets_prefill, iocs_prefill=iocs_prefill,
-                           category=event.category, attributes=event.custom_attributes)
+                           category=event.category, attributes=event.custom_attributes,
+                           modification_history=get_object_history_dict('cases_events', cur_id))
 
 
 @case_timeline_blueprint.route('/case/timeline/events/update/<int:cur_id>', methods=["POST"])
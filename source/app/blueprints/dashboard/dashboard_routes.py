@@ -29,10 +29,11 @@ from flask import url_for
 from flask_login import current_user
 from flask_login import logout_user
 from flask_wtf import FlaskForm
-from sqlalchemy import distinct
 
 from app import app
 from app import db
+from app.datamgmt.case.case_stats_db import get_cases_counts
+from app.datamgmt.case.case_tasks_db import add_tasks_assignees
 from app.datamgmt.dashboard.dashboard_db import get_global_task, list_user_cases, list_user_reviews
 from app.datamgmt.dashboard.dashboard_db import get_tasks_status
 from app.datamgmt.dashboard.dashboard_db import list_global_tasks
@@ -130,18 +131,8 @@ def index(caseid, url_redir):
 
     msg = None
 
-    # Retrieve the dashboard data from multiple sources.
-    # Quite fast as it is only counts.
-    user_open_case = Cases.query.filter(
-        Cases.owner_id == current_user.id,
-        Cases.close_date == None
-    ).count()
-
-    data = {
-        "user_open_count": user_open_case,
-        "cases_open_count": Cases.query.filter(Cases.close_date == None).count(),
-        "cases_count": Cases.query.with_entities(distinct(Cases.case_id)).count(),
-    }
+    # Retrieve the dashboard data from the cases stats
+    data = get_cases_counts(current_user.id)
 
     # Create the customer form to be able to quickly add a customer
     form = FlaskForm()
@@ -197,7 +188,7 @@ def get_utasks(caseid):
     ct = list_user_tasks()
 
     if ct:
-        output = [c._asdict() for c in ct]
+        output = add_tasks_assignees([c._asdict() for c in ct])
     else:
         output = []
 
@@ -20,7 +20,9 @@ import datetime
 import json
 import marshmallow.exceptions
 import urllib.parse
+import zlib
 from flask import Blueprint
+from flask import Response
 from flask import render_template
 from flask import request
 from flask import send_file
@@ -41,10 +43,16 @@ from app.datamgmt.datastore.datastore_db import datastore_get_file
 from app.datamgmt.datastore.datastore_db import datastore_get_interactive_path_node
 from app.datamgmt.datastore.datastore_db import datastore_get_local_file_path
 from app.datamgmt.datastore.datastore_db import datastore_get_path_node
-from app.datamgmt.datastore.datastore_db import datastore_get_standard_path
+from app.datamgmt.datastore.datastore_db import datastore_release_file
 from app.datamgmt.datastore.datastore_db import datastore_rename_node
+from app.datamgmt.datastore.datastore_db import ds_list_folder
 from app.datamgmt.datastore.datastore_db import ds_list_tree
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.forms import ModalDSFileForm
+from app.iris_engine.utils.chunked_upload import chunked_upload_append
+from app.iris_engine.utils.chunked_upload import chunked_upload_discard
+from app.iris_engine.utils.chunked_upload import chunked_upload_get
+from app.iris_engine.utils.chunked_upload import chunked_upload_init
 from app.iris_engine.utils.tracker import track_activity
 from app.models.authorization import CaseAccessLevel
 from app.schema.marshables import DSFileSchema, DSPathSchema
@@ -72,6 +80,18 @@ def datastore_list_tree(caseid):
     return response_success("", data=data)
 
 
+@datastore_blueprint.route('/datastore/list/folder', methods=['GET'])
+@datastore_blueprint.route('/datastore/list/folder/<int:folder_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
+def datastore_list_folder(caseid, folder_id=None):
+
+    data = ds_list_folder(caseid, folder_id)
+    if data is None:
+        return response_error('Invalid folder ID for this case')
+
+    return response_success("", data=data)
+
+
 @datastore_blueprint.route('/datastore/list/filter', methods=['GET'])
 @ac_api_case_requires(CaseAccessLevel.read_only, CaseAccessLevel.full_access)
 def datastore_list_filter(caseid):
@@ -174,7 +194,8 @@ def datastore_info_file_modal(cur_id: int, caseid: int, url_redir: bool):
 
     dsp = datastore_get_path_node(file.file_parent_id, caseid)
 
-    return render_template("modal_ds_file_info.html", file=file, dsp=dsp)
+    return render_template("modal_ds_file_info.html", file=file, dsp=dsp,
+                           modification_history=get_object_history_dict('data_store_file', cur_id))
 
 
 @datastore_blueprint.route('/datastore/file/info/<int:cur_id>', methods=['GET'])
@@ -203,7 +224,11 @@ def datastore_update_file(cur_id: int, caseid: int):
     dsf_schema = DSFileSchema()
     try:
 
-        dsf_sc = dsf_schema.load(request.form, instance=dsf, partial=True)
+        form, upload_id, upload, upload_sha256 = _split_upload_fields(caseid)
+        if upload_id and upload is None:
+            return response_error('Invalid upload ID for this case')
+
+        dsf_sc = dsf_schema.load(form, instance=dsf, partial=True)
         add_obj_history_entry(dsf_sc, 'updated')
 
         dsf.file_is_ioc = request.form.get('file_is_ioc') is not None or request.form.get('file_is_ioc') is True
@@ -211,13 +236,27 @@ def datastore_update_file(cur_id: int, caseid: int):
 
         db.session.commit()
 
-        if request.files.get('file_content'):
-            ds_location = datastore_get_standard_path(dsf_sc, caseid)
+        if upload:
+            previous_local_name = dsf_sc.file_local_name
+            dsf_sc.file_local_name, dsf_sc.file_size, dsf_sc.file_sha256 = dsf_schema.ds_store_upload(
+                upload,
+                upload_sha256,
+                dsf_sc.file_is_ioc,
+                dsf_sc.file_password)
+            datastore_release_file(previous_local_name)
+
+            if dsf_sc.file_is_ioc and not dsf_sc.file_password:
+                dsf_sc.file_password = 'infected'
+
+            db.session.commit()
+
+        elif request.files.get('file_content'):
+            previous_local_name = dsf_sc.file_local_name
             dsf_sc.file_local_name, dsf_sc.file_size, dsf_sc.file_sha256 = dsf_schema.ds_store_file(
                 request.files.get('file_content'),
-                ds_location,
                 dsf_sc.file_is_ioc,
                 dsf_sc.file_password)
+            datastore_release_file(previous_local_name)
 
             if dsf_sc.file_is_ioc and not dsf_sc.file_password:
                 dsf_sc.file_password = 'infected'
@@ -306,10 +345,72 @@ def datastore_view_file(cur_id: int, caseid: int):
         return response_error(f'File {dsf.file_local_name} does not exists on the server. '
                               f'Update or delete virtual entry')
 
-    resp = send_file(dsf.file_local_name, as_attachment=True,
-                     download_name=destination_name)
+    resp = _send_datastore_file(dsf, destination_name)
+
+    # Revalidations and partial downloads of a file already fetched are not tracked
+    if resp.status_code == 200:
+        track_activity(f"File \"{destination_name}\" downloaded", caseid=caseid, display_in_ui=False)
+
+    return resp
+
+
+def _datastore_file_etag(dsf):
+    if not dsf.file_sha256:
+        return True
+
+    if dsf.file_is_ioc or dsf.file_password:
+        # The archive differs from the content the hash was computed on, and depends on its password
+        return f'{dsf.file_sha256}-{zlib.crc32(dsf.file_local_name.encode()):08x}'
+
+    return dsf.file_sha256
+
+
+def _send_datastore_file(dsf, download_name):
+    """
+    Sends a datastore file with its ETag, answering conditional and range requests. When DATASTORE_SENDFILE_MODE
+    is set, the bytes are served by the front proxy instead of the app
+    """
+    etag = _datastore_file_etag(dsf)
+    sendfile_mode = app.app.config.get('DATASTORE_SENDFILE_MODE')
+
+    if sendfile_mode in ('x-accel', 'x-sendfile') and isinstance(etag, str):
+        if request.if_none_match.contains(etag):
+            resp = Response(status=304)
+            resp.set_etag(etag)
+            resp.cache_control.private = True
+            resp.cache_control.no_cache = True
+            return resp
+
+        datastore_path = Path(app.app.config['DATASTORE_PATH']).resolve()
+        local_path = Path(dsf.file_local_name).resolve()
+
+        if datastore_path in local_path.parents:
+            resp = Response(mimetype='application/octet-stream')
+            if sendfile_mode == 'x-accel':
+                resp.headers['X-Accel-Redirect'] = urllib.parse.quote(
+                    app.app.config['DATASTORE_SENDFILE_PREFIX'].rstrip('/') + '/' +
+                    local_path.relative_to(datastore_path).as_posix())
+            else:
+                resp.headers['X-Sendfile'] = local_path.as_posix()
+
+            try:
+                download_name.encode('ascii')
+                resp.headers.set('Content-Disposition', 'attachment', filename=download_name)
+            except UnicodeEncodeError:
+                resp.headers.set('Content-Disposition', 'attachment',
+                                 filename=download_name.encode('ascii', 'ignore').decode('ascii'),
+                                 **{'filename*': "UTF-8''" + urllib.parse.quote(download_name, safe="!#$&+^`|~")})
+
+            resp.set_etag(etag)
+            resp.cache_control.private = True
+            resp.cache_control.no_cache = True
+            return resp
+
+    resp = send_file(dsf.file_local_name, as_attachment=True, download_name=download_name,
+                     conditional=True, etag=etag, max_age=0)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
 
-    track_activity(f"File \"{destination_name}\" downloaded", caseid=caseid, display_in_ui=False)
     return resp
 
 
@@ -324,7 +425,11 @@ def datastore_add_file(cur_id: int, caseid: int):
     dsf_schema = DSFileSchema()
     try:
 
-        dsf_sc = dsf_schema.load(request.form, partial=True)
+        form, upload_id, upload, upload_sha256 = _split_upload_fields(caseid)
+        if upload_id and upload is None:
+            return response_error('Invalid upload ID for this case')
+
+        dsf_sc = dsf_schema.load(form, partial=True)
 
         dsf_sc.file_parent_id = dsp.path_id
         dsf_sc.added_by_user_id = current_user.id
@@ -339,12 +444,18 @@ def datastore_add_file(cur_id: int, caseid: int):
         db.session.add(dsf_sc)
         db.session.commit()
 
-        ds_location = datastore_get_standard_path(dsf_sc, caseid)
-        dsf_sc.file_local_name, dsf_sc.file_size, dsf_sc.file_sha256 = dsf_schema.ds_store_file(
-            request.files.get('file_content'),
-            ds_location,
-            dsf_sc.file_is_ioc,
-            dsf_sc.file_password)
+        if upload:
+            dsf_sc.file_local_name, dsf_sc.file_size, dsf_sc.file_sha256 = dsf_schema.ds_store_upload(
+                upload,
+                upload_sha256,
+                dsf_sc.file_is_ioc,
+                dsf_sc.file_password)
+
+        else:
+            dsf_sc.file_local_name, dsf_sc.file_size, dsf_sc.file_sha256 = dsf_schema.ds_store_file(
+                request.files.get('file_content'),
+                dsf_sc.file_is_ioc,
+                dsf_sc.file_password)
 
         db.session.commit()
 
@@ -364,6 +475,80 @@ def datastore_add_file(cur_id: int, caseid: int):
         return response_error(msg="Data error", data=e.messages)
 
 
+def _split_upload_fields(caseid):
+    form = request.form.to_dict()
+    upload_id = form.pop('upload_id', None)
+    upload_sha256 = form.pop('upload_sha256', None)
+
+    upload = None
+    if upload_id:
+        upload = chunked_upload_get(upload_id, caseid, current_user.id)
+
+    return form, upload_id, upload, upload_sha256
+
+
+@datastore_blueprint.route('/datastore/upload/init', methods=['POST'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def datastore_upload_init(caseid: int):
+    data = request.get_json()
+    if not data:
+        return response_error('Invalid data')
+
+    try:
+        file_size = int(data.get('file_size'))
+        chunk_size = int(data.get('chunk_size'))
+    except (TypeError, ValueError):
+        return response_error('Invalid file or chunk size')
+
+    has_error, res = chunked_upload_init(data.get('upload_id'), data.get('file_name'), file_size, chunk_size,
+                                         caseid, current_user.id)
+    if has_error:
+        return response_error(res)
+
+    return response_success('Upload ready', data=res)
+
+
+@datastore_blueprint.route('/datastore/upload/<string:upload_id>', methods=['GET'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def datastore_upload_status(upload_id: str, caseid: int):
+    upload = chunked_upload_get(upload_id, caseid, current_user.id)
+    if upload is None:
+        return response_error('Invalid upload ID for this case')
+
+    return response_success('', data=upload)
+
+
+@datastore_blueprint.route('/datastore/upload/<string:upload_id>/chunk', methods=['POST'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def datastore_upload_chunk(upload_id: str, caseid: int):
+    upload = chunked_upload_get(upload_id, caseid, current_user.id)
+    if upload is None:
+        return response_error('Invalid upload ID for this case')
+
+    chunk = request.files.get('chunk')
+    chunk_index = request.form.get('chunk_index', type=int)
+    if chunk is None or chunk_index is None:
+        return response_error('Missing chunk or chunk index')
+
+    has_error, res = chunked_upload_append(upload, chunk_index, chunk.stream, request.form.get('chunk_sha256'))
+    if has_error:
+        return response_error(res)
+
+    return response_success('Chunk received', data={'received_chunks_count': res,
+                                                    'chunk_count': upload['chunk_count']})
+
+
+@datastore_blueprint.route('/datastore/upload/<string:upload_id>/delete', methods=['POST'])
+@ac_api_case_requires(CaseAccessLevel.full_access)
+def datastore_upload_delete(upload_id: str, caseid: int):
+    if chunked_upload_get(upload_id, caseid, current_user.id) is None:
+        return response_error('Invalid upload ID for this case')
+
+    chunked_upload_discard(upload_id)
+
+    return response_success('Upload deleted')
+
+
 @datastore_blueprint.route('/datastore/file/add-interactive', methods=['POST'])
 @ac_api_case_requires(CaseAccessLevel.full_access)
 def datastore_add_interactive_file(caseid: int):
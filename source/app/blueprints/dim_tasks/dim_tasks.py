@@ -17,25 +17,25 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 # IMPORTS ------------------------------------------------
-import json
 import os
-import pickle
 from flask import Blueprint
 from flask import redirect
 from flask import render_template
 from flask import request
 from flask import url_for
 from flask_wtf import FlaskForm
-from sqlalchemy import desc
 
 import app
+from app.datamgmt.dim_tasks.dim_tasks_db import dim_task_summary_to_dict
+from app.datamgmt.dim_tasks.dim_tasks_db import get_dim_tasks
+from app.datamgmt.dim_tasks.dim_tasks_db import get_dim_tasks_page
+from app.datamgmt.dim_tasks.dim_tasks_db import get_dim_tasks_storage_stats
 from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.models import CaseAssets
 from app.models import CaseReceivedFile
 from app.models import CaseTasks
 from app.models import Cases
 from app.models import CasesEvent
-from app.models import CeleryTaskMeta
 from app.models import GlobalTasks
 from app.models import Ioc
 from app.models import IrisHook
@@ -200,65 +200,33 @@ def dim_hooks_call(caseid):
     return response_success(f'Queued task with {index} objects')
 
 
-@dim_tasks_blueprint.route('/dim/tasks/list/<int:count>', methods=['GET'])
+@dim_tasks_blueprint.route('/dim/tasks/list', methods=['GET'])
 @ac_api_requires()
-def list_dim_tasks(count, caseid):
-    tasks = CeleryTaskMeta.query.filter(
-        ~ CeleryTaskMeta.name.like('app.iris_engine.updater.updater.%')
-    ).order_by(desc(CeleryTaskMeta.date_done)).limit(count).all()
-
-    data = []
-
-    for row in tasks:
-
-        tkp = {}
-        tkp['state'] = row.status
-        tkp['case'] = "Unknown"
-        tkp['module'] = row.name
-        tkp['task_id'] = row.task_id
-        tkp['date_done'] = row.date_done
-        tkp['user'] = "Unknown"
-
-        try:
-            tinfo = row.result
-        except AttributeError:
-            # Legacy task
-            data.append(tkp)
-            continue
+def list_dim_tasks_paginated(caseid):
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 100, type=int)
 
-        if row.name is not None and 'task_hook_wrapper' in row.name:
-            task_name = f"{row.kwargs}::{row.kwargs}"
-        else:
-            task_name = row.name
-
-        user = None
-        case_name = None
-        if row.kwargs and row.kwargs != b'{}':
-            kwargs = json.loads(row.kwargs.decode('utf-8'))
-            if kwargs:
-                user = kwargs.get('init_user')
-                case_name = f"Case #{kwargs.get('caseid')}"
-                task_name = f"{kwargs.get('module_name')}::{kwargs.get('hook_name')}"
-
-        try:
-            result = pickle.loads(row.result)
-        except:
-            result = None
-
-        if isinstance(result, IIStatus):
-            try:
-                success = result.is_success()
-            except:
-                success = None
-        else:
-            success = None
+    tasks = get_dim_tasks_page(page=page, per_page=min(max(per_page, 1), 1000))
 
-        tkp['state'] = "success" if success else str(row.result)
-        tkp['user'] = user if user else "Shadow Iris"
-        tkp['module'] = task_name
-        tkp['case'] = case_name if case_name else ""
+    return response_success("", data={
+        'total': tasks.total,
+        'tasks': [dim_task_summary_to_dict(task) for task in tasks.items],
+        'last_page': tasks.pages,
+        'current_page': tasks.page,
+        'next_page': tasks.next_num if tasks.has_next else None
+    })
 
-        data.append(tkp)
+
+@dim_tasks_blueprint.route('/dim/tasks/storage', methods=['GET'])
+@ac_api_requires(Permissions.server_administrator)
+def dim_tasks_storage(caseid):
+    return response_success("", data=get_dim_tasks_storage_stats())
+
+
+@dim_tasks_blueprint.route('/dim/tasks/list/<int:count>', methods=['GET'])
+@ac_api_requires()
+def list_dim_tasks(count, caseid):
+    data = [dim_task_summary_to_dict(task) for task in get_dim_tasks(count)]
 
     return response_success("", data=data)
 
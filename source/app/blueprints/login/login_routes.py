@@ -33,7 +33,6 @@ from app import bc
 from app import db
 
 from app.forms import LoginForm
-from app.iris_engine.access_control.ldap_handler import ldap_authenticate
 from app.iris_engine.access_control.utils import ac_get_effective_permissions_of_user
 from app.iris_engine.utils.tracker import track_activity
 from app.models.cases import Cases
@@ -69,6 +68,9 @@ def _render_template_login(form, msg):
 
 
 def _authenticate_ldap(form, username, password, local_fallback=True):
+    # ldap3 is only loaded by the instances using LDAP authentication
+    from app.iris_engine.access_control.ldap_handler import ldap_authenticate
+
     try:
         if ldap_authenticate(username, password) is False:
             if local_fallback is True:
@@ -31,6 +31,7 @@ from flask import url_for
 from flask_login import current_user
 from flask_wtf import FlaskForm
 from werkzeug import Response
+from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
 import app
@@ -42,6 +43,7 @@ from app.datamgmt.case.case_db import save_case_tags
 from app.datamgmt.client.client_db import get_client_list
 from app.datamgmt.iris_engine.modules_db import get_pipelines_args_from_name
 from app.datamgmt.iris_engine.modules_db import iris_module_exists
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.manage.manage_access_control_db import user_has_client_access
 from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
 from app.datamgmt.manage.manage_case_classifications_db import get_case_classifications_list
@@ -56,6 +58,7 @@ from app.datamgmt.manage.manage_cases_db import list_cases_dict
 from app.datamgmt.manage.manage_cases_db import reopen_case
 from app.datamgmt.manage.manage_common import get_severities_list
 from app.datamgmt.manage.manage_users_db import get_user_organisations
+from app.datamgmt.states import mark_case_stats_stale
 from app.forms import AddCaseForm
 from app.iris_engine.access_control.utils import ac_fast_check_current_user_has_case_access, \
     ac_current_user_has_permission
@@ -65,6 +68,9 @@ from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.iris_engine.module_handler.module_handler import configure_module_on_init
 from app.iris_engine.module_handler.module_handler import instantiate_module_from_name
 from app.iris_engine.tasker.tasks import task_case_update
+from app.iris_engine.utils.chunked_upload import chunked_upload_discard
+from app.iris_engine.utils.chunked_upload import chunked_upload_finalize
+from app.iris_engine.utils.chunked_upload import chunked_upload_get
 from app.iris_engine.utils.common import build_upload_path
 from app.iris_engine.utils.tracker import track_activity
 from app.models.alerts import AlertStatus
@@ -115,6 +121,7 @@ def details_case(cur_id: int, caseid: int, url_redir: bool) -> Union[str, Respon
 
     res = get_case(cur_id)
     res = CaseDetailsSchema().dump(res)
+    res['modification_history'] = get_object_history_dict('cases', cur_id)
     case_classifications = get_case_classifications_list()
     case_states = get_case_states_list()
     user_is_server_administrator = ac_current_user_has_permission(Permissions.server_administrator)
@@ -460,6 +467,7 @@ def update_case_info(cur_id, caseid):
         request_data['reviewer_id'] = None if request_data.get('reviewer_id') == "" else request_data.get('reviewer_id')
 
         case = case_schema.load(request_data, instance=case_i, partial=True)
+        mark_case_stats_stale(cur_id)
 
         db.session.commit()
 
@@ -594,8 +602,36 @@ def manage_cases_uploadfiles(caseid):
 
     # Files uploads of a case. Get the files, create the folder tree
     # The request "add" will start the check + import of the files.
-    f = request.files.get('file')
+    # Large files are sent in chunks beforehand, and only referenced here by their upload ID
+    upload = None
+    upload_id = request.form.get('upload_id', type=str)
+    if upload_id:
+        upload = chunked_upload_get(upload_id, caseid, current_user.id)
+        if upload is None:
+            return response_error('Invalid upload ID for this case', status=400)
 
+        has_error, res = chunked_upload_finalize(upload, request.form.get('upload_sha256', type=str))
+        if has_error:
+            return response_error(res, status=400)
+
+        f = FileStorage(stream=open(res[0], 'rb'), filename=upload['file_name'])
+
+    else:
+        f = request.files.get('file')
+
+    if f is None:
+        return response_error('No file provided', status=400)
+
+    try:
+        return _pipeline_files_upload(f, caseid)
+
+    finally:
+        if upload is not None:
+            f.close()
+            chunked_upload_discard(upload_id)
+
+
+def _pipeline_files_upload(f, caseid):
     is_update = request.form.get('is_update', type=str)
     pipeline = request.form.get('pipeline', '', type=str)
 
@@ -48,6 +48,7 @@ from app.datamgmt.manage.manage_users_db import update_user
 from app.datamgmt.manage.manage_users_db import update_user_groups
 from app.forms import AddUserForm
 from app.iris_engine.access_control.utils import ac_get_all_access_level, ac_current_user_has_permission
+from app.iris_engine.access_control.utils import ac_notify_access_change
 from app.iris_engine.utils.tracker import track_activity
 from app.models.authorization import Permissions
 from app.schema.marshables import UserSchema, BasicUserSchema, UserFullSchema
@@ -479,6 +480,7 @@ def deactivate_user_api(cur_id, caseid):
 
     user.active = False
     db.session.commit()
+    ac_notify_access_change()
     user_schema = UserSchema()
 
     track_activity(f"user {user.user} deactivated", caseid=caseid,  ctx_less=True)
@@ -24,8 +24,14 @@ from flask import request
 from flask import url_for
 from sqlalchemy import and_
 
+from app.datamgmt.case.case_assets_db import asset_ip_network_filter
+from app.datamgmt.case.case_iocs_db import ioc_value_network_filter
+from app.datamgmt.case.case_iocs_db import ioc_value_pattern_filter
+from app.datamgmt.case.case_iocs_db import parse_ip_network
 from app.forms import SearchForm
 from app.iris_engine.utils.tracker import track_activity
+from app.models import AssetsType
+from app.models import CaseAssets
 from app.models import Comments
 from app.models.authorization import Permissions
 from app.models.cases import Cases
@@ -66,6 +72,9 @@ def search_file_post(caseid: int):
     #         return response_success("Results fetched", [])
 
     if search_type == "ioc":
+        network = parse_ip_network(search_value)
+        value_condition = ioc_value_network_filter(network) if network else ioc_value_pattern_filter(search_value)
+
         res = Ioc.query.with_entities(
                             Ioc.ioc_value.label('ioc_name'),
                             Ioc.ioc_description.label('ioc_description'),
@@ -78,7 +87,7 @@ def search_file_post(caseid: int):
                             Client.name.label('customer_name')
                     ).filter(
                         and_(
-                            Ioc.ioc_value.like(search_value),
+                            value_condition,
                             IocLink.ioc_id == Ioc.ioc_id,
                             IocLink.case_id == Cases.case_id,
                             Client.client_id == Cases.client_id,
@@ -89,6 +98,34 @@ def search_file_post(caseid: int):
 
         files = [row._asdict() for row in res]
 
+    if search_type == "assets":
+        network = parse_ip_network(search_value)
+        if network:
+            value_condition = asset_ip_network_filter(network)
+        else:
+            value_condition = CaseAssets.asset_name.ilike(search_value)
+
+        res = CaseAssets.query.with_entities(
+            CaseAssets.asset_name,
+            CaseAssets.asset_description,
+            CaseAssets.asset_ip,
+            AssetsType.asset_name.label('type_name'),
+            Cases.name.label('case_name'),
+            Cases.case_id,
+            Client.name.label('customer_name')
+        ).filter(
+            value_condition,
+            search_condition
+        ).join(
+            CaseAssets.asset_type
+        ).join(
+            CaseAssets.case
+        ).join(
+            Cases.client
+        ).all()
+
+        files = [row._asdict() for row in res]
+
     if search_type == "notes":
 
         ns = []
@@ -172,6 +172,7 @@ PG_PORT_ = config.load('POSTGRES', 'PORT')
 PG_DB_ = config.load('POSTGRES', 'DB', fallback='iris_db')
 CELERY_BROKER_ = config.load('CELERY', 'BROKER',
                              fallback=f"amqp://{config.load('CELERY', 'HOST', fallback='rabbitmq')}")
+CASE_STATS_REFRESH_INTERVAL_ = int(config.load('IRIS', 'CASE_STATS_REFRESH_INTERVAL', fallback=3600))
 
 
 # Grabs the folder where the script runs.
@@ -252,12 +253,39 @@ if authentication_type == 'oidc_proxy':
 
 
 # --------- CELERY ---------
+# Maintenance tasks run by the beat. They are not summarized nor listed in the DIM tasks
+CELERY_INTERNAL_TASKS = (
+    'app.iris_engine.tasker.tasks.task_refresh_cases_stats',
+    'app.iris_engine.tasker.tasks.task_archive_activities',
+    'app.iris_engine.tasker.tasks.task_summarize_dim_tasks',
+    'app.iris_engine.tasker.tasks.task_archive_dim_tasks'
+)
+
+
 class CeleryConfig:
     result_backend = "db+" + SQLALCHEMY_BASE_URI + "iris_tasks"  # use database as storage
     broker_url = CELERY_BROKER_
     result_extended = True
     result_serializer = "json"
     worker_pool_restarts = True
+    beat_schedule = {
+        'refresh-cases-stats': {
+            'task': 'app.iris_engine.tasker.tasks.task_refresh_cases_stats',
+            'schedule': CASE_STATS_REFRESH_INTERVAL_
+        },
+        'archive-activities': {
+            'task': 'app.iris_engine.tasker.tasks.task_archive_activities',
+            'schedule': timedelta(days=1)
+        },
+        'summarize-dim-tasks': {
+            'task': 'app.iris_engine.tasker.tasks.task_summarize_dim_tasks',
+            'schedule': timedelta(minutes=5)
+        },
+        'archive-dim-tasks': {
+            'task': 'app.iris_engine.tasker.tasks.task_archive_dim_tasks',
+            'schedule': timedelta(days=1)
+        }
+    }
 
 
 # --------- APP ---------
@@ -274,6 +302,10 @@ class Config:
     MODULES_INTERFACE_MIN_VERSION = '1.1'
     MODULES_INTERFACE_MAX_VERSION = '1.2.0'
 
+    # Either web, serving the UI and the API, or worker, only running the Celery tasks
+    IRIS_COMPONENT = os.environ.get('IRIS_COMPONENT', 'web')
+    IMPORT_TIMING = config.load('IRIS', 'IMPORT_TIMING', fallback='False') == 'True'
+
     if os.environ.get('IRIS_WORKER') is None:
         CSRF_ENABLED = True
 
@@ -332,6 +364,15 @@ class Config:
     TEMPLATES_PATH = config.load('IRIS', 'TEMPLATES_PATH', fallback="/home/iris/user_templates")
     BACKUP_PATH = config.load('IRIS', 'BACKUP_PATH', fallback="/home/iris/server_data/backup")
     UPDATES_PATH = os.path.join(BACKUP_PATH, 'updates')
+    ACTIVITIES_ARCHIVE_PATH = config.load('IRIS', 'ACTIVITIES_ARCHIVE_PATH',
+                                          fallback=os.path.join(BACKUP_PATH, 'activities'))
+    ACTIVITIES_RETENTION_DAYS = int(config.load('IRIS', 'ACTIVITIES_RETENTION_DAYS', fallback=0))
+    DIM_TASKS_ARCHIVE_PATH = config.load('IRIS', 'DIM_TASKS_ARCHIVE_PATH',
+                                         fallback=os.path.join(BACKUP_PATH, 'dim_tasks'))
+    DIM_TASKS_RETENTION_DAYS = int(config.load('IRIS', 'DIM_TASKS_RETENTION_DAYS', fallback=0))
+    DIM_TASKS_FAILED_RETENTION_DAYS = int(config.load('IRIS', 'DIM_TASKS_FAILED_RETENTION_DAYS',
+                                                      fallback=DIM_TASKS_RETENTION_DAYS))
+    DIM_TASKS_RETENTION_COUNT = int(config.load('IRIS', 'DIM_TASKS_RETENTION_COUNT', fallback=0))
 
     RELEASE_URL = config.load('IRIS', 'RELEASE_URL',
                               fallback="https://api.github.com/repos/dfir-iris/iris-web/releases")
@@ -341,6 +382,19 @@ class Config:
     PG_CLIENT_PATH = config.load('IRIS', 'PG_CLIENT_PATH', fallback="/usr/bin")
     ASSET_STORE_PATH = config.load('IRIS', 'ASSET_STORE_PATH', fallback="/home/iris/server_data/custom_assets")
     DATASTORE_PATH = config.load('IRIS', 'DATASTORE_PATH', fallback="/home/iris/server_data/datastore")
+    DATASTORE_SENDFILE_MODE = config.load('IRIS', 'DATASTORE_SENDFILE_MODE', fallback='').strip().lower()
+    if DATASTORE_SENDFILE_MODE not in ('', 'x-accel', 'x-sendfile'):
+        log.error(f'Unsupported DATASTORE_SENDFILE_MODE "{DATASTORE_SENDFILE_MODE}", expected x-accel or x-sendfile. '
+                  f'The datastore files are sent by the app')
+        DATASTORE_SENDFILE_MODE = ''
+    DATASTORE_SENDFILE_PREFIX = config.load('IRIS', 'DATASTORE_SENDFILE_PREFIX', fallback='/_datastore/')
+    CHUNKED_UPLOADS_PATH = config.load('IRIS', 'CHUNKED_UPLOADS_PATH',
+                                       fallback=os.path.join(DATASTORE_PATH, 'Uploads'))
+    CHUNKED_UPLOADS_MAX_CHUNK_SIZE = int(config.load('IRIS', 'CHUNKED_UPLOADS_MAX_CHUNK_SIZE',
+                                                     fallback=64 * 1024 * 1024))
+    CHUNKED_UPLOADS_MAX_AGE = int(config.load('IRIS', 'CHUNKED_UPLOADS_MAX_AGE', fallback=24 * 60 * 60))
+    BULK_IMPORT_SYNC_MAX_ROWS = int(config.load('IRIS', 'BULK_IMPORT_SYNC_MAX_ROWS', fallback=1000))
+    STREAM_YIELD_PER = int(config.load('IRIS', 'STREAM_YIELD_PER', fallback=1000))
     ASSET_SHOW_PATH = "/static/assets/img/graph"
 
     ORGANISATION_NAME = config.load('IRIS', 'ORGANISATION_NAME', fallback='')
@@ -353,6 +407,13 @@ class Config:
 
     DROPZONE_TIMEOUT = 15 * 60 * 10000  # 15 Minutes of uploads per file
 
+    """ Case graph configuration
+    Above this number of links, the objects of an event are drawn as a star instead of a full mesh
+    """
+    GRAPH_MAX_EVENT_EDGES = int(config.load('IRIS', 'GRAPH_MAX_EVENT_EDGES', fallback=500))
+    COLLAB_COALESCE_WINDOW = int(config.load('IRIS', 'COLLAB_COALESCE_WINDOW', fallback=100))
+    ACTIVITY_TRACKING_SYNC = config.load('IRIS', 'ACTIVITY_TRACKING_SYNC', fallback='False') == 'True'
+
     """ Celery configuration
     Configure URL and backend
     """
@@ -389,6 +450,8 @@ class Config:
         AUTHENTICATION_INIT_ADMINISTRATOR_EMAIL = config.load('OIDC', 'IRIS_INIT_ADMINISTRATOR_EMAIL',
                                                               fallback="")
         AUTHENTICATION_APP_ADMIN_ROLE_NAME = authentication_app_admin_role_name
+        OIDC_TOKEN_CACHE_TTL = int(config.load('OIDC', 'IRIS_TOKEN_CACHE_TTL', fallback=300))
+        OIDC_JWKS_CACHE_TTL = int(config.load('OIDC', 'IRIS_JWKS_CACHE_TTL', fallback=3600))
 
     elif authentication_type == 'ldap':
         LDAP_SERVER = config.load('LDAP', 'SERVER')
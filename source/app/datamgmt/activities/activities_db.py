@@ -16,9 +16,14 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
+import base64
+import binascii
+from datetime import datetime
 from sqlalchemy import and_
 from sqlalchemy import desc
+from sqlalchemy import tuple_
 
+from app import db
 from app.models import Cases
 from app.models.authorization import User
 from app.models.models import UserActivity
@@ -81,8 +86,46 @@ def get_manual_activities(caseid):
     return manual_activities
 
 
-def get_users_activities():
-    user_activities = UserActivity.query.with_entities(
+def encode_activities_cursor(activity):
+    """
+    Builds an opaque pagination cursor from the last activity of a page
+    """
+    raw = f"{activity['activity_date'].isoformat()}|{activity['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_activities_cursor(cursor):
+    """
+    Returns the (activity_date, id) tuple held by a pagination cursor, None if invalid
+    """
+    try:
+        activity_date, activity_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        activity_date, activity_id = datetime.fromisoformat(activity_date), int(activity_id)
+
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+    # The cursor is not signed, so an edited one must still be comparable with the naive dates and bigint ids
+    if activity_date.tzinfo is not None or not 0 <= activity_id < 2 ** 63:
+        return None
+
+    return activity_date, activity_id
+
+
+def get_activities_page(include_unbound=False, per_page=100, cursor=None):
+    """
+    Returns a page of activities, most recent first, using a keyset pagination on (activity_date, id)
+
+    Args:
+        include_unbound: also returns the activities which are not displayed in the UI
+        per_page: maximum number of activities to return
+        cursor: cursor returned with the previous page
+
+    Returns:
+        Tuple (activities, next_cursor). next_cursor is None on the last page
+    """
+    query = UserActivity.query.with_entities(
+        UserActivity.id,
         Cases.name.label("case_name"),
         User.name.label("user_name"),
         UserActivity.user_id,
@@ -91,42 +134,74 @@ def get_users_activities():
         UserActivity.activity_desc,
         UserActivity.user_input,
         UserActivity.is_from_api
-    ).filter(
-        UserActivity.display_in_ui == True
     ).outerjoin(
         UserActivity.user
     ).outerjoin(
         UserActivity.case
-    ).order_by(desc(UserActivity.activity_date)).limit(10000).all()
+    )
+
+    if not include_unbound:
+        query = query.filter(UserActivity.display_in_ui == True)
+
+    if cursor:
+        query = query.filter(
+            tuple_(UserActivity.activity_date, UserActivity.id) < cursor
+        )
+
+    activities = query.order_by(
+        desc(UserActivity.activity_date),
+        desc(UserActivity.id)
+    ).limit(per_page + 1).all()
+
+    activities = [row._asdict() for row in activities]
+    next_cursor = None
+    if len(activities) > per_page:
+        activities = activities[:per_page]
+        next_cursor = encode_activities_cursor(activities[-1])
+
+    return activities, next_cursor
+
 
-    return user_activities
+def get_users_activities():
+    activities, _ = get_activities_page(include_unbound=False, per_page=10000)
+
+    return activities
 
 
 def get_all_users_activities():
-    user_activities = UserActivity.query.with_entities(
-        Cases.name.label("case_name"),
-        User.name.label("user_name"),
+    activities, _ = get_activities_page(include_unbound=True, per_page=10000)
+
+    return activities
+
+
+def get_activities_older_than(cutoff_date, limit=5000):
+    """
+    Returns the oldest activities registered before cutoff_date, oldest first
+    """
+    activities = UserActivity.query.with_entities(
+        UserActivity.id,
         UserActivity.user_id,
         UserActivity.case_id,
         UserActivity.activity_date,
         UserActivity.activity_desc,
         UserActivity.user_input,
-        UserActivity.is_from_api
-    ).join(
-        UserActivity.case
-    ).join(
-        UserActivity.user
-    ).order_by(desc(UserActivity.activity_date)).limit(10000).all()
-
-    user_activities += UserActivity.query.with_entities(
-        UserActivity.case_id.label("case_name"),
-        UserActivity.user_id.label("user_name"),
+        UserActivity.is_from_api,
+        UserActivity.display_in_ui
+    ).filter(
+        UserActivity.activity_date < cutoff_date
+    ).order_by(
         UserActivity.activity_date,
-        UserActivity.activity_desc,
-        UserActivity.user_input,
-        UserActivity.is_from_api
-    ).filter(and_(
-        UserActivity.case_id == None
-    )).order_by(desc(UserActivity.activity_date)).limit(10000).all()
+        UserActivity.id
+    ).limit(limit).all()
+
+    return [row._asdict() for row in activities]
 
-    return user_activities
+
+def delete_activities(activities_ids):
+    """
+    Deletes the given activities
+    """
+    UserActivity.query.filter(
+        UserActivity.id.in_(activities_ids)
+    ).delete(synchronize_session=False)
+    db.session.commit()
@@ -27,9 +27,15 @@ from typing import List, Tuple
 
 import app
 from app import db
+from app.datamgmt.case.case_assets_db import asset_ip_network_filter
 from app.datamgmt.case.case_assets_db import create_asset, set_ioc_links, get_unspecified_analysis_status_id
 from app.datamgmt.case.case_events_db import update_event_assets, update_event_iocs
 from app.datamgmt.case.case_iocs_db import add_ioc, add_ioc_link
+from app.datamgmt.case.case_iocs_db import ioc_value_network_filter
+from app.datamgmt.case.case_iocs_db import ioc_values_filter
+from app.datamgmt.case.case_iocs_db import parse_ip_network
+from app.datamgmt.correlations.correlations_db import correlation_values_filter
+from app.datamgmt.correlations.correlations_db import get_values_related_alerts
 from app.datamgmt.manage.manage_access_control_db import get_user_clients_id
 from app.datamgmt.manage.manage_case_state_db import get_case_state_by_name
 from app.datamgmt.manage.manage_case_templates_db import get_case_template_by_id, \
@@ -49,6 +55,22 @@ def db_list_all_alerts():
     return db.session.query(Alert).all()
 
 
+def _split_ip_networks(values):
+    """
+    Splits filter values between the IP addresses or networks, matched by containment or overlap, and the others
+    """
+    networks = []
+    others = []
+    for value in values:
+        network = parse_ip_network(value)
+        if network:
+            networks.append(network)
+        else:
+            others.append(value)
+
+    return networks, others
+
+
 def get_filtered_alerts(
         start_date: str = None,
         end_date: str = None,
@@ -88,8 +110,8 @@ def get_filtered_alerts(
         client (int): The client id of the alert
         classification (int): The classification id of the alert
         alert_ids (int): The alert ids
-        assets (list): The assets of the alert
-        iocs (list): The iocs of the alert
+        assets (list): The assets of the alert, IP addresses or networks matching the assets IP by overlap
+        iocs (list): The iocs of the alert, IP addresses or networks matching the IP iocs by overlap
         resolution_status (int): The resolution status of the alert
         page (int): The page number
         per_page (int): The number of alerts per page
@@ -147,11 +169,21 @@ def get_filtered_alerts(
 
     if assets is not None:
         if isinstance(assets, list):
-            conditions.append(Alert.assets.any(CaseAssets.asset_name.in_(assets)))
+            networks, names = _split_ip_networks(assets)
+            asset_conditions = [asset_ip_network_filter(network) for network in networks]
+            if names:
+                asset_conditions.append(CaseAssets.asset_name.in_(names))
+
+            conditions.append(Alert.assets.any(or_(*asset_conditions)))
 
     if iocs is not None:
         if isinstance(iocs, list):
-            conditions.append(Alert.iocs.any(Ioc.ioc_value.in_(iocs)))
+            networks, values = _split_ip_networks(iocs)
+            ioc_conditions = [ioc_value_network_filter(network) for network in networks]
+            if values:
+                ioc_conditions.append(ioc_values_filter(values))
+
+            conditions.append(Alert.iocs.any(or_(*ioc_conditions)))
 
     if current_user_id is not None:
         clients_filters = get_user_clients_id(current_user_id)
@@ -794,22 +826,7 @@ def get_related_alerts(customer_id, assets, iocs, details=False):
     asset_names = [asset.asset_name for asset in assets]
     ioc_values = [ioc.ioc_value for ioc in iocs]
 
-    similar_assets = SimilarAlertsCache.query.filter(
-        SimilarAlertsCache.customer_id == customer_id,
-        SimilarAlertsCache.asset_name.in_(asset_names)
-    ).all()
-
-    similar_iocs = SimilarAlertsCache.query.filter(
-        SimilarAlertsCache.customer_id == customer_id,
-        SimilarAlertsCache.ioc_value.in_(ioc_values)
-    ).all()
-
-    similarities = {
-        'assets': [asset.alert_id for asset in similar_assets],
-        'iocs': [ioc.alert_id for ioc in similar_iocs]
-    }
-
-    return similarities
+    return get_values_related_alerts(customer_id, asset_names, ioc_values)
 
 
 def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_alerts, open_cases, closed_cases,
@@ -845,9 +862,18 @@ def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_al
 
     conditions = and_(SimilarAlertsCache.customer_id == customer_id,
                       or_(
-                        tuple_(SimilarAlertsCache.asset_name,SimilarAlertsCache.asset_type_id).in_(asset_names)
-                        ,
-                        tuple_(SimilarAlertsCache.ioc_value, SimilarAlertsCache.ioc_type_id).in_(ioc_values)
+                        and_(
+                            correlation_values_filter(SimilarAlertsCache.asset_name_hash,
+                                                      SimilarAlertsCache.asset_name,
+                                                      [asset_name for asset_name, _ in asset_names]),
+                            tuple_(SimilarAlertsCache.asset_name, SimilarAlertsCache.asset_type_id).in_(asset_names)
+                        ),
+                        and_(
+                            correlation_values_filter(SimilarAlertsCache.ioc_value_hash,
+                                                      SimilarAlertsCache.ioc_value,
+                                                      [ioc_value for ioc_value, _ in ioc_values]),
+                            tuple_(SimilarAlertsCache.ioc_value, SimilarAlertsCache.ioc_type_id).in_(ioc_values)
+                        )
                       ))
 
     if open_alerts:
@@ -976,7 +1002,7 @@ def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_al
             .join(IocLink.ioc)
             .join(IocLink.case)
             .filter(
-                Ioc.ioc_value.in_(added_iocs),
+                ioc_values_filter(added_iocs),
                 close_condition
             )
             .distinct()
@@ -989,7 +1015,7 @@ def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_al
             .with_entities(CaseAssets.case_id, CaseAssets.asset_name, Cases.name, Cases.close_date)
             .join(CaseAssets.case)
             .filter(
-                CaseAssets.asset_name.in_(added_assets),
+                correlation_values_filter(CaseAssets.asset_name_hash, CaseAssets.asset_name, added_assets),
                 close_condition
             )
             .distinct(CaseAssets.case_id)
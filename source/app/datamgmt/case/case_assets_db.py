@@ -20,7 +20,9 @@ import datetime
 
 from flask_login import current_user
 from sqlalchemy import and_
+from sqlalchemy import cast
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import INET
 
 from app import db, app
 from app.datamgmt.states import update_assets_state
@@ -29,7 +31,6 @@ from app.models import AssetComments
 from app.models import AssetsType
 from app.models import CaseAssets
 from app.models import CaseEventsAssets
-from app.models import Cases
 from app.models import Comments
 from app.models import CompromiseStatus
 from app.models import Ioc
@@ -41,6 +42,20 @@ from app.models.authorization import User
 
 log = app.logger
 
+def asset_ip_network_filter(network):
+    """
+    Builds the condition matching the assets whose IP address or network overlaps a network, through the
+    IP network index
+
+    Args:
+        network: IP network, as returned by parse_ip_network
+
+    Returns:
+        SQL condition
+    """
+    return CaseAssets.asset_ip_inet.op('&&')(cast(network, INET))
+
+
 def create_asset(asset, caseid, user_id):
 
     asset.date_added = datetime.datetime.utcnow()
@@ -57,6 +72,10 @@ def create_asset(asset, caseid, user_id):
 
 
 def get_assets(caseid):
+    """
+    Returns the assets of a case with their type and analysis status. The rows are fetched by batches through a
+    server-side cursor while they are iterated, so the query is meant to be iterated once
+    """
     assets = CaseAssets.query.with_entities(
         CaseAssets.asset_id,
         CaseAssets.asset_uuid,
@@ -78,7 +97,7 @@ def get_assets(caseid):
         CaseAssets.asset_type
     ).join(
         CaseAssets.analysis_status
-    ).all()
+    ).yield_per(app.config.get('STREAM_YIELD_PER'))
 
     return assets
 
@@ -232,27 +251,6 @@ def get_assets_ioc_links(caseid):
 
     return ioc_links_req
 
-def get_similar_assets(asset_name, asset_type_id, caseid, customer_id, cases_limitation):
-
-    linked_assets = CaseAssets.query.with_entities(
-        Cases.name.label('case_name'),
-        Cases.open_date.label('case_open_date'),
-        CaseAssets.asset_description,
-        CaseAssets.asset_compromise_status_id,
-        CaseAssets.asset_id,
-        CaseAssets.case_id
-    ).filter(
-        Cases.client_id == customer_id,
-        CaseAssets.case_id != caseid
-    ).filter(
-        CaseAssets.asset_name == asset_name,
-        CaseAssets.asset_type_id == asset_type_id,
-        Cases.case_id.in_(cases_limitation)
-    ).join(CaseAssets.case).all()
-
-    return (lasset._asdict() for lasset in linked_assets)
-
-
 def delete_ioc_asset_link(asset_id):
     IocAssetLink.query.filter(
         IocAssetLink.asset_id == asset_id
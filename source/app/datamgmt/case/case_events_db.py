@@ -138,6 +138,24 @@ def get_case_events_comments_count(events_list):
     ).all()
 
 
+def get_case_events_comments_ids(caseid):
+    """
+    Returns the ids of the comments of all the events of a case, as (event id, comment id) rows
+    """
+    return EventComments.query.with_entities(
+        EventComments.comment_event_id,
+        EventComments.comment_id
+    ).join(
+        CasesEvent,
+        CasesEvent.event_id == EventComments.comment_event_id
+    ).filter(
+        CasesEvent.case_id == caseid
+    ).group_by(
+        EventComments.comment_event_id,
+        EventComments.comment_id
+    ).all()
+
+
 def get_case_event_comment(event_id, comment_id, caseid):
     return EventComments.query.filter(
         EventComments.comment_event_id == event_id,
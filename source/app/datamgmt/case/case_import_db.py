@@ -0,0 +1,346 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import csv
+import re
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app import db
+from app.datamgmt.case.case_iocs_db import ioc_values_filter
+from app.models import AnalysisStatus
+from app.models import AssetsType
+from app.models import CaseAssets
+from app.models import Ioc
+from app.models import IocLink
+from app.models import IocType
+from app.models import Tags
+from app.models import Tlp
+from app.models import UserActivity
+
+IOC_CSV_HEADERS = ['ioc_value', 'ioc_type', 'ioc_description', 'ioc_tags', 'ioc_tlp']
+ASSET_CSV_HEADERS = ['asset_name', 'asset_type_name', 'asset_description', 'asset_ip', 'asset_domain', 'asset_tags']
+
+
+def read_import_csv(csv_text, headers):
+    """
+    Reads an uploaded CSV, adding the expected headers when the file has none
+
+    Args:
+        csv_text: content of the file
+        headers: expected columns
+
+    Returns:
+        list of dict
+    """
+    csv_lines = csv_text.splitlines()
+    if not csv_lines:
+        return []
+
+    if csv_lines[0].lower() != ','.join(headers):
+        csv_lines.insert(0, ','.join(headers))
+
+    return list(csv.DictReader(csv_lines, quotechar='"', delimiter=','))
+
+
+def _missing_fields(row, headers, index):
+    return [f"{header} is missing for row {index}" for header in headers if row.get(header) is None]
+
+
+def _format_tags(tags):
+    if not tags:
+        return tags
+
+    return tags.replace("|", ",")
+
+
+def validate_iocs_rows(rows):
+    """
+    Validates IOC rows against the IOC types and TLPs, loaded once for the whole file. Rows with the same value
+    and type are only imported once
+
+    Args:
+        rows: rows read from the CSV
+
+    Returns:
+        tuple: valid rows, ready to be inserted, and list of errors
+    """
+    ioc_types = {ioc_type.type_name: ioc_type for ioc_type in IocType.query.all()}
+    tlps = {tlp.tlp_name: tlp.tlp_id for tlp in Tlp.query.all()}
+    validation_regexes = {
+        ioc_type.type_id: re.compile(ioc_type.type_validation_regex, re.IGNORECASE)
+        for ioc_type in ioc_types.values() if ioc_type.type_validation_regex
+    }
+
+    valid_rows = []
+    errors = []
+    seen = set()
+
+    for index, row in enumerate(rows):
+        missing = _missing_fields(row, IOC_CSV_HEADERS, index)
+        if missing:
+            errors.extend(missing)
+            continue
+
+        if not row.get('ioc_value'):
+            errors.append(f"Empty IOC value for row {index}")
+            continue
+
+        ioc_type = ioc_types.get(row['ioc_type'].lower())
+        if not ioc_type:
+            errors.append(f"{row['ioc_value']} (invalid ioc type: {row['ioc_type']}) for row {index}")
+            continue
+
+        tlp_id = tlps.get(row['ioc_tlp'])
+        if not tlp_id:
+            errors.append(f"{row['ioc_value']} (invalid TLP: {row['ioc_tlp']}) for row {index}")
+            continue
+
+        regex = validation_regexes.get(ioc_type.type_id)
+        if regex and not regex.fullmatch(row['ioc_value']):
+            expected = ioc_type.type_validation_expect or ioc_type.type_validation_regex
+            errors.append(f"{row['ioc_value']} (doesn't match the expected format: {expected}) for row {index}")
+            continue
+
+        key = (row['ioc_value'], ioc_type.type_id)
+        if key in seen:
+            errors.append(f"{row['ioc_value']} (duplicated in the file) for row {index}")
+            continue
+
+        seen.add(key)
+        valid_rows.append({
+            'ioc_value': row['ioc_value'],
+            'ioc_type_id': ioc_type.type_id,
+            'ioc_description': row['ioc_description'],
+            'ioc_tags': _format_tags(row['ioc_tags']),
+            'ioc_tlp_id': tlp_id
+        })
+
+    return valid_rows, errors
+
+
+def validate_assets_rows(rows):
+    """
+    Validates asset rows against the asset types, loaded once for the whole file. Rows with the same name
+    and type are only imported once
+
+    Args:
+        rows: rows read from the CSV
+
+    Returns:
+        tuple: valid rows, ready to be inserted, and list of errors
+    """
+    asset_types = {asset_type.asset_name.lower(): asset_type.asset_id for asset_type in AssetsType.query.all()}
+
+    analysis_status = AnalysisStatus.query.filter(AnalysisStatus.name == 'Unspecified').first()
+    analysis_status_id = analysis_status.id if analysis_status else None
+
+    valid_rows = []
+    errors = []
+    seen = set()
+
+    for index, row in enumerate(rows):
+        missing = _missing_fields(row, ASSET_CSV_HEADERS, index)
+        if missing:
+            errors.extend(missing)
+            continue
+
+        if not row.get('asset_name'):
+            errors.append(f"Empty asset name for row {index}")
+            continue
+
+        if not row.get('asset_type_name'):
+            errors.append(f"Empty asset type for row {index}")
+            continue
+
+        asset_type_id = asset_types.get(row['asset_type_name'].lower())
+        if not asset_type_id:
+            errors.append(f"{row['asset_name']} (invalid asset type: {row['asset_type_name']}) for row {index}")
+            continue
+
+        key = (row['asset_name'], asset_type_id)
+        if key in seen:
+            errors.append(f"{row['asset_name']} (duplicated in the file) for row {index}")
+            continue
+
+        seen.add(key)
+        valid_rows.append({
+            'asset_name': row['asset_name'],
+            'asset_type_id': asset_type_id,
+            'asset_description': row['asset_description'],
+            'asset_ip': row['asset_ip'],
+            'asset_domain': row['asset_domain'],
+            'asset_tags': _format_tags(row['asset_tags']),
+            'analysis_status_id': analysis_status_id
+        })
+
+    return valid_rows, errors
+
+
+def register_import_tags(rows, tags_field):
+    """
+    Creates the tags used by the imported rows which do not exist yet, with a single insert
+    """
+    tags = set()
+    for row in rows:
+        if row.get(tags_field):
+            tags.update(tag.strip() for tag in row[tags_field].split(',') if tag.strip())
+
+    if not tags:
+        return
+
+    db.session.execute(pg_insert(Tags).values([
+        {'tag_title': tag, 'tag_creation_date': datetime.utcnow()} for tag in tags
+    ]).on_conflict_do_nothing(index_elements=[Tags.tag_title]))
+
+
+def import_iocs_batch(rows, case_id, user_id, custom_attributes):
+    """
+    Imports a batch of validated IOC rows in a case. The IOCs which already exist are looked up with a single
+    query and only linked, the new ones are inserted at once, as well as the missing links
+
+    Args:
+        rows: validated IOC rows
+        case_id: id of the case
+        user_id: id of the user importing the IOCs
+        custom_attributes: default custom attributes of the IOCs
+
+    Returns:
+        tuple: ids of the IOCs newly linked to the case, list of errors
+    """
+    if not rows:
+        return [], []
+
+    existing = db.session.query(
+        Ioc.ioc_id,
+        Ioc.ioc_value,
+        Ioc.ioc_type_id
+    ).filter(
+        ioc_values_filter([row['ioc_value'] for row in rows])
+    ).all()
+
+    ioc_ids = {}
+    for ioc in existing:
+        ioc_ids.setdefault((ioc.ioc_value, ioc.ioc_type_id), ioc.ioc_id)
+
+    new_rows = [dict(row, user_id=user_id, custom_attributes=custom_attributes)
+                for row in rows if (row['ioc_value'], row['ioc_type_id']) not in ioc_ids]
+
+    if new_rows:
+        inserted = db.session.execute(
+            insert(Ioc).values(new_rows).returning(Ioc.ioc_id, Ioc.ioc_value, Ioc.ioc_type_id)
+        ).all()
+
+        for ioc in inserted:
+            ioc_ids[(ioc.ioc_value, ioc.ioc_type_id)] = ioc.ioc_id
+
+    linked = {
+        link.ioc_id for link in IocLink.query.with_entities(IocLink.ioc_id).filter(
+            IocLink.case_id == case_id,
+            IocLink.ioc_id.in_(ioc_ids.values())
+        ).all()
+    }
+
+    errors = []
+    to_link = []
+    for row in rows:
+        ioc_id = ioc_ids[(row['ioc_value'], row['ioc_type_id'])]
+        if ioc_id in linked:
+            errors.append(f"{row['ioc_value']} (already exists and linked to this case)")
+            continue
+
+        to_link.append(ioc_id)
+
+    if to_link:
+        db.session.execute(insert(IocLink).values([{'ioc_id': ioc_id, 'case_id': case_id} for ioc_id in to_link]))
+
+    return to_link, errors
+
+
+def import_assets_batch(rows, case_id, user_id, custom_attributes):
+    """
+    Imports a batch of validated asset rows in a case. The assets which already exist in the case, with the same
+    name and type, are looked up with a single query and skipped, the new ones are inserted at once
+
+    Args:
+        rows: validated asset rows
+        case_id: id of the case
+        user_id: id of the user importing the assets
+        custom_attributes: default custom attributes of the assets
+
+    Returns:
+        tuple: ids of the new assets, list of errors
+    """
+    if not rows:
+        return [], []
+
+    existing = {
+        (asset.asset_name, asset.asset_type_id) for asset in CaseAssets.query.with_entities(
+            CaseAssets.asset_name,
+            CaseAssets.asset_type_id
+        ).filter(
+            CaseAssets.case_id == case_id,
+            CaseAssets.asset_name.in_({row['asset_name'] for row in rows})
+        ).all()
+    }
+
+    errors = []
+    new_rows = []
+    now = datetime.utcnow()
+    for row in rows:
+        if (row['asset_name'], row['asset_type_id']) in existing:
+            errors.append(f"{row['asset_name']} (already exists in this case)")
+            continue
+
+        new_rows.append(dict(row, case_id=case_id, user_id=user_id, date_added=now, date_update=now,
+                             custom_attributes=custom_attributes))
+
+    if not new_rows:
+        return [], errors
+
+    inserted = db.session.execute(insert(CaseAssets).values(new_rows).returning(CaseAssets.asset_id)).all()
+
+    return [asset.asset_id for asset in inserted], errors
+
+
+def get_imported_iocs(ioc_ids):
+    return Ioc.query.filter(Ioc.ioc_id.in_(ioc_ids)).all()
+
+
+def get_imported_assets(asset_ids):
+    return CaseAssets.query.filter(CaseAssets.asset_id.in_(asset_ids)).all()
+
+
+def add_import_activities(messages, case_id, user_id, is_from_api):
+    """
+    Records the activities of an import with a single insert
+    """
+    if not messages:
+        return
+
+    now = datetime.utcnow()
+    db.session.execute(insert(UserActivity).values([{
+        'user_id': user_id,
+        'case_id': case_id,
+        'activity_date': now,
+        'activity_desc': message.capitalize(),
+        'user_input': False,
+        'is_from_api': is_from_api,
+        'display_in_ui': True
+    } for message in messages]))
@@ -15,15 +15,20 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import ipaddress
 from flask_login import current_user
+from sqlalchemy import Text
 from sqlalchemy import and_
+from sqlalchemy import cast
+from sqlalchemy import func
+from sqlalchemy import literal
+from sqlalchemy.dialects.postgresql import INET
+from sqlalchemy.dialects.postgresql import UUID
 
+from app import app
 from app import db
 from app.datamgmt.states import update_ioc_state
-from app.iris_engine.access_control.utils import ac_get_fast_user_cases_access
 from app.models import CaseEventsIoc
-from app.models import Cases
-from app.models import Client
 from app.models import Comments
 from app.models import Ioc
 from app.models import IocAssetLink
@@ -121,6 +126,10 @@ def delete_ioc(ioc, caseid):
 
 
 def get_detailed_iocs(caseid):
+    """
+    Returns the IOCs of a case with their type and TLP. The rows are fetched by batches through a server-side cursor
+    while they are iterated, so the query is meant to be iterated once
+    """
     detailed_iocs = (IocLink.query.with_entities(
         Ioc.ioc_id,
         Ioc.ioc_uuid,
@@ -140,35 +149,136 @@ def get_detailed_iocs(caseid):
     ).join(IocLink.ioc)
      .join(Ioc.ioc_type)
      .join(Ioc.tlp)
-     .order_by(IocType.type_name).all())
+     .order_by(IocType.type_name).yield_per(app.config.get('STREAM_YIELD_PER')))
 
     return detailed_iocs
 
 
-def get_ioc_links(ioc_id, caseid):
-    search_condition = and_(Cases.case_id.in_([]))
+# Length of the value prefix and suffix covered by the pattern indexes
+IOC_PATTERN_INDEX_LENGTH = 255
 
-    user_search_limitations = ac_get_fast_user_cases_access(current_user.id)
-    if user_search_limitations:
-        search_condition = and_(Cases.case_id.in_(user_search_limitations))
 
-    ioc_link = (IocLink.query.with_entities(
-        Cases.case_id,
-        Cases.name.label('case_name'),
-        Client.name.label('client_name')
-    ).filter(and_(
-        IocLink.ioc_id == ioc_id,
-        IocLink.case_id != caseid,
-        search_condition)
-    ).join(IocLink.case)
-     .join(Cases.client)
-     .all())
+def ioc_value_hash(ioc_value):
+    """
+    Returns the SQL expression of the normalized hash of a value, the way the database computes Ioc.ioc_value_hash
+    """
+    return cast(func.md5(func.lower(func.btrim(literal(ioc_value, Text)))), UUID(as_uuid=True))
 
-    return ioc_link
+
+def ioc_value_filter(ioc_value, exact=True):
+    """
+    Builds the condition matching the IOCs with a value, through the value hash index
+
+    Args:
+        ioc_value: value to match
+        exact: if False, the values differing only by case or surrounding spaces also match
+
+    Returns:
+        SQL condition
+    """
+    condition = Ioc.ioc_value_hash == ioc_value_hash(ioc_value)
+    if exact:
+        condition = and_(condition, Ioc.ioc_value == ioc_value)
+
+    return condition
+
+
+def ioc_values_filter(ioc_values, exact=True):
+    """
+    Builds the condition matching the IOCs with any of the values, through the value hash index
+
+    Args:
+        ioc_values: values to match
+        exact: if False, the values differing only by case or surrounding spaces also match
+
+    Returns:
+        SQL condition
+    """
+    ioc_values = list(set(ioc_values))
+    condition = Ioc.ioc_value_hash.in_([ioc_value_hash(value) for value in ioc_values])
+    if exact:
+        condition = and_(condition, Ioc.ioc_value.in_(ioc_values))
+
+    return condition
+
+
+def _like_literal(pattern_part):
+    return '%' not in pattern_part and '_' not in pattern_part
+
+
+def ioc_value_pattern_filter(pattern):
+    """
+    Builds the condition matching the IOCs with a value like a pattern, ignoring case. A pattern without wildcard
+    is matched through the value hash index, a pattern starting or ending with a literal through the prefix or suffix
+    index, e.g. 10.0.% or %.example.com
+
+    Args:
+        pattern: SQL LIKE pattern
+
+    Returns:
+        SQL condition
+    """
+    pattern = pattern.lower()
+    if '\\' in pattern:
+        return func.lower(Ioc.ioc_value).like(pattern)
+
+    if _like_literal(pattern):
+        return ioc_value_filter(pattern, exact=False)
+
+    first_wildcard = min(i for i in (pattern.find('%'), pattern.find('_')) if i >= 0)
+    last_wildcard = max(pattern.rfind('%'), pattern.rfind('_'))
+    prefix = pattern[:first_wildcard][:IOC_PATTERN_INDEX_LENGTH]
+    suffix = pattern[last_wildcard + 1:][::-1][:IOC_PATTERN_INDEX_LENGTH]
+
+    condition = func.lower(Ioc.ioc_value).like(pattern)
+    if prefix:
+        return and_(
+            func.left(func.lower(Ioc.ioc_value), IOC_PATTERN_INDEX_LENGTH).like(f'{prefix}%'),
+            condition
+        )
+
+    if suffix:
+        return and_(
+            func.left(func.reverse(func.lower(Ioc.ioc_value)), IOC_PATTERN_INDEX_LENGTH).like(f'{suffix}%'),
+            condition
+        )
+
+    return condition
+
+
+def parse_ip_network(value):
+    """
+    Returns the IP network designated by a value, e.g. 10.20.0.0/16 or 10.20.1.5, or None if it is not an IP value
+
+    Args:
+        value: value to parse
+
+    Returns:
+        network in its canonical form, or None
+    """
+    try:
+        return str(ipaddress.ip_network(value.strip(), strict=False))
+
+    except (AttributeError, ValueError):
+        return None
+
+
+def ioc_value_network_filter(network):
+    """
+    Builds the condition matching the IOCs holding an IP address or network which overlaps a network, through the
+    IP network index
+
+    Args:
+        network: IP network, as returned by parse_ip_network
+
+    Returns:
+        SQL condition
+    """
+    return Ioc.ioc_value_inet.op('&&')(cast(network, INET))
 
 
 def find_ioc(ioc_value, ioc_type_id):
-    ioc = Ioc.query.filter(Ioc.ioc_value == ioc_value,
+    ioc = Ioc.query.filter(ioc_value_filter(ioc_value),
                            Ioc.ioc_type_id == ioc_type_id).first()
 
     return ioc
@@ -345,10 +455,10 @@ def get_ioc_by_value(ioc_value, caseid=None):
         return IocLink.query.with_entities(
             Ioc
         ).filter(and_(
-            Ioc.ioc_value == ioc_value,
+            ioc_value_filter(ioc_value),
             IocLink.case_id == caseid
         )).join(
             IocLink.ioc
         ).first()
 
-    return Ioc.query.filter(Ioc.ioc_value == ioc_value).first()
+    return Ioc.query.filter(ioc_value_filter(ioc_value)).first()
@@ -0,0 +1,213 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import CaseAssets
+from app.models import CaseStats
+from app.models import CaseTasks
+from app.models import Cases
+from app.models import CasesEvent
+from app.models import IocLink
+from app.models import ObjectState
+
+OPEN_TASKS_STATUS = [1, 2, 3]
+CLOSED_TASKS_STATUS = [4]
+
+
+def _count_by_case(session, column, case_ids, *conditions):
+    return dict(session.query(
+        column,
+        func.count()
+    ).filter(
+        column.in_(case_ids),
+        *conditions
+    ).group_by(
+        column
+    ).all())
+
+
+def refresh_cases_stats(case_ids=None):
+    """
+    Recomputes the stats of the given cases, or of all the cases if none is provided,
+    with one grouped query per counted object.
+    The stats are written and committed by a session of their own, so the changes pending in the session of the
+    caller are left alone. The stale flag is only cleared if the case was not flagged again while counting
+
+    Args:
+        case_ids: list of case ids
+
+    Returns:
+        Number of refreshed cases
+    """
+    if case_ids is not None and not case_ids:
+        return 0
+
+    with Session(db.engine) as session:
+        cases = session.query(
+            Cases.case_id,
+            Cases.owner_id,
+            Cases.close_date,
+            CaseStats.stale_version
+        ).outerjoin(
+            CaseStats, CaseStats.case_id == Cases.case_id
+        )
+        if case_ids is not None:
+            cases = cases.filter(Cases.case_id.in_(case_ids))
+
+        # The versions are read before counting, so a change flagged meanwhile is detected on write
+        cases = cases.all()
+        if not cases:
+            return 0
+
+        ids = [case.case_id for case in cases]
+
+        open_tasks = _count_by_case(session, CaseTasks.task_case_id, ids,
+                                    CaseTasks.task_status_id.in_(OPEN_TASKS_STATUS))
+        closed_tasks = _count_by_case(session, CaseTasks.task_case_id, ids,
+                                      CaseTasks.task_status_id.in_(CLOSED_TASKS_STATUS))
+        iocs = _count_by_case(session, IocLink.case_id, ids)
+        assets = _count_by_case(session, CaseAssets.case_id, ids)
+        events = _count_by_case(session, CasesEvent.case_id, ids)
+        last_activity = dict(session.query(
+            ObjectState.object_case_id,
+            func.max(ObjectState.object_last_update)
+        ).filter(
+            ObjectState.object_case_id.in_(ids)
+        ).group_by(
+            ObjectState.object_case_id
+        ).all())
+
+        now = datetime.utcnow()
+        rows = [{
+            'case_id': case.case_id,
+            'owner_id': case.owner_id,
+            'case_open': case.close_date is None,
+            'open_tasks': open_tasks.get(case.case_id, 0),
+            'closed_tasks': closed_tasks.get(case.case_id, 0),
+            'iocs_count': iocs.get(case.case_id, 0),
+            'assets_count': assets.get(case.case_id, 0),
+            'events_count': events.get(case.case_id, 0),
+            'last_activity': last_activity.get(case.case_id),
+            'stale': False,
+            'stale_version': case.stale_version or 0,
+            'refreshed_at': now
+        } for case in cases]
+
+        stmt = insert(CaseStats).values(rows)
+        set_ = {column: stmt.excluded[column] for column in rows[0]
+                if column not in ('case_id', 'stale', 'stale_version')}
+        # Compare-and-set on the version read before counting
+        set_['stale'] = CaseStats.stale_version != stmt.excluded.stale_version
+
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[CaseStats.case_id],
+            set_=set_
+        ))
+        session.commit()
+
+    return len(rows)
+
+
+def refresh_stale_cases_stats(case_ids=None):
+    """
+    Recomputes the stats flagged as outdated by the write paths.
+    With case ids, the cases which have no stats yet are computed too. Without, only the flagged stats are read,
+    through the index of the flag, the missing ones being left to the periodic refresh
+
+    Args:
+        case_ids: restricts the refresh to these case ids
+
+    Returns:
+        Number of refreshed cases
+    """
+    if case_ids is None:
+        stale = CaseStats.query.with_entities(
+            CaseStats.case_id
+        ).filter(
+            CaseStats.stale == True
+        )
+
+    else:
+        stale = Cases.query.with_entities(
+            Cases.case_id
+        ).outerjoin(
+            CaseStats, CaseStats.case_id == Cases.case_id
+        ).filter(
+            Cases.case_id.in_(case_ids),
+            or_(CaseStats.case_id.is_(None), CaseStats.stale == True)
+        )
+
+    stale_ids = [case.case_id for case in stale.all()]
+    if not stale_ids:
+        return 0
+
+    return refresh_cases_stats(stale_ids)
+
+
+def get_cases_stats(case_ids):
+    """
+    Returns the stats of the given cases, keyed by case id
+
+    Args:
+        case_ids: list of case ids
+
+    Returns:
+        dict
+    """
+    if not case_ids:
+        return {}
+
+    refresh_stale_cases_stats(case_ids)
+
+    stats = CaseStats.query.filter(
+        CaseStats.case_id.in_(case_ids)
+    ).all()
+
+    return {stat.case_id: stat for stat in stats}
+
+
+def get_cases_counts(user_id):
+    """
+    Returns the number of cases, of open cases and of open cases owned by the user
+
+    Args:
+        user_id: id of the user
+
+    Returns:
+        dict
+    """
+    # Only the stats flagged by the write paths are recomputed, the catch-up being left to the periodic refresh
+    refresh_stale_cases_stats()
+
+    counts = db.session.query(
+        func.count(CaseStats.case_id),
+        func.count(CaseStats.case_id).filter(CaseStats.case_open == True),
+        func.count(CaseStats.case_id).filter(CaseStats.case_open == True, CaseStats.owner_id == user_id)
+    ).one()
+
+    return {
+        'cases_count': counts[0],
+        'cases_open_count': counts[1],
+        'user_open_count': counts[2]
+    }
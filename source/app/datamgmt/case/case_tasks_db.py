@@ -56,6 +56,60 @@ def get_tasks(caseid):
     ).all()
 
 
+def get_tasks_assignees(tasks_ids):
+    """
+    Returns the assignees of a list of tasks, fetched in a single query
+
+    Args:
+        tasks_ids (list): List of task IDs
+
+    Returns:
+        dict: Task ID to list of assignees
+    """
+    assignee_list = {}
+    if not tasks_ids:
+        return assignee_list
+
+    get_assignee_list = TaskAssignee.query.with_entities(
+        TaskAssignee.task_id,
+        User.user,
+        User.id,
+        User.name
+    ).join(
+        TaskAssignee.user
+    ).filter(
+        TaskAssignee.task_id.in_(tasks_ids)
+    ).all()
+
+    for member in get_assignee_list:
+        assignee_list.setdefault(member.task_id, []).append({
+            'user': member.user,
+            'name': member.name,
+            'id': member.id
+        })
+
+    return assignee_list
+
+
+def add_tasks_assignees(tasks, task_id_key='task_id'):
+    """
+    Attaches the assignees to a list of tasks dict, fetched in a single query
+
+    Args:
+        tasks (list): List of tasks as dict
+        task_id_key (str): Key holding the task ID in the dicts
+
+    Returns:
+        list: The tasks, with task_assignees set
+    """
+    assignees_map = get_tasks_assignees([task[task_id_key] for task in tasks])
+
+    for task in tasks:
+        task['task_assignees'] = assignees_map.get(task[task_id_key], [])
+
+    return tasks
+
+
 def get_tasks_with_assignees(caseid):
     tasks = get_tasks(caseid)
     if not tasks:
@@ -63,39 +117,7 @@ def get_tasks_with_assignees(caseid):
 
     tasks = [c._asdict() for c in tasks]
 
-    task_with_assignees = []
-    for task in tasks:
-        task_id = task['task_id']
-        get_assignee_list = TaskAssignee.query.with_entities(
-            TaskAssignee.task_id,
-            User.user,
-            User.id,
-            User.name
-        ).join(
-            TaskAssignee.user
-        ).filter(
-            TaskAssignee.task_id == task_id
-        ).all()
-
-        assignee_list = {}
-        for member in get_assignee_list:
-            if member.task_id not in assignee_list:
-
-                assignee_list[member.task_id] = [{
-                    'user': member.user,
-                    'name': member.name,
-                    'id': member.id
-                }]
-            else:
-                assignee_list[member.task_id].append({
-                    'user': member.user,
-                    'name': member.name,
-                    'id': member.id
-                })
-        task['task_assignees'] = assignee_list.get(task['task_id'], [])
-        task_with_assignees.append(task)
-
-    return task_with_assignees
+    return add_tasks_assignees(tasks)
 
 
 def get_task(task_id, caseid):
@@ -121,32 +143,7 @@ def get_task_with_assignees(task_id: int, case_id: int):
     if not task:
         return None
 
-    get_assignee_list = TaskAssignee.query.with_entities(
-        TaskAssignee.task_id,
-        User.user,
-        User.id,
-        User.name
-    ).join(
-        TaskAssignee.user
-    ).filter(
-        TaskAssignee.task_id == task_id
-    ).all()
-
-    assignee_list = {}
-    for member in get_assignee_list:
-        if member.task_id not in assignee_list:
-
-            assignee_list[member.task_id] = [{
-                'user': member.user,
-                'name': member.name,
-                'id': member.id
-            }]
-        else:
-            assignee_list[member.task_id].append({
-                'user': member.user,
-                'name': member.name,
-                'id': member.id
-            })
+    assignee_list = get_tasks_assignees([task.id])
 
     setattr(task, 'task_assignees', assignee_list.get(task.id, []))
 
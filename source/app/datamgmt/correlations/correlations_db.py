@@ -0,0 +1,189 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from sqlalchemy import and_
+from sqlalchemy import false
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.datamgmt.case.case_iocs_db import ioc_value_hash
+from app.models import CaseAssets
+from app.models import Cases
+from app.models import Client
+from app.models import IocLink
+from app.models.alerts import SimilarAlertsCache
+
+# The correlations are resolved from the posting lists the database already keeps, each of them indexed:
+# - ioc_link, for the cases an IOC is linked to
+# - case_assets, by asset name hash and type, for the cases an asset is seen in
+# - similar_alerts_cache, by customer and value hash, for the alerts an IOC or asset is seen in
+# so a view resolves the correlations of all its objects with one query, whatever the history size
+
+
+def correlation_values_filter(hash_column, value_column, values):
+    """
+    Builds the condition matching the rows holding any of the values, through the index of their hash column.
+    All the hash columns hold md5(lower(btrim(value)))::uuid, so the values are compared exactly afterwards
+
+    Args:
+        hash_column: normalized hash column, e.g. CaseAssets.asset_name_hash
+        value_column: column holding the value, e.g. CaseAssets.asset_name
+        values: values to match
+
+    Returns:
+        SQL condition
+    """
+    values = list({value for value in values if value is not None})
+    if not values:
+        return false()
+
+    return and_(
+        hash_column.in_([ioc_value_hash(value) for value in values]),
+        value_column.in_(values)
+    )
+
+
+def get_case_iocs_correlations(caseid, cases_access):
+    """
+    Returns the other cases each IOC of a case is linked to, for all the IOCs of the case at once
+
+    Args:
+        caseid: id of the case
+        cases_access: ids of the cases the user can access
+
+    Returns:
+        dict: IOC id to the list of cases, as dict with case_id, case_name and client_name
+    """
+    if not cases_access:
+        return {}
+
+    case_link = aliased(IocLink)
+    other_link = aliased(IocLink)
+
+    links = db.session.query(
+        case_link.ioc_id,
+        Cases.case_id,
+        Cases.name.label('case_name'),
+        Client.name.label('client_name')
+    ).select_from(
+        case_link
+    ).join(
+        other_link, other_link.ioc_id == case_link.ioc_id
+    ).join(
+        Cases, Cases.case_id == other_link.case_id
+    ).join(
+        Client, Client.client_id == Cases.client_id
+    ).filter(
+        case_link.case_id == caseid,
+        other_link.case_id != caseid,
+        other_link.case_id.in_(cases_access)
+    ).distinct().all()
+
+    correlations = {}
+    for link in links:
+        correlations.setdefault(link.ioc_id, []).append({
+            'case_id': link.case_id,
+            'case_name': link.case_name,
+            'client_name': link.client_name
+        })
+
+    return correlations
+
+
+def get_case_assets_correlations(caseid, customer_id, cases_access):
+    """
+    Returns the assets with the same name and type in the other cases of the same customer, for all the assets of a
+    case at once
+
+    Args:
+        caseid: id of the case
+        customer_id: id of the customer of the case
+        cases_access: ids of the cases the user can access
+
+    Returns:
+        dict: asset id to the list of similar assets, as dict
+    """
+    if not cases_access:
+        return {}
+
+    case_asset = aliased(CaseAssets)
+    other_asset = aliased(CaseAssets)
+
+    similar_assets = db.session.query(
+        case_asset.asset_id.label('source_asset_id'),
+        Cases.name.label('case_name'),
+        Cases.open_date.label('case_open_date'),
+        other_asset.asset_description,
+        other_asset.asset_compromise_status_id,
+        other_asset.asset_id,
+        other_asset.case_id
+    ).select_from(
+        case_asset
+    ).join(
+        other_asset, and_(
+            other_asset.asset_name_hash == case_asset.asset_name_hash,
+            other_asset.asset_type_id == case_asset.asset_type_id,
+            other_asset.asset_name == case_asset.asset_name
+        )
+    ).join(
+        Cases, Cases.case_id == other_asset.case_id
+    ).filter(
+        case_asset.case_id == caseid,
+        other_asset.case_id != caseid,
+        Cases.client_id == customer_id,
+        other_asset.case_id.in_(cases_access)
+    ).all()
+
+    correlations = {}
+    for similar_asset in similar_assets:
+        similar_asset = similar_asset._asdict()
+        correlations.setdefault(similar_asset.pop('source_asset_id'), []).append(similar_asset)
+
+    return correlations
+
+
+def get_values_related_alerts(customer_id, asset_names, ioc_values):
+    """
+    Returns the alerts of a customer in which any of the asset names or IOC values were seen
+
+    Args:
+        customer_id: id of the customer
+        asset_names: names of the assets
+        ioc_values: values of the IOCs
+
+    Returns:
+        dict: alert ids for the assets and for the IOCs
+    """
+    similar_assets = SimilarAlertsCache.query.with_entities(
+        SimilarAlertsCache.alert_id
+    ).filter(
+        SimilarAlertsCache.customer_id == customer_id,
+        correlation_values_filter(SimilarAlertsCache.asset_name_hash, SimilarAlertsCache.asset_name, asset_names)
+    ).all()
+
+    similar_iocs = SimilarAlertsCache.query.with_entities(
+        SimilarAlertsCache.alert_id
+    ).filter(
+        SimilarAlertsCache.customer_id == customer_id,
+        correlation_values_filter(SimilarAlertsCache.ioc_value_hash, SimilarAlertsCache.ioc_value, ioc_values)
+    ).all()
+
+    return {
+        'assets': [asset.alert_id for asset in similar_assets],
+        'iocs': [ioc.alert_id for ioc in similar_iocs]
+    }
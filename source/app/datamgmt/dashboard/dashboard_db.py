@@ -112,17 +112,17 @@ def list_user_tasks():
         TaskStatus.status_bscolor
     ).join(
         CaseTasks.case
-    ).order_by(
-        desc(TaskStatus.status_name)
+    ).join(
+        CaseTasks.status
+    ).join(
+        TaskAssignee, TaskAssignee.task_id == CaseTasks.id
     ).filter(and_(
         TaskStatus.status_name != 'Done',
-        TaskStatus.status_name != 'Canceled'
-    )).join(
-        CaseTasks.status,
-    ).filter(and_(
-        TaskAssignee.task_id == CaseTasks.id,
+        TaskStatus.status_name != 'Canceled',
         TaskAssignee.user_id == current_user.id
-    )).all()
+    )).order_by(
+        desc(TaskStatus.status_name)
+    ).all()
 
     return ct
 
@@ -19,21 +19,29 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 import datetime
+import pyminizip
+import shutil
+import tempfile
+import uuid
 from pathlib import Path
 
 from flask_login import current_user
 from sqlalchemy import and_
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 
 from app import app
 from app import db
 from app.datamgmt.case.case_iocs_db import add_ioc_link
+from app.datamgmt.case.case_iocs_db import ioc_value_filter
 from app.models import CaseReceivedFile
+from app.models import DataStoreBlob
 from app.models import DataStoreFile
 from app.models import DataStorePath
 from app.models import Ioc
 from app.models import IocType
 from app.models import Tlp
+from app.util import stream_to_file
 
 
 def datastore_get_root(cid):
@@ -54,79 +62,182 @@ def datastore_get_root(cid):
 
     return dsp_root
 
-def ds_list_tree(cid):
-    dsp_root = datastore_get_root(cid)
+DS_TREE_FILE_COLUMNS = [
+    DataStoreFile.file_id,
+    DataStoreFile.file_uuid,
+    DataStoreFile.file_original_name,
+    DataStoreFile.file_local_name,
+    DataStoreFile.file_description,
+    DataStoreFile.file_date_added,
+    DataStoreFile.file_tags,
+    DataStoreFile.file_size,
+    DataStoreFile.file_is_ioc,
+    DataStoreFile.file_is_evidence,
+    DataStoreFile.file_password,
+    DataStoreFile.file_parent_id,
+    DataStoreFile.file_sha256,
+    DataStoreFile.added_by_user_id,
+    DataStoreFile.file_case_id
+]
+
+
+def _ds_file_node(dfile):
+    dfnode = dfile._asdict()
+    dfnode['type'] = "file"
+
+    return dfnode
+
+
+def _ds_path_node(dpath):
+    return {
+        "name": dpath.path_name,
+        "type": "directory",
+        "children": {}
+    }
 
-    dsp = DataStorePath.query.filter(
+
+def build_ds_tree(dsp_root, dsp, dsf):
+    """
+    Builds the datastore tree of a case in a single pass over its folders and files, indexed by id
+
+    Args:
+        dsp_root: root DataStorePath of the case
+        dsp: non root folders of the case
+        dsf: files of the case, as rows of DS_TREE_FILE_COLUMNS
+
+    Returns:
+        dict: tree rooted on the case root folder
+    """
+    droot_id = f"d-{dsp_root.path_id}"
+    droot_node = _ds_path_node(dsp_root)
+    droot_node["is_root"] = True
+
+    folders = {dsp_root.path_id: droot_node}
+    for dpath in dsp:
+        folders[dpath.path_id] = _ds_path_node(dpath)
+
+    # Folders whose parent is missing are attached to the root, so their content stays reachable
+    for dpath in dsp:
+        parent = folders.get(dpath.path_parent_id, droot_node)
+        parent["children"][f"d-{dpath.path_id}"] = folders[dpath.path_id]
+
+    for dfile in dsf:
+        parent = folders.get(dfile.file_parent_id, droot_node)
+        parent["children"][f"f-{dfile.file_id}"] = _ds_file_node(dfile)
+
+    return {
+        droot_id: droot_node
+    }
+
+
+def _ds_list_folders(cid):
+    return DataStorePath.query.with_entities(
+        DataStorePath.path_id,
+        DataStorePath.path_name,
+        DataStorePath.path_parent_id
+    ).filter(
         and_(DataStorePath.path_case_id == cid,
              DataStorePath.path_is_root == False
              )
     ).order_by(
-        DataStorePath.path_parent_id
+        DataStorePath.path_id
     ).all()
 
-    dsf = DataStoreFile.query.filter(
+
+def ds_list_tree(cid):
+    dsp_root = datastore_get_root(cid)
+
+    dsf = DataStoreFile.query.with_entities(
+        *DS_TREE_FILE_COLUMNS
+    ).filter(
         DataStoreFile.file_case_id == cid
+    ).order_by(
+        DataStoreFile.file_id
     ).all()
 
-    dsp_root = dsp_root
-    droot_id = f"d-{dsp_root.path_id}"
+    return build_ds_tree(dsp_root, _ds_list_folders(cid), dsf)
 
-    path_tree = {
-        droot_id: {
-            "name": dsp_root.path_name,
-            "type": "directory",
-            "is_root": True,
-            "children": {}
-        }
-    }
 
-    droot_children = path_tree[droot_id]["children"]
+def ds_list_folder(cid, folder_id=None):
+    """
+    Lists one level of the datastore tree of a case, with the number of children of each sub folder,
+    so the tree can be loaded folder by folder
 
-    files_nodes = {}
+    Args:
+        cid: case id
+        folder_id: id of the folder to list, the root folder of the case if not provided
 
-    for dfile in dsf:
-        dfnode = dfile.__dict__
-        dfnode.pop('_sa_instance_state')
-        dfnode['type'] = "file"
-        dnode_id = f"f-{dfile.file_id}"
-        dnode_parent_id = f"d-{dfile.file_parent_id}"
+    Returns:
+        dict: the folder, with its direct children, or None if the folder does not exist
+    """
+    if folder_id is None:
+        folder = datastore_get_root(cid)
+    else:
+        folder = datastore_get_path_node(folder_id, cid)
+
+    if folder is None:
+        return None
 
-        if dnode_parent_id == droot_id:
-            droot_children.update({
-                dnode_id: dfnode
-            })
+    folder_node = _ds_path_node(folder)
+    folder_node["is_root"] = bool(folder.path_is_root)
 
-        elif dnode_parent_id in files_nodes:
-            files_nodes[dnode_parent_id].update({
-                dnode_id: dfnode
-            })
+    dsp = DataStorePath.query.with_entities(
+        DataStorePath.path_id,
+        DataStorePath.path_name
+    ).filter(
+        DataStorePath.path_case_id == cid,
+        DataStorePath.path_parent_id == folder.path_id,
+        DataStorePath.path_is_root == False
+    ).order_by(
+        DataStorePath.path_name
+    ).all()
 
-        else:
-            files_nodes[dnode_parent_id] = {dnode_id: dfnode}
+    sub_ids = [dpath.path_id for dpath in dsp]
+    sub_folders_count = {}
+    sub_files_count = {}
+    if sub_ids:
+        sub_folders_count = dict(db.session.query(
+            DataStorePath.path_parent_id,
+            func.count(DataStorePath.path_id)
+        ).filter(
+            DataStorePath.path_case_id == cid,
+            DataStorePath.path_parent_id.in_(sub_ids)
+        ).group_by(
+            DataStorePath.path_parent_id
+        ).all())
+
+        sub_files_count = dict(db.session.query(
+            DataStoreFile.file_parent_id,
+            func.count(DataStoreFile.file_id)
+        ).filter(
+            DataStoreFile.file_case_id == cid,
+            DataStoreFile.file_parent_id.in_(sub_ids)
+        ).group_by(
+            DataStoreFile.file_parent_id
+        ).all())
 
     for dpath in dsp:
-        dpath_id = f"d-{dpath.path_id}"
-        dpath_parent_id = f"d-{dpath.path_parent_id}"
-        path_node = {
-            dpath_id: {
-                "name": dpath.path_name,
-                "type": "directory",
-                "children": {}
-            }
-        }
-
-        path_node_files = files_nodes.get(dpath_id)
-        if path_node_files:
-            path_node[dpath_id]["children"].update(path_node_files)
+        path_node = _ds_path_node(dpath)
+        path_node["children_count"] = sub_folders_count.get(dpath.path_id, 0) + sub_files_count.get(dpath.path_id, 0)
+        folder_node["children"][f"d-{dpath.path_id}"] = path_node
+
+    dsf = DataStoreFile.query.with_entities(
+        *DS_TREE_FILE_COLUMNS
+    ).filter(
+        DataStoreFile.file_case_id == cid,
+        DataStoreFile.file_parent_id == folder.path_id
+    ).order_by(
+        DataStoreFile.file_original_name
+    ).all()
 
-        if dpath_parent_id == droot_id:
-            droot_children.update(path_node)
+    for dfile in dsf:
+        folder_node["children"][f"f-{dfile.file_id}"] = _ds_file_node(dfile)
 
-        else:
-            datastore_iter_tree(dpath_parent_id, path_node, droot_children)
+    folder_node["children_count"] = len(folder_node["children"])
 
-    return path_tree
+    return {
+        f"d-{folder.path_id}": folder_node
+    }
 
 
 def init_ds_tree(cid):
@@ -160,18 +271,6 @@ def init_ds_tree(cid):
     return dsp_root
 
 
-def datastore_iter_tree(path_parent_id, path_node, tree):
-    for parent_id, node in tree.items():
-        if parent_id == path_parent_id:
-            node["children"].update(path_node)
-            return tree
-
-        if isinstance(node, dict):
-            datastore_iter_tree(path_parent_id, path_node, node)
-
-    return None
-
-
 def datastore_add_child_node(parent_node, folder_name, cid):
     try:
 
@@ -264,9 +363,7 @@ def datastore_delete_files_of_path(node_id, cid):
 
     for dsf_list_item in dsf_list:
 
-        fln = Path(dsf_list_item.file_local_name)
-        if fln.is_file():
-            fln.unlink(missing_ok=True)
+        datastore_release_file(dsf_list_item.file_local_name)
 
         db.session.delete(dsf_list_item)
         db.session.commit()
@@ -301,22 +398,140 @@ def datastore_get_interactive_path_node(cid):
     return dsp
 
 
-def datastore_get_standard_path(datastore_file, cid):
-    root_path = Path(app.config['DATASTORE_PATH'])
+def datastore_get_blobs_path():
+    blobs_path = Path(app.config['DATASTORE_PATH']) / 'Blobs'
+
+    if not blobs_path.is_dir():
+        blobs_path.mkdir(parents=True, exist_ok=True)
+
+    return blobs_path
+
+
+def _datastore_write_blob(staged_file, blob_path, password):
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if not password:
+        shutil.move(staged_file, blob_path)
+        return
+
+    # pyminizip names the archive entry after the source file, so the staged file takes the hash as name
+    hashed_file = staged_file.rename(staged_file.parent / blob_path.name.split('-')[0])
+    pyminizip.compress(hashed_file.as_posix(), None, blob_path.as_posix(), password, 0)
+
+
+def datastore_store_blob(stream, password=None):
+    """
+    Stores a stream in the content-addressable blob store. The content is hashed while it is written, and only
+    kept when no blob with the same hash and password exists, in which case the existing blob gets a new
+    reference. Expects a db commit soon after
+
+    Args:
+        stream: readable binary stream
+        password: password of the zip archive the content is stored in, if any
+
+    Returns:
+        tuple: local name of the blob, size and SHA-256 of the content
+    """
+    staging_dir = tempfile.mkdtemp(dir=datastore_get_blobs_path())
+    try:
+        staged_file = Path(staging_dir) / 'upload'
+        file_size, file_hash = stream_to_file(stream, staged_file)
+
+        blob_local_name = datastore_store_blob_file(staged_file, file_size, file_hash, password)
+
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    return blob_local_name, file_size, file_hash
+
+
+def datastore_store_blob_file(file_path, file_size, file_hash, password=None):
+    """
+    Stores a file already hashed on the server, such as an assembled chunked upload, in the content-addressable
+    blob store. The file is moved into the store, or left in place for the caller to delete if the blob
+    already exists. Expects a db commit soon after
+
+    Args:
+        file_path: path of the file
+        file_size: size of the file
+        file_hash: SHA-256 of the file
+        password: password of the zip archive the content is stored in, if any
+
+    Returns:
+        str: local name of the blob
+    """
+    password = password or ''
+    file_path = Path(file_path)
+
+    blob = DataStoreBlob.query.with_entities(
+        DataStoreBlob.blob_local_name
+    ).filter(
+        DataStoreBlob.blob_sha256 == file_hash,
+        DataStoreBlob.blob_password == password
+    ).first()
+
+    if blob is not None:
+        blob_path = Path(blob.blob_local_name)
+        written = False
 
-    if datastore_file.file_is_ioc:
-        target_path = root_path / 'IOCs'
-    elif datastore_file.file_is_evidence:
-        target_path = root_path / 'Evidences'
     else:
-        target_path = root_path / 'Regulars'
+        blob_path = datastore_get_blobs_path() / file_hash[:2] / (
+            f'{file_hash}-{uuid.uuid4()}.zip' if password else file_hash)
+        _datastore_write_blob(file_path, blob_path, password)
+        written = True
+
+    stmt = insert(DataStoreBlob).values(
+        blob_sha256=file_hash,
+        blob_password=password,
+        blob_local_name=blob_path.as_posix(),
+        blob_size=file_size,
+        blob_ref_count=1,
+        blob_date_added=datetime.datetime.utcnow()
+    )
+    blob_local_name, ref_count = db.session.execute(stmt.on_conflict_do_update(
+        constraint='uq_data_store_blob_sha256_password',
+        set_={'blob_ref_count': DataStoreBlob.blob_ref_count + 1}
+    ).returning(
+        DataStoreBlob.blob_local_name,
+        DataStoreBlob.blob_ref_count
+    )).one()
+
+    if written and blob_local_name != blob_path.as_posix():
+        # Stored concurrently by another upload
+        blob_path.unlink(missing_ok=True)
+
+    elif not written and ref_count == 1:
+        # Collected between the lookup and the new reference
+        _datastore_write_blob(file_path, Path(blob_local_name), password)
+
+    return blob_local_name
+
+
+def datastore_release_file(file_local_name):
+    """
+    Drops a reference to the blob of a datastore file, and deletes the blob once it is no longer referenced.
+    Files stored before the blob store are deleted directly. Expects a db commit soon after
+
+    Args:
+        file_local_name: local name of the datastore file
+    """
+    blob = DataStoreBlob.query.filter(
+        DataStoreBlob.blob_local_name == file_local_name
+    ).with_for_update().first()
+
+    if blob is None:
+        fln = Path(file_local_name)
+        if fln.is_file():
+            fln.unlink(missing_ok=True)
 
-    target_path = target_path / f"case-{cid}"
+        return
 
-    if not target_path.is_dir():
-        target_path.mkdir(parents=True, exist_ok=True)
+    blob.blob_ref_count -= 1
+    if blob.blob_ref_count > 0:
+        return
 
-    return target_path / f"dsf-{datastore_file.file_uuid}"
+    db.session.delete(blob)
+    Path(blob.blob_local_name).unlink(missing_ok=True)
 
 
 def datastore_get_file(file_id, cid):
@@ -337,9 +552,7 @@ def datastore_delete_file(cur_id, cid):
     if dsf is None:
         return True, 'Invalid DS file ID for this case'
 
-    fln = Path(dsf.file_local_name)
-    if fln.is_file():
-        fln.unlink(missing_ok=True)
+    datastore_release_file(dsf.file_local_name)
 
     db.session.delete(dsf)
     db.session.commit()
@@ -349,7 +562,7 @@ def datastore_delete_file(cur_id, cid):
 
 def datastore_add_file_as_ioc(dsf, caseid):
     ioc = Ioc.query.filter(
-        Ioc.ioc_value == dsf.file_sha256
+        ioc_value_filter(dsf.file_sha256)
     ).first()
 
     ioc_type_id = IocType.query.filter(
@@ -472,93 +685,21 @@ def datastore_filter_tree(filter_d, caseid):
         condition = and_(condition,
                          (DataStoreFile.file_password != ""))
 
-    dsp_root = DataStorePath.query.filter(
-        and_(DataStorePath.path_case_id == caseid,
-             DataStorePath.path_is_root == True
-             )
-    ).first()
-
-    if dsp_root is None:
-        init_ds_tree(caseid)
-
-        dsp_root = DataStorePath.query.filter(
-            and_(DataStorePath.path_case_id == caseid,
-                 DataStorePath.path_is_root == True
-                 )
-        ).first()
-
-    dsp = DataStorePath.query.filter(
-        and_(DataStorePath.path_case_id == caseid,
-             DataStorePath.path_is_root == False
-             )
-    ).order_by(
-        DataStorePath.path_parent_id
-    ).all()
+    dsp_root = datastore_get_root(caseid)
 
     try:
-        dsf = DataStoreFile.query.filter(
+        dsf = DataStoreFile.query.with_entities(
+            *DS_TREE_FILE_COLUMNS
+        ).filter(
             condition
+        ).order_by(
+            DataStoreFile.file_id
         ).all()
 
     except Exception as e:
         return None, str(e)
 
-    dsp_root = dsp_root
-    droot_id = f"d-{dsp_root.path_id}"
-
-    path_tree = {
-        droot_id: {
-            "name": dsp_root.path_name,
-            "type": "directory",
-            "is_root": True,
-            "children": {}
-        }
-    }
-
-    droot_children = path_tree[droot_id]["children"]
-
-    files_nodes = {}
-
-    for dfile in dsf:
-        dfnode = dfile.__dict__
-        dfnode.pop('_sa_instance_state')
-        dfnode['type'] = "file"
-        dnode_id = f"f-{dfile.file_id}"
-        dnode_parent_id = f"d-{dfile.file_parent_id}"
-
-        if dnode_parent_id == droot_id:
-            droot_children.update({
-                dnode_id: dfnode
-            })
-
-        elif dnode_parent_id in files_nodes:
-            files_nodes[dnode_parent_id].update({
-                dnode_id: dfnode
-            })
-
-        else:
-            files_nodes[dnode_parent_id] = {dnode_id: dfnode}
-
-    for dpath in dsp:
-        dpath_id = f"d-{dpath.path_id}"
-        dpath_parent_id = f"d-{dpath.path_parent_id}"
-        path_node = {
-            dpath_id: {
-                "name": dpath.path_name,
-                "type": "directory",
-                "children": {}
-            }
-        }
-
-        path_node_files = files_nodes.get(dpath_id)
-        if path_node_files:
-            path_node[dpath_id]["children"].update(path_node_files)
-
-        if dpath_parent_id == droot_id:
-            droot_children.update(path_node)
-
-        else:
-            datastore_iter_tree(dpath_parent_id, path_node, droot_children)
+    path_tree = build_ds_tree(dsp_root, _ds_list_folders(caseid), dsf)
 
     return path_tree, 'Success'
 
@@ -0,0 +1,365 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import json
+import pickle
+from celery import states
+from datetime import datetime
+from datetime import timedelta
+from sqlalchemy import and_
+from sqlalchemy import desc
+from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+from app.configuration import CELERY_INTERNAL_TASKS
+from app.models import CeleryTaskMeta
+from app.models import DimTaskSummary
+from iris_interface.IrisInterfaceStatus import IIStatus
+
+UPDATER_TASKS = 'app.iris_engine.updater.updater.%'
+
+
+def _task_success(state, result):
+    if isinstance(result, IIStatus):
+        try:
+            return result.is_success()
+        except Exception:
+            return None
+
+    return state == states.SUCCESS
+
+
+def _task_case_id(kwargs):
+    try:
+        return int(kwargs.get('caseid'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _summary_row(task_id, name, kwargs, state, result, date_start, date_done):
+    kwargs = kwargs if isinstance(kwargs, dict) else {}
+
+    return {
+        'task_id': task_id,
+        'name': name,
+        'module': kwargs.get('module_name'),
+        'hook': kwargs.get('hook_name'),
+        'case_id': _task_case_id(kwargs),
+        'user_name': kwargs.get('init_user'),
+        'state': state,
+        'success': _task_success(state, result),
+        'date_start': date_start,
+        'date_done': date_done,
+        'duration': (date_done - date_start).total_seconds() if date_start and date_done else None
+    }
+
+
+def is_internal_task(name):
+    """
+    Returns True if the task is one of the maintenance tasks run by the beat, which are not summarized
+    """
+    return name in CELERY_INTERNAL_TASKS
+
+
+def record_dim_task_summary(task_id, name, kwargs, state, result, date_start=None):
+    """
+    Writes the summary of a task which just completed, so the listing never has to read its result.
+    The maintenance tasks run by the beat are skipped
+
+    Args:
+        task_id: id of the task
+        name: name of the task
+        kwargs: keyword arguments the task was called with
+        state: final celery state of the task
+        result: value returned by the task
+        date_start: when the task started
+    """
+    if is_internal_task(name):
+        return
+
+    row = _summary_row(task_id, name, kwargs, state, result, date_start, datetime.utcnow())
+
+    stmt = insert(DimTaskSummary).values(row)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[DimTaskSummary.task_id],
+        set_={column: stmt.excluded[column] for column in row if column != 'task_id'}
+    ))
+    db.session.commit()
+
+
+def summarize_dim_tasks(batch_size=500):
+    """
+    Summarizes the completed tasks which have no summary yet, i.e. the tasks completed before the summaries
+    existed or by a worker which died before writing it. Each result is unpickled once, batch by batch
+
+    Args:
+        batch_size: number of tasks summarized per batch
+
+    Returns:
+        Number of summarized tasks
+    """
+    last_id = 0
+    count = 0
+
+    while True:
+        tasks = CeleryTaskMeta.query.outerjoin(
+            DimTaskSummary, DimTaskSummary.task_id == CeleryTaskMeta.task_id
+        ).filter(
+            DimTaskSummary.id.is_(None),
+            CeleryTaskMeta.id > last_id,
+            CeleryTaskMeta.task_id.isnot(None),
+            CeleryTaskMeta.status.in_(states.READY_STATES),
+            or_(CeleryTaskMeta.name.is_(None), CeleryTaskMeta.name.notin_(CELERY_INTERNAL_TASKS))
+        ).order_by(
+            CeleryTaskMeta.id
+        ).limit(batch_size).all()
+
+        if not tasks:
+            break
+
+        rows = {}
+        for task in tasks:
+            try:
+                result = pickle.loads(task.result)
+            except Exception:
+                result = None
+
+            try:
+                kwargs = json.loads(task.kwargs.decode('utf-8')) if task.kwargs else {}
+            except Exception:
+                kwargs = {}
+
+            rows[task.task_id] = _summary_row(task.task_id, task.name, kwargs, task.status, result,
+                                              None, task.date_done)
+
+        db.session.execute(insert(DimTaskSummary).values(list(rows.values())).on_conflict_do_nothing(
+            index_elements=[DimTaskSummary.task_id]
+        ))
+        db.session.commit()
+
+        count += len(rows)
+        last_id = tasks[-1].id
+
+        if len(tasks) < batch_size:
+            break
+
+    return count
+
+
+def _dim_tasks_query():
+    return DimTaskSummary.query.filter(
+        ~ DimTaskSummary.name.like(UPDATER_TASKS),
+        DimTaskSummary.name.notin_(CELERY_INTERNAL_TASKS)
+    ).order_by(
+        desc(DimTaskSummary.date_done),
+        desc(DimTaskSummary.id)
+    )
+
+
+def get_dim_tasks(count):
+    """
+    Returns the latest task summaries
+
+    Args:
+        count: maximum number of summaries
+
+    Returns:
+        list of DimTaskSummary
+    """
+    return _dim_tasks_query().limit(count).all()
+
+
+def get_dim_tasks_page(page=1, per_page=100):
+    """
+    Returns a page of task summaries, latest tasks first
+
+    Args:
+        page: page number
+        per_page: number of summaries per page
+
+    Returns:
+        Pagination of DimTaskSummary
+    """
+    return _dim_tasks_query().paginate(page=page, per_page=per_page, error_out=False)
+
+
+def dim_task_summary_to_dict(summary):
+    """
+    Formats a task summary the way the DIM tasks listing always returned it
+    """
+    if summary.module:
+        module = f"{summary.module}::{summary.hook}"
+    else:
+        module = summary.name
+
+    return {
+        'state': 'success' if summary.success else (summary.state or 'unknown').lower(),
+        'case': f"Case #{summary.case_id}" if summary.case_id is not None else "",
+        'module': module,
+        'task_id': summary.task_id,
+        'date_done': summary.date_done,
+        'user': summary.user_name if summary.user_name else "Shadow Iris",
+        'duration': summary.duration
+    }
+
+
+def _summary_as_dict(summary):
+    return {column.name: getattr(summary, column.name) for column in DimTaskSummary.__table__.columns}
+
+
+def dim_tasks_retention_conditions(retention_days=0, failed_retention_days=0, retention_count=0):
+    """
+    Builds the conditions matching the expired task summaries
+
+    Args:
+        retention_days: number of days successful tasks are kept, 0 to keep them
+        failed_retention_days: number of days the failed, revoked or unknown tasks are kept, 0 to keep them
+        retention_count: number of most recent tasks kept, 0 for no limit
+
+    Returns:
+        list of conditions, any of them expiring a task
+    """
+    conditions = []
+    now = datetime.utcnow()
+
+    if retention_days:
+        conditions.append(and_(
+            DimTaskSummary.success.is_(True),
+            DimTaskSummary.date_done < now - timedelta(days=retention_days)
+        ))
+
+    if failed_retention_days:
+        conditions.append(and_(
+            DimTaskSummary.success.isnot(True),
+            DimTaskSummary.date_done < now - timedelta(days=failed_retention_days)
+        ))
+
+    if retention_count:
+        oldest_kept = DimTaskSummary.query.with_entities(
+            DimTaskSummary.date_done
+        ).order_by(
+            desc(DimTaskSummary.date_done)
+        ).offset(retention_count - 1).limit(1).scalar()
+
+        if oldest_kept is not None:
+            conditions.append(DimTaskSummary.date_done < oldest_kept)
+
+    return conditions
+
+
+def get_expired_dim_tasks(conditions, limit=5000):
+    """
+    Returns the oldest summaries matching any of the retention conditions, oldest first
+    """
+    if not conditions:
+        return []
+
+    summaries = DimTaskSummary.query.filter(
+        or_(*conditions)
+    ).order_by(
+        DimTaskSummary.date_done,
+        DimTaskSummary.id
+    ).limit(limit).all()
+
+    return [_summary_as_dict(summary) for summary in summaries]
+
+
+def delete_dim_tasks(summaries):
+    """
+    Deletes the given summaries along with the results of their tasks
+    """
+    CeleryTaskMeta.query.filter(
+        CeleryTaskMeta.task_id.in_([summary['task_id'] for summary in summaries])
+    ).delete(synchronize_session=False)
+
+    DimTaskSummary.query.filter(
+        DimTaskSummary.id.in_([summary['id'] for summary in summaries])
+    ).delete(synchronize_session=False)
+
+    db.session.commit()
+
+
+def delete_internal_task_results(retention_days=0):
+    """
+    Deletes the results of the maintenance tasks run by the beat. They have no summary, so the retention of the
+    summaries never reaches them
+
+    Args:
+        retention_days: number of days the results are kept, 0 to delete all the completed ones
+
+    Returns:
+        Number of deleted results
+    """
+    conditions = [
+        CeleryTaskMeta.name.in_(CELERY_INTERNAL_TASKS),
+        CeleryTaskMeta.status.in_(states.READY_STATES)
+    ]
+    if retention_days:
+        conditions.append(CeleryTaskMeta.date_done < datetime.utcnow() - timedelta(days=retention_days))
+
+    count = CeleryTaskMeta.query.filter(*conditions).delete(synchronize_session=False)
+    db.session.commit()
+
+    return count
+
+
+def vacuum_dim_tasks():
+    """
+    Makes the space freed by deleted task results reusable, without locking the tables
+    """
+    with db.engines['iris_tasks'].connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(text(f'VACUUM (ANALYZE) {CeleryTaskMeta.__tablename__}'))
+        conn.execute(text(f'VACUUM (ANALYZE) {DimTaskSummary.__tablename__}'))
+
+
+def get_dim_tasks_storage_stats():
+    """
+    Returns the size of the task results and summaries tables, and the number of results per state
+
+    Returns:
+        dict
+    """
+    bind = {'bind': db.engines['iris_tasks']}
+
+    results_size, summaries_size = db.session.execute(select(
+        func.pg_total_relation_size(CeleryTaskMeta.__tablename__),
+        func.pg_total_relation_size(DimTaskSummary.__tablename__)
+    ), bind_arguments=bind).one()
+
+    results = db.session.query(
+        CeleryTaskMeta.status,
+        func.count(CeleryTaskMeta.id),
+        func.min(CeleryTaskMeta.date_done)
+    ).group_by(
+        CeleryTaskMeta.status
+    ).all()
+
+    oldest = [row[2] for row in results if row[2] is not None]
+
+    return {
+        'results_count': sum(row[1] for row in results),
+        'results_by_state': {row[0]: row[1] for row in results},
+        'results_size': results_size,
+        'oldest_result': min(oldest) if oldest else None,
+        'summaries_count': DimTaskSummary.query.count(),
+        'summaries_size': summaries_size
+    }
@@ -0,0 +1,147 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from datetime import timezone
+from sqlalchemy import desc
+from sqlalchemy import func
+
+from app import db
+from app.models import ObjectHistory
+
+
+def add_object_history_entry(object_type, object_id, action, user_name=None, user_id=None):
+    """
+    Appends a modification entry to the history of an object. Expects a db commit soon after
+
+    Args:
+        object_type: table name of the object
+        object_id: primary key of the object
+        action: description of the modification
+        user_name: login of the user who made the modification
+        user_id: id of the user who made the modification
+
+    Returns:
+        ObjectHistory
+    """
+    entry = ObjectHistory()
+    entry.object_type = object_type
+    entry.object_id = object_id
+    entry.ts = datetime.utcnow()
+    entry.action = action
+    entry.user_name = user_name
+    entry.user_id = user_id
+
+    db.session.add(entry)
+
+    return entry
+
+
+def _entry_timestamp(entry):
+    return entry.ts.replace(tzinfo=timezone.utc).timestamp()
+
+
+def history_entries_to_dict(entries):
+    """
+    Formats history entries as the legacy modification_history mapping, oldest entry first
+
+    Args:
+        entries: list of ObjectHistory
+
+    Returns:
+        dict: timestamp -> {user, user_id, action}
+    """
+    return {
+        _entry_timestamp(entry): {
+            'user': entry.user_name,
+            'user_id': entry.user_id,
+            'action': entry.action
+        } for entry in sorted(entries, key=lambda e: (e.ts, e.id))
+    }
+
+
+def get_object_history(object_type, object_id, page=1, per_page=50):
+    """
+    Returns a page of the history of an object, most recent entries first
+
+    Args:
+        object_type: table name of the object
+        object_id: primary key of the object
+        page: page number
+        per_page: number of entries per page
+
+    Returns:
+        Pagination of ObjectHistory
+    """
+    return ObjectHistory.query.filter(
+        ObjectHistory.object_type == object_type,
+        ObjectHistory.object_id == object_id
+    ).order_by(
+        desc(ObjectHistory.ts),
+        desc(ObjectHistory.id)
+    ).paginate(page=page, per_page=per_page, error_out=False)
+
+
+def get_object_history_dict(object_type, object_id, limit=50):
+    """
+    Returns the latest entries of the history of an object, as the legacy modification_history mapping
+
+    Args:
+        object_type: table name of the object
+        object_id: primary key of the object
+        limit: maximum number of entries
+
+    Returns:
+        dict: timestamp -> {user, user_id, action}
+    """
+    entries = ObjectHistory.query.filter(
+        ObjectHistory.object_type == object_type,
+        ObjectHistory.object_id == object_id
+    ).order_by(
+        desc(ObjectHistory.ts),
+        desc(ObjectHistory.id)
+    ).limit(limit).all()
+
+    return history_entries_to_dict(entries)
+
+
+def get_objects_last_update(object_type, object_ids):
+    """
+    Returns the timestamp of the latest history entry of each object, with a single query
+
+    Args:
+        object_type: table name of the objects
+        object_ids: list of primary keys
+
+    Returns:
+        dict: object id -> timestamp
+    """
+    if not object_ids:
+        return {}
+
+    res = db.session.query(
+        ObjectHistory.object_id,
+        func.max(ObjectHistory.ts)
+    ).filter(
+        ObjectHistory.object_type == object_type,
+        ObjectHistory.object_id.in_(object_ids)
+    ).group_by(
+        ObjectHistory.object_id
+    ).all()
+
+    return {object_id: ts.replace(tzinfo=timezone.utc).timestamp() for object_id, ts in res}
@@ -16,7 +16,6 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 from datetime import datetime
-from pathlib import Path
 from sqlalchemy import and_, desc, asc
 from sqlalchemy.orm import aliased
 from functools import reduce
@@ -24,8 +23,11 @@ from functools import reduce
 from app import db, app
 from app.datamgmt.alerts.alerts_db import search_alert_resolution_by_name
 from app.datamgmt.case.case_db import get_case_tags
+from app.datamgmt.datastore.datastore_db import datastore_release_file
+from app.datamgmt.history.history_db import get_object_history_dict
 from app.datamgmt.manage.manage_case_state_db import get_case_state_by_name
 from app.datamgmt.states import delete_case_states
+from app.datamgmt.states import mark_case_stats_stale
 from app.models import CaseAssets, CaseClassification, alert_assets_association, CaseStatus, TaskAssignee, NoteDirectory
 from app.models import CaseEventCategory
 from app.models import CaseEventsAssets
@@ -173,6 +175,7 @@ def close_case(case_id):
         res.close_date = datetime.utcnow()
 
         res.state_id = get_case_state_by_name('Closed').state_id
+        mark_case_stats_stale(case_id)
 
         db.session.commit()
         return res
@@ -212,6 +215,7 @@ def reopen_case(case_id):
         res.close_date = None
 
         res.state_id = get_case_state_by_name('Open').state_id
+        mark_case_stats_stale(case_id)
 
         db.session.commit()
         return res
@@ -259,7 +263,6 @@ def get_case_details_rt(case_id):
             Cases.state_id,
             CaseState.state_name,
             Cases.custom_attributes,
-            Cases.modification_history,
             Cases.initial_date,
             Cases.classification_id,
             CaseClassification.name.label('classification'),
@@ -290,6 +293,7 @@ def get_case_details_rt(case_id):
         res['status_name'] = CaseStatus(res['status_id']).name.replace("_", " ").title()
 
         res['protagonists'] = [r._asdict() for r in get_case_protagonists(case_id)]
+        res['modification_history'] = get_object_history_dict('cases', case_id)
 
     else:
         res = None
@@ -314,9 +318,7 @@ def delete_case(case_id):
 
     for dsf_list_item in dsf_list:
 
-        fln = Path(dsf_list_item.file_local_name)
-        if fln.is_file():
-            fln.unlink(missing_ok=True)
+        datastore_release_file(dsf_list_item.file_local_name)
 
         db.session.delete(dsf_list_item)
     db.session.commit()
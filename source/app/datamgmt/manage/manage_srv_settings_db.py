@@ -2,7 +2,6 @@ from sqlalchemy import text
 
 from app import db
 from app.models import ServerSettings
-from app.schema.marshables import ServerSettingsSchema
 
 
 def get_srv_settings():
@@ -10,6 +9,9 @@ def get_srv_settings():
 
 
 def get_server_settings_as_dict():
+    # Imported here, as the updater loaded by the worker imports this module and the worker does not load the schemas
+    from app.schema.marshables import ServerSettingsSchema
+
     srv_settings = ServerSettings.query.first()
     if srv_settings:
 
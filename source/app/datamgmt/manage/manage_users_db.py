@@ -29,6 +29,7 @@ from app.iris_engine.access_control.utils import ac_access_level_mask_from_val_l
 from app.iris_engine.access_control.utils import ac_access_level_to_list
 from app.iris_engine.access_control.utils import ac_auto_update_user_effective_access
 from app.iris_engine.access_control.utils import ac_get_detailed_effective_permissions_from_groups
+from app.iris_engine.access_control.utils import ac_notify_access_change
 from app.iris_engine.access_control.utils import ac_remove_case_access_from_user
 from app.iris_engine.access_control.utils import ac_set_case_access_for_user
 from app.models import Cases, Client
@@ -681,6 +682,8 @@ def delete_user(user_id):
     User.query.filter(User.id == user_id).delete()
     db.session.commit()
 
+    ac_notify_access_change()
+
 
 def user_exists(user_name, user_email):
     user = User.query.filter_by(user=user_name).first()
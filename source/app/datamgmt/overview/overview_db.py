@@ -17,8 +17,11 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 import datetime
 from sqlalchemy import and_
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm import selectinload
 
-from app.datamgmt.case.case_tasks_db import get_tasks_cases_mapping
+from app.datamgmt.case.case_stats_db import get_cases_stats
+from app.datamgmt.history.history_db import get_objects_last_update
 from app.datamgmt.manage.manage_cases_db import user_list_cases_view
 from app.models import Cases, CaseClassification
 from app.models import Client
@@ -42,28 +45,37 @@ def get_overview_db(user_id, show_full):
         Cases.owner
     ).join(
         Cases.client
+    ).options(
+        contains_eager(Cases.owner),
+        contains_eager(Cases.client),
+        selectinload(Cases.classification),
+        selectinload(Cases.state),
+        selectinload(Cases.tags),
+        selectinload(Cases.user),
+        selectinload(Cases.reviewer),
+        selectinload(Cases.review_status),
+        selectinload(Cases.severity)
     ).all()
 
-    cases_list = []
-    tasks_map = get_tasks_cases_mapping(open_cases_only=not show_full)
-    tmap = {}
-    for task in tasks_map:
-        if tmap.get(task.task_case_id) is None:
-            tmap[task.task_case_id] = {
-                'open_tasks': 0,
-                'closed_tasks': 0
-            }
+    stats = get_cases_stats([case.case_id for case in open_cases])
+    last_updates = get_objects_last_update('cases', [case.case_id for case in open_cases])
+    cases_schema = CaseDetailsSchema(exclude=['protagonists'])
 
-        if task.task_status_id in [1, 2, 3]:
-            tmap[task.task_case_id]['open_tasks'] += 1
-        elif task.task_status_id == 4:
-            tmap[task.task_case_id]['closed_tasks'] += 1
-
-    # open_cases_list = []
+    cases_list = []
     for case in open_cases:
-        c_case = CaseDetailsSchema().dump(case)
+        c_case = cases_schema.dump(case)
         c_case['case_open_since_days'] = (datetime.date.today() - case.open_date).days
-        c_case['tasks_status'] = tmap.get(case.case_id)
+        c_case['last_update'] = last_updates.get(case.case_id)
+
+        case_stats = stats.get(case.case_id)
+        if case_stats and case_stats.open_tasks + case_stats.closed_tasks > 0:
+            c_case['tasks_status'] = {
+                'open_tasks': case_stats.open_tasks,
+                'closed_tasks': case_stats.closed_tasks
+            }
+        else:
+            c_case['tasks_status'] = None
+
         cases_list.append(c_case)
 
     return cases_list
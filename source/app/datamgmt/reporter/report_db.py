@@ -20,9 +20,11 @@ import re
 
 from sqlalchemy import desc
 
+from app import app
 from app.datamgmt.case.case_notes_db import get_notes_from_group, get_case_note_comments
+from app.datamgmt.case.case_tasks_db import get_tasks_assignees
 from app.datamgmt.case.case_tasks_db import get_tasks_with_assignees
-from app.models import AnalysisStatus, CompromiseStatus, TaskAssignee, NotesGroupLink
+from app.models import AnalysisStatus, CompromiseStatus, NotesGroupLink
 from app.models import AssetsType
 from app.models import CaseAssets
 from app.models import CaseEventsAssets
@@ -47,9 +49,11 @@ from app.models.authorization import User
 from app.schema.marshables import CaseDetailsSchema, CommentSchema, CaseNoteSchema
 
 
-def export_case_json(case_id):
+def export_case_json(case_id, stream=False):
     """
     Fully export a case a JSON
+    With stream, the timeline, IOCs, assets and comments are generators reading their rows by batches, to be
+    consumed by response_success_stream
     """
     export = {}
     case = export_caseinfo_json(case_id)
@@ -62,11 +66,11 @@ def export_case_json(case_id):
 
     export['case'] = case
     export['evidences'] = export_case_evidences_json(case_id)
-    export['timeline'] = export_case_tm_json(case_id)
-    export['iocs'] = export_case_iocs_json(case_id)
-    export['assets'] = export_case_assets_json(case_id)
+    export['timeline'] = iter_case_tm_json(case_id) if stream else export_case_tm_json(case_id)
+    export['iocs'] = iter_case_iocs_json(case_id) if stream else export_case_iocs_json(case_id)
+    export['assets'] = iter_case_assets_json(case_id) if stream else export_case_assets_json(case_id)
     export['tasks'] = export_case_tasks_json(case_id)
-    export['comments'] = export_case_comments_json(case_id)
+    export['comments'] = iter_case_comments_json(case_id) if stream else export_case_comments_json(case_id)
     export['notes'] = export_case_notes_json(case_id)
     export['export_date'] = datetime.datetime.utcnow()
 
@@ -258,6 +262,49 @@ def export_case_notes_json(case_id):
 
 
 def export_case_tm_json(case_id):
+    return list(iter_case_tm_json(case_id))
+
+
+def iter_case_tm_json(case_id):
+    # The assets and IOCs of the events are read at once, rather than by event
+    as_list = CaseEventsAssets.query.with_entities(
+        CaseEventsAssets.event_id,
+        CaseAssets.asset_name,
+        AssetsType.asset_name.label('type')
+    ).filter(
+        CaseEventsAssets.case_id == case_id
+    ).join(
+        CaseEventsAssets.asset
+    ).join(
+        CaseAssets.asset_type
+    ).all()
+
+    events_assets = {}
+    for asset in as_list:
+        events_assets.setdefault(asset.event_id, []).append("{} ({})".format(asset.asset_name, asset.type))
+
+    iocs_list = CaseEventsIoc.query.with_entities(
+        CaseEventsIoc.event_id,
+        CaseEventsIoc.ioc_id,
+        Ioc.ioc_value,
+        Ioc.ioc_description,
+        Tlp.tlp_name,
+        IocType.type_name.label('type')
+    ).filter(
+        CaseEventsIoc.case_id == case_id
+    ).join(
+        CaseEventsIoc.ioc
+    ).join(
+        Ioc.ioc_type
+    ).join(
+        Ioc.tlp
+    ).all()
+
+    events_iocs = {}
+    for ioc in iocs_list:
+        ioc = ioc._asdict()
+        events_iocs.setdefault(ioc.pop('event_id'), []).append(ioc)
+
     timeline = CasesEvent.query.with_entities(
         CasesEvent.event_id,
         CasesEvent.event_title,
@@ -285,55 +332,21 @@ def export_case_tm_json(case_id):
         CasesEvent.user
     ).outerjoin(
         CasesEvent.category
-    ).all()
+    ).yield_per(app.config.get('STREAM_YIELD_PER'))
 
-    tim = []
     for row in timeline:
         ras = row._asdict()
-        ras['assets'] = None
-
-        as_list = CaseEventsAssets.query.with_entities(
-            CaseAssets.asset_id,
-            CaseAssets.asset_name,
-            AssetsType.asset_name.label('type')
-        ).filter(
-            CaseEventsAssets.event_id == row.event_id
-        ).join(
-            CaseEventsAssets.asset
-        ).join(
-            CaseAssets.asset_type
-        ).all()
-
-        alki = []
-        for asset in as_list:
-            alki.append("{} ({})".format(asset.asset_name, asset.type))
-
-        ras['assets'] = alki
-
-        iocs_list = CaseEventsIoc.query.with_entities(
-            CaseEventsIoc.ioc_id,
-            Ioc.ioc_value,
-            Ioc.ioc_description,
-            Tlp.tlp_name,
-            IocType.type_name.label('type')
-        ).filter(
-            CaseEventsIoc.event_id == row.event_id
-        ).join(
-            CaseEventsIoc.ioc
-        ).join(
-            Ioc.ioc_type
-        ).join(
-            Ioc.tlp
-        ).all()
-
-        ras['iocs'] = [ioc._asdict() for ioc in iocs_list]
-
-        tim.append(ras)
-
-    return tim
+        ras['assets'] = events_assets.get(row.event_id, [])
+        ras['iocs'] = events_iocs.get(row.event_id, [])
+
+        yield ras
 
 
 def export_case_iocs_json(case_id):
+    return list(iter_case_iocs_json(case_id))
+
+
+def iter_case_iocs_json(case_id):
     res = IocLink.query.with_entities(
         Ioc.ioc_value,
         IocType.type_name,
@@ -356,12 +369,10 @@ def export_case_iocs_json(case_id):
         Ioc.user
     ).order_by(
         IocType.type_name
-    ).all()
-
-    if res:
-        return [row._asdict() for row in res]
+    ).yield_per(app.config.get('STREAM_YIELD_PER'))
 
-    return []
+    for row in res:
+        yield row._asdict()
 
 
 def export_case_tasks_json(case_id):
@@ -384,43 +395,38 @@ def export_case_tasks_json(case_id):
 
     tasks = [c._asdict() for c in res]
 
-    task_with_assignees = []
+    assignees_map = get_tasks_assignees([task['id'] for task in tasks])
     for task in tasks:
-        task_id = task['id']
-        get_assignee_list = TaskAssignee.query.with_entities(
-            TaskAssignee.task_id,
-            User.user,
-            User.id,
-            User.name
-        ).join(
-            TaskAssignee.user
-        ).filter(
-            TaskAssignee.task_id == task_id
-        ).all()
-
-        assignee_list = {}
-        for member in get_assignee_list:
-            if member.task_id not in assignee_list:
-
-                assignee_list[member.task_id] = [{
-                    'user': member.user,
-                    'name': member.name,
-                    'id': member.id
-                }]
-            else:
-                assignee_list[member.task_id].append({
-                    'user': member.user,
-                    'name': member.name,
-                    'id': member.id
-                })
-        task['task_assignees'] = assignee_list.get(task['id'], [])
-        task_with_assignees.append(task)
-
-    return task_with_assignees
+        task['task_assignees'] = assignees_map.get(task['id'], [])
+
+    return tasks
 
 
 def export_case_assets_json(case_id):
-    ret = []
+    return list(iter_case_assets_json(case_id))
+
+
+def iter_case_assets_json(case_id):
+    # The IOCs of the assets are read at once, rather than by asset
+    ial = IocAssetLink.query.with_entities(
+        IocAssetLink.asset_id,
+        Ioc.ioc_value,
+        IocType.type_name,
+        Ioc.ioc_description
+    ).filter(
+        CaseAssets.case_id == case_id
+    ).join(
+        IocAssetLink.asset
+    ).join(
+        IocAssetLink.ioc
+    ).join(
+        Ioc.ioc_type
+    ).all()
+
+    assets_iocs = {}
+    for ioc in ial:
+        ioc = ioc._asdict()
+        assets_iocs.setdefault(ioc.pop('asset_id'), []).append(ioc)
 
     res = CaseAssets.query.with_entities(
         CaseAssets.asset_id,
@@ -442,28 +448,13 @@ def export_case_assets_json(case_id):
         CaseAssets.asset_type
     ).join(
         CaseAssets.analysis_status
-    ).order_by(desc(CaseAssets.asset_compromise_status_id)).all()
+    ).order_by(desc(CaseAssets.asset_compromise_status_id)).yield_per(app.config.get('STREAM_YIELD_PER'))
 
     for row in res:
         row = row._asdict()
         row['light_asset_description'] = row['asset_description']
 
-        ial = IocAssetLink.query.with_entities(
-            Ioc.ioc_value,
-            IocType.type_name,
-            Ioc.ioc_description
-        ).filter(
-            IocAssetLink.asset_id == row['asset_id']
-        ).join(
-            IocAssetLink.ioc
-        ).join(
-            Ioc.ioc_type
-        ).all()
-
-        if ial:
-            row['asset_ioc'] = [row._asdict() for row in ial]
-        else:
-            row['asset_ioc'] = []
+        row['asset_ioc'] = assets_iocs.get(row['asset_id'], [])
 
         if row['asset_compromise_status_id'] is None:
             row['asset_compromise_status_id'] = CompromiseStatus.unknown.value
@@ -473,12 +464,14 @@ def export_case_assets_json(case_id):
 
         row['asset_compromise_status'] = status_text
 
-        ret.append(row)
-
-    return ret
+        yield row
 
 
 def export_case_comments_json(case_id):
+    return list(iter_case_comments_json(case_id))
+
+
+def iter_case_comments_json(case_id):
     comments = Comments.query.with_entities(
         Comments.comment_id,
         Comments.comment_uuid,
@@ -491,6 +484,7 @@ def export_case_comments_json(case_id):
         Comments.user
     ).order_by(
         Comments.comment_date
-    ).all()
+    ).yield_per(app.config.get('STREAM_YIELD_PER'))
 
-    return [row._asdict() for row in comments]
+    for row in comments:
+        yield row._asdict()
@@ -19,8 +19,10 @@
 from datetime import datetime
 from flask_login import current_user
 from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert
 
 from app import db
+from app.models import CaseStats
 from app.models import ObjectState
 
 
@@ -59,9 +61,32 @@ def update_object_state(object_name, caseid, userid=None) -> ObjectState:
 
         db.session.add(os)
 
+    mark_case_stats_stale(caseid)
+
     return os
 
 
+def mark_case_stats_stale(caseid):
+    """
+    Flags the stats of a case as outdated, so they are recomputed on next read or by the periodic refresh.
+    The version is bumped so a refresh which counted before this change keeps the flag set.
+    Expects a db commit soon after
+
+    Args:
+        caseid: case id
+    """
+    db.session.execute(
+        insert(CaseStats).values(
+            case_id=caseid,
+            stale=True,
+            stale_version=1
+        ).on_conflict_do_update(
+            index_elements=[CaseStats.case_id],
+            set_={'stale': True, 'stale_version': CaseStats.stale_version + 1}
+        )
+    )
+
+
 def get_object_state(object_name, caseid):
     os = ObjectState.query.with_entities(
         ObjectState.object_state,
@@ -82,6 +107,10 @@ def delete_case_states(caseid):
         ObjectState.object_case_id == caseid
     ).delete()
 
+    CaseStats.query.filter(
+        CaseStats.case_id == caseid
+    ).delete()
+
 
 def update_timeline_state(caseid, userid=None):
     return update_object_state('timeline', caseid=caseid, userid=userid)
@@ -0,0 +1,199 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import hashlib
+import jwt
+import requests
+import threading
+import time
+from requests.auth import HTTPBasicAuth
+
+from app import app
+
+log = app.logger
+
+# Bounds the memory used by the tokens cache, whatever the number of distinct tokens seen
+TOKEN_CACHE_MAX_ENTRIES = 10000
+# Minimum delay between two fetches of the JWKS triggered by unknown key ids
+JWKS_MIN_REFRESH_INTERVAL = 30
+
+_lock = threading.Lock()
+_http_session = None
+_tokens = {}
+_jwks = {
+    'keys': {},
+    'fetched_at': 0
+}
+
+
+def _get_http_session():
+    """
+    Returns the HTTP session shared by the process, so the connections to the authentication server are reused
+    """
+    global _http_session
+
+    if _http_session is None:
+        with _lock:
+            if _http_session is None:
+                http_session = requests.Session()
+                if app.config.get('TLS_ROOT_CA'):
+                    http_session.verify = app.config.get('TLS_ROOT_CA')
+                _http_session = http_session
+
+    return _http_session
+
+
+def _token_hash(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def get_cached_token_subject(token):
+    """
+    Returns the subject of a token which was verified recently and did not expire since
+
+    Args:
+        token: raw token, as received from the proxy
+
+    Returns:
+        subject of the token or None
+    """
+    token_hash = _token_hash(token)
+    cached = _tokens.get(token_hash)
+    if cached is None:
+        return None
+
+    subject, expires_at = cached
+    if expires_at <= time.time():
+        _tokens.pop(token_hash, None)
+        return None
+
+    return subject
+
+
+def cache_verified_token(token, subject, token_exp=None):
+    """
+    Remembers that a token was verified. It is trusted until its own expiration,
+    and at most OIDC_TOKEN_CACHE_TTL seconds so a revoked token is eventually rejected
+
+    Args:
+        token: raw token, as received from the proxy
+        subject: subject the token was issued for
+        token_exp: expiration timestamp of the token, if known
+    """
+    ttl = app.config.get('OIDC_TOKEN_CACHE_TTL')
+    if not ttl or not subject:
+        return
+
+    now = time.time()
+    expires_at = now + ttl
+    if token_exp is not None:
+        try:
+            expires_at = min(expires_at, float(token_exp))
+        except (TypeError, ValueError):
+            return
+
+    if expires_at <= now:
+        return
+
+    with _lock:
+        if len(_tokens) >= TOKEN_CACHE_MAX_ENTRIES:
+            for key in [key for key, (_, exp) in _tokens.items() if exp <= now]:
+                del _tokens[key]
+
+            if len(_tokens) >= TOKEN_CACHE_MAX_ENTRIES:
+                _tokens.clear()
+
+        _tokens[_token_hash(token)] = (subject, expires_at)
+
+
+def introspect_token(token):
+    """
+    Asks the authentication server whether a token is active, through the shared session
+
+    Args:
+        token: raw token, as received from the proxy
+
+    Returns:
+        tuple: subject of the token or None, expiration timestamp or None
+    """
+    introspection = _get_http_session().post(
+        app.config.get("AUTHENTICATION_TOKEN_INTROSPECTION_URL"),
+        auth=HTTPBasicAuth(app.config.get('AUTHENTICATION_CLIENT_ID'), app.config.get('AUTHENTICATION_CLIENT_SECRET')),
+        data={"token": token}
+    )
+
+    if introspection.status_code != 200:
+        log.error(f"Token introspection failed with status {introspection.status_code}")
+        return None, None
+
+    response_json = introspection.json()
+    if response_json.get("active", False) is not True:
+        return None, None
+
+    return response_json.get("sub"), response_json.get("exp")
+
+
+def _refresh_jwks():
+    jwks = _get_http_session().get(app.config.get("AUTHENTICATION_JWKS_URL"))
+    jwks.raise_for_status()
+
+    keys = {}
+    for jwk in jwks.json().get('keys', []):
+        if jwk.get('use', 'sig') != 'sig':
+            continue
+
+        try:
+            keys[jwk.get('kid')] = jwt.PyJWK(jwk)
+        except jwt.PyJWKError as e:
+            log.warning(f"Ignoring unusable JWKS key {jwk.get('kid')}: {e}")
+
+    _jwks['keys'] = keys
+    _jwks['fetched_at'] = time.time()
+
+
+def _jwks_is_stale(kid):
+    age = time.time() - _jwks['fetched_at']
+    if age > app.config.get('OIDC_JWKS_CACHE_TTL'):
+        return True
+
+    return kid not in _jwks['keys'] and age > JWKS_MIN_REFRESH_INTERVAL
+
+
+def get_signing_key(token):
+    """
+    Returns the key which signed a token, from the JWKS cached by the process. The JWKS is fetched again when it
+    is older than OIDC_JWKS_CACHE_TTL, or when the token is signed by an unknown key, i.e. after a key rotation
+
+    Args:
+        token: raw token, as received from the proxy
+
+    Returns:
+        PyJWK
+    """
+    kid = jwt.get_unverified_header(token).get('kid')
+
+    if _jwks_is_stale(kid):
+        with _lock:
+            if _jwks_is_stale(kid):
+                _refresh_jwks()
+
+    key = _jwks['keys'].get(kid)
+    if key is None:
+        raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+
+    return key
@@ -20,6 +20,23 @@ from app.models.authorization import UserOrganisation
 
 log = app.app.logger
 
+# Bumped on every change of the effective accesses, so the authorizations cached by the socket connections
+# are checked again
+_access_state = {
+    'generation': 0
+}
+
+
+def ac_notify_access_change():
+    """
+    Notifies the socket connections that the effective accesses changed
+    """
+    _access_state['generation'] += 1
+
+
+def ac_get_access_generation():
+    return _access_state['generation']
+
 
 def ac_flag_match_mask(flag, mask):
     return (flag & mask) == mask
@@ -381,6 +398,7 @@ def ac_add_user_effective_access(users_list, case_id, access_level):
 
     db.session.add_all(access_to_add)
     db.session.commit()
+    ac_notify_access_change()
 
 
 def ac_add_user_effective_access_from_map(users_map, case_id):
@@ -402,6 +420,7 @@ def ac_add_user_effective_access_from_map(users_map, case_id):
 
     db.session.add_all(access_to_add)
     db.session.commit()
+    ac_notify_access_change()
 
 
 def ac_set_new_case_access(org_members, case_id, customer_id = None):
@@ -476,6 +495,7 @@ def ac_apply_autofollow_groups_access(case_id):
 
     db.session.add_all(rows_to_push)
     db.session.commit()
+    ac_notify_access_change()
     return users
 
 
@@ -521,6 +541,7 @@ def ac_auto_update_user_effective_access(user_id):
         db.session.add(ucea)
 
     db.session.commit()
+    ac_notify_access_change()
 
     return
 
@@ -552,6 +573,7 @@ def ac_remove_case_access_from_user(user_id, case_id):
         uac.access_level = CaseAccessLevel.deny_all.value
 
     db.session.commit()
+    ac_notify_access_change()
 
     return
 
@@ -604,6 +626,8 @@ def ac_set_case_access_for_user(user_id, case_id, access_level, commit=True):
     if commit:
         db.session.commit()
 
+    ac_notify_access_change()
+
     return
 
 
@@ -14,11 +14,22 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import gzip
+import json
 import subprocess
 from datetime import datetime
+from datetime import timedelta
 from pathlib import Path
 
 from app import app
+from app.datamgmt.activities.activities_db import delete_activities
+from app.datamgmt.activities.activities_db import get_activities_older_than
+from app.datamgmt.dim_tasks.dim_tasks_db import delete_dim_tasks
+from app.datamgmt.dim_tasks.dim_tasks_db import delete_internal_task_results
+from app.datamgmt.dim_tasks.dim_tasks_db import dim_tasks_retention_conditions
+from app.datamgmt.dim_tasks.dim_tasks_db import get_expired_dim_tasks
+from app.datamgmt.dim_tasks.dim_tasks_db import summarize_dim_tasks
+from app.datamgmt.dim_tasks.dim_tasks_db import vacuum_dim_tasks
 
 log = app.logger
 
@@ -70,3 +81,130 @@ def backup_iris_db():
         logs.append(f'Backup completed in {backup_file}')
 
     return False, logs
+
+
+def archive_iris_activities(retention_days, chunk_size=5000):
+    """
+    Moves the activities older than retention_days to a compressed JSON lines export,
+    then deletes them from the database. Activities are processed by chunks, so the
+    archiving never holds more than chunk_size rows in memory.
+
+    :param retention_days: Number of days of activities to keep in database
+    :param chunk_size: Number of activities archived and deleted per transaction
+    :return: Tuple (has_error, logs)
+    """
+    logs = []
+    archive_dir = Path(app.config.get('ACTIVITIES_ARCHIVE_PATH'))
+
+    try:
+
+        archive_dir.mkdir(parents=True, exist_ok=True)
+
+    except Exception as e:
+        logs.append('Unable to create activities archive directory')
+        logs.append(str(e))
+        return True, logs
+
+    cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
+    archive_file = archive_dir / "activities-{}.jsonl.gz".format(datetime.now().strftime("%Y-%m-%d_%H%M%S"))
+
+    archived = 0
+    try:
+        with gzip.open(archive_file, 'wt', encoding='utf-8') as archive:
+            while True:
+                activities = get_activities_older_than(cutoff_date, limit=chunk_size)
+                if not activities:
+                    break
+
+                for activity in activities:
+                    archive.write(json.dumps(activity, default=str))
+                    archive.write('\n')
+
+                # The chunk must be on disk before it is removed from the database
+                archive.flush()
+                delete_activities([activity['id'] for activity in activities])
+                archived += len(activities)
+
+    except Exception as e:
+        logs.append('Something went wrong archiving activities')
+        logs.append(str(e))
+        return True, logs
+
+    if archived == 0:
+        archive_file.unlink(missing_ok=True)
+        logs.append(f'No activities older than {cutoff_date} to archive')
+        return False, logs
+
+    logs.append(f'Archived {archived} activities older than {cutoff_date} in {archive_file}')
+    return False, logs
+
+
+def archive_iris_dim_tasks(retention_days=0, failed_retention_days=0, retention_count=0, chunk_size=5000):
+    """
+    Moves the summaries of the expired DIM tasks to a compressed JSON lines export, then deletes them
+    from the database along with the results of the tasks. Tasks are processed by chunks, the same way
+    as the activities. The results of the maintenance tasks, which have no summary, are deleted without
+    being archived once older than the shortest retention in days.
+
+    :param retention_days: Number of days successful tasks are kept, 0 to keep them
+    :param failed_retention_days: Number of days failed tasks are kept, 0 to keep them
+    :param retention_count: Number of most recent tasks kept, 0 for no limit
+    :param chunk_size: Number of tasks archived and deleted per transaction
+    :return: Tuple (has_error, logs)
+    """
+    logs = []
+    archive_dir = Path(app.config.get('DIM_TASKS_ARCHIVE_PATH'))
+
+    try:
+
+        archive_dir.mkdir(parents=True, exist_ok=True)
+
+    except Exception as e:
+        logs.append('Unable to create DIM tasks archive directory')
+        logs.append(str(e))
+        return True, logs
+
+    archive_file = archive_dir / "dim-tasks-{}.jsonl.gz".format(datetime.now().strftime("%Y-%m-%d_%H%M%S"))
+
+    archived = 0
+    try:
+        # Every result must have a summary before it can be archived
+        summarize_dim_tasks()
+        conditions = dim_tasks_retention_conditions(retention_days=retention_days,
+                                                    failed_retention_days=failed_retention_days,
+                                                    retention_count=retention_count)
+
+        with gzip.open(archive_file, 'wt', encoding='utf-8') as archive:
+            while True:
+                summaries = get_expired_dim_tasks(conditions, limit=chunk_size)
+                if not summaries:
+                    break
+
+                for summary in summaries:
+                    archive.write(json.dumps(summary, default=str))
+                    archive.write('\n')
+
+                archive.flush()
+                delete_dim_tasks(summaries)
+                archived += len(summaries)
+
+        retention_windows = [days for days in (retention_days, failed_retention_days) if days]
+        purged = delete_internal_task_results(min(retention_windows) if retention_windows else 0)
+        if purged:
+            logs.append(f'Deleted {purged} results of maintenance tasks')
+
+        if archived or purged:
+            vacuum_dim_tasks()
+
+    except Exception as e:
+        logs.append('Something went wrong archiving DIM tasks')
+        logs.append(str(e))
+        return True, logs
+
+    if archived == 0:
+        archive_file.unlink(missing_ok=True)
+        logs.append('No expired DIM tasks to archive')
+        return False, logs
+
+    logs.append(f'Archived {archived} DIM tasks in {archive_file}')
+    return False, logs
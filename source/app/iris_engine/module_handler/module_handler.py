@@ -37,8 +37,6 @@ from app.datamgmt.iris_engine.modules_db import modules_list_pipelines
 from app.models import IrisHook
 from app.models import IrisModule
 from app.models import IrisModuleHook
-from app.util import hmac_sign
-from app.util import hmac_verify
 from iris_interface import IrisInterfaceStatus as IStatus
 
 log = app.logger
@@ -427,6 +425,9 @@ def task_hook_wrapper(self, module_name, hook_name, hook_ui_name, data, init_use
     :param caseid: Case associated
     :return: A task status JSON task_success or task_failure
     """
+    # Imported here, as app.util pulls the web stack the worker does not load otherwise
+    from app.util import hmac_verify
+
     try:
         # Data is serialized, so deserialized
         signature, pdata = data.encode("utf-8").split(b" ")
@@ -492,7 +493,8 @@ def task_hook_wrapper(self, module_name, hook_name, hook_ui_name, data, init_use
     return task_status
 
 
-def call_modules_hook(hook_name: str, data: any, caseid: int, hook_ui_name: str = None, module_name: str = None) -> any:
+def call_modules_hook(hook_name: str, data: any, caseid: int, hook_ui_name: str = None, module_name: str = None,
+                      init_user: str = None) -> any:
     """
     Calls modules which have registered the specified hook
 
@@ -502,6 +504,7 @@ def call_modules_hook(hook_name: str, data: any, caseid: int, hook_ui_name: str
     :param data: Data associated with the hook
     :param module_name: Name of the module to call. If None, all modules matching the hook will be called
     :param caseid: Case ID
+    :param init_user: Name of the user triggering the hook, the current user if None
     :return: Any
     """
     hook = IrisHook.query.filter(IrisHook.hook_name == hook_name).first()
@@ -540,11 +543,13 @@ def call_modules_hook(hook_name: str, data: any, caseid: int, hook_ui_name: str
             log.info(f'Calling module {module.module_name} asynchronously for hook {hook_name} :: {hook_ui_name}')
             # We cannot directly pass the sqlalchemy in data, as it needs to be serializable
             # So pass a dumped instance and then rebuild on the task side
+            from app.util import hmac_sign
+
             ser_data = base64.b64encode(dumps(data))
             ser_data_auth = hmac_sign(ser_data) + b" " + ser_data
             task_hook_wrapper.delay(module_name=module.module_name, hook_name=hook_name,
                                     hook_ui_name=module.manual_hook_ui_name, data=ser_data_auth.decode("utf8"),
-                                    init_user=current_user.name, caseid=caseid)
+                                    init_user=init_user or current_user.name, caseid=caseid)
 
         else:
             # Direct call. Should be fast
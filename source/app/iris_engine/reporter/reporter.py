@@ -32,8 +32,6 @@ from jinja2.sandbox import SandboxedEnvironment
 
 from app.datamgmt.reporter.report_db import export_case_json_for_report
 from app.iris_engine.utils.common import IrisJinjaEnv
-from docx_generator.docx_generator import DocxGenerator
-from docx_generator.exceptions import rendering_error
 from flask_login import current_user
 from sqlalchemy import desc
 
@@ -51,7 +49,6 @@ from app.models import CasesEvent
 from app.models import Ioc
 from app.models import IocAssetLink
 from app.models import IocLink
-from app.iris_engine.reporter.ImageHandler import ImageHandler
 
 LOG_FORMAT = '%(asctime)s :: %(levelname)s :: %(module)s :: %(funcName)s :: %(message)s'
 log.basicConfig(level=log.INFO, format=LOG_FORMAT)
@@ -313,6 +310,11 @@ class IrisMakeDocReport(IrisReportMaker):
         name = name.replace('%date%', datetime.utcnow().strftime("%Y-%m-%d"))
         output_file_path = os.path.join(self._tmp, name)
 
+        # The docx stack is only loaded when a docx report is generated
+        from docx_generator.docx_generator import DocxGenerator
+        from docx_generator.exceptions import rendering_error
+        from app.iris_engine.reporter.ImageHandler import ImageHandler
+
         try:
 
             if not self._safe_mode:
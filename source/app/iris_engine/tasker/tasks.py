@@ -19,13 +19,27 @@
 # IMPORTS ------------------------------------------------
 import os
 import urllib.parse
+from celery.signals import task_postrun
 from celery.signals import task_prerun
+from datetime import datetime
 from flask_login import current_user
 
 from app import app
+from app import celery
 from app import db
 from app.datamgmt.case.case_db import get_case
+from app.datamgmt.case.case_stats_db import refresh_cases_stats
+from app.datamgmt.dim_tasks.dim_tasks_db import record_dim_task_summary
+from app.datamgmt.dim_tasks.dim_tasks_db import summarize_dim_tasks
+from app.datamgmt.dim_tasks.dim_tasks_db import get_dim_tasks_storage_stats
+from app.iris_engine.backup.backup import archive_iris_activities
+from app.iris_engine.backup.backup import archive_iris_dim_tasks
 from app.iris_engine.module_handler.module_handler import pipeline_dispatcher
+from app.iris_engine.utils.bulk_import import bulk_import_assets
+from app.iris_engine.utils.bulk_import import bulk_import_iocs
+from app.iris_engine.utils.bulk_import import import_message
+from app.iris_engine.utils.bulk_import import load_import_csv
+from app.iris_engine.utils.bulk_import import remove_import_csv
 from app.iris_engine.utils.common import build_upload_path
 from app.iris_engine.utils.tracker import track_activity
 from iris_interface import IrisInterfaceStatus as IStatus
@@ -34,11 +48,33 @@ from iris_interface.IrisModuleInterface import IrisPipelineTypes
 app.config['timezone'] = 'Europe/Paris'
 
 
+_tasks_start = {}
+
+
 # CONTENT ------------------------------------------------
 @task_prerun.connect
 def on_task_init(*args, **kwargs):
     db.engine.dispose()
 
+    if kwargs.get('task_id'):
+        _tasks_start[kwargs.get('task_id')] = datetime.utcnow()
+
+
+@task_postrun.connect
+def on_task_done(task_id=None, task=None, kwargs=None, retval=None, state=None, **other):
+    date_start = _tasks_start.pop(task_id, None)
+    if not task_id or task is None:
+        return
+
+    try:
+        with app.app_context():
+            record_dim_task_summary(task_id=task_id, name=task.name, kwargs=kwargs, state=state,
+                                    result=retval, date_start=date_start)
+
+    except Exception as e:
+        # The summary is caught up later by task_summarize_dim_tasks
+        app.logger.warning(f'Unable to record the summary of task {task_id}: {e}')
+
 
 def task_case_update(module, pipeline, pipeline_args, caseid):
     """
@@ -94,6 +130,111 @@ def task_case_update(module, pipeline, pipeline_args, caseid):
         return IStatus.I2UnexpectedResult("Invalid context")
 
 
+@celery.task(ignore_result=True)
+def task_refresh_cases_stats():
+    """
+    Periodically recompute the stats of all the cases, to catch up with changes not flagged by the write paths
+    """
+    count = refresh_cases_stats()
+    app.logger.info(f'Refreshed stats of {count} cases')
+
+    return count
+
+
+@celery.task(ignore_result=True)
+def task_archive_activities():
+    """
+    Periodically move the activities older than the configured retention to the activities archive
+    """
+    retention_days = app.config.get('ACTIVITIES_RETENTION_DAYS')
+    if not retention_days:
+        return False
+
+    has_error, logs = archive_iris_activities(retention_days)
+    for log_entry in logs:
+        if has_error:
+            app.logger.error(log_entry)
+        else:
+            app.logger.info(log_entry)
+
+    return not has_error
+
+
+@celery.task(ignore_result=True)
+def task_summarize_dim_tasks():
+    """
+    Periodically summarize the completed tasks which were not summarized when they completed
+    """
+    count = summarize_dim_tasks()
+    if count:
+        app.logger.info(f'Summarized {count} DIM tasks')
+
+    return count
+
+
+@celery.task(ignore_result=True)
+def task_archive_dim_tasks():
+    """
+    Periodically archive the DIM tasks, and their results, expired according to the configured retention
+    """
+    retention_days = app.config.get('DIM_TASKS_RETENTION_DAYS')
+    failed_retention_days = app.config.get('DIM_TASKS_FAILED_RETENTION_DAYS')
+    retention_count = app.config.get('DIM_TASKS_RETENTION_COUNT')
+    if not retention_days and not failed_retention_days and not retention_count:
+        return False
+
+    has_error, logs = archive_iris_dim_tasks(retention_days=retention_days,
+                                             failed_retention_days=failed_retention_days,
+                                             retention_count=retention_count)
+    for log_entry in logs:
+        if has_error:
+            app.logger.error(log_entry)
+        else:
+            app.logger.info(log_entry)
+
+    stats = get_dim_tasks_storage_stats()
+    app.logger.info(f'DIM tasks storage: {stats["results_count"]} results ({stats["results_size"]} bytes), '
+                    f'{stats["summaries_count"]} summaries ({stats["summaries_size"]} bytes)')
+
+    return not has_error
+
+
+def _bulk_import_task(task, import_function, caseid, user_id, init_user, csv_path, is_from_api):
+    def progress(current, total):
+        task.update_state(state='PROGRESS', meta={'case_id': caseid, 'current': current, 'total': total})
+
+    try:
+        imported, errors = import_function(load_import_csv(csv_path), case_id=caseid, user_id=user_id,
+                                           user_name=init_user, is_from_api=is_from_api, progress=progress)
+    finally:
+        remove_import_csv(csv_path)
+
+    return {
+        'case_id': caseid,
+        'imported': len(imported),
+        'errors': errors,
+        'message': import_message(errors)
+    }
+
+
+@celery.task(bind=True)
+def task_bulk_import_iocs(self, caseid, user_id, init_user, csv_path, is_from_api=False):
+    """
+    Import the IOCs of an uploaded CSV too big to be imported within the request.
+    The CSV is read from the file written by save_import_csv, which is deleted once the task ends
+    """
+    return _bulk_import_task(self, bulk_import_iocs, caseid, user_id, init_user, csv_path, is_from_api)
+
+
+@celery.task(bind=True)
+def task_bulk_import_assets(self, caseid, user_id, init_user, csv_path, is_from_api=False):
+    """
+    Import the assets of an uploaded CSV too big to be imported within the request.
+    The CSV is read from the file written by save_import_csv, which is deleted once the task ends
+    """
+    return _bulk_import_task(self, bulk_import_assets, caseid, user_id, init_user, csv_path, is_from_api)
+
+
 def chunks(lst, n):
     """Yield successive n-sized chunks from lst."""
     for i in range(0, len(lst), n):
@@ -15,7 +15,6 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import gnupg
 import hashlib
 import json
 import os
@@ -507,6 +506,8 @@ def verify_assets_signatures(target_directory, release_assets_info):
         return has_error
 
     update_log("Importing DFIR-IRIS GPG key")
+    import gnupg
+
     gpg = gnupg.GPG()
 
     with open(app.config.get("RELEASE_SIGNATURE_KEY"), 'rb') as pkey:
@@ -0,0 +1,203 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# IMPORTS ------------------------------------------------
+import os
+import tempfile
+
+from app import app
+from app import db
+from app.datamgmt.case.case_import_db import ASSET_CSV_HEADERS
+from app.datamgmt.case.case_import_db import IOC_CSV_HEADERS
+from app.datamgmt.case.case_import_db import add_import_activities
+from app.datamgmt.case.case_import_db import get_imported_assets
+from app.datamgmt.case.case_import_db import get_imported_iocs
+from app.datamgmt.case.case_import_db import import_assets_batch
+from app.datamgmt.case.case_import_db import import_iocs_batch
+from app.datamgmt.case.case_import_db import read_import_csv
+from app.datamgmt.case.case_import_db import register_import_tags
+from app.datamgmt.case.case_import_db import validate_assets_rows
+from app.datamgmt.case.case_import_db import validate_iocs_rows
+from app.datamgmt.manage.manage_attribute_db import get_default_custom_attributes
+from app.datamgmt.states import update_assets_state
+from app.datamgmt.states import update_ioc_state
+from app.iris_engine.module_handler.module_handler import call_modules_hook
+
+# CONTENT ------------------------------------------------
+log = app.logger
+
+# Number of rows inserted, hooked and committed together
+IMPORT_BATCH_SIZE = 1000
+
+
+def count_import_rows(csv_text):
+    """
+    Returns an upper bound of the number of rows of an uploaded CSV, without parsing it
+    """
+    return len(csv_text.splitlines()) if csv_text else 0
+
+
+def save_import_csv(csv_text):
+    """
+    Writes an uploaded CSV to a temporary file under the upload path, so a queued import only carries its path
+
+    Args:
+        csv_text: content of the CSV
+
+    Returns:
+        Path of the written file
+    """
+    import_dir = os.path.join(app.config['UPLOADED_PATH'], 'bulk_imports')
+    os.makedirs(import_dir, exist_ok=True)
+
+    fd, csv_path = tempfile.mkstemp(suffix='.csv', dir=import_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8', newline='') as fcsv:
+        fcsv.write(csv_text)
+
+    return csv_path
+
+
+def load_import_csv(csv_path):
+    """
+    Reads a CSV written by save_import_csv
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as fcsv:
+        return fcsv.read()
+
+
+def remove_import_csv(csv_path):
+    """
+    Deletes a CSV written by save_import_csv
+    """
+    try:
+        os.remove(csv_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log.warning(f'Unable to remove the import file {csv_path}: {e}')
+
+
+def import_message(errors):
+    if not errors:
+        return "Successfully imported data."
+
+    return "Data is imported but we got errors with the following rows:\n- " + "\n- ".join(errors)
+
+
+def _run_import(rows, case_id, user_name, preload_hook, postload_hook, import_batch, get_imported,
+                activity_message, update_state, user_id, is_from_api, progress):
+    imported = []
+    errors = []
+    total = len(rows)
+
+    for start in range(0, total, IMPORT_BATCH_SIZE):
+        batch = rows[start:start + IMPORT_BATCH_SIZE]
+        batch = call_modules_hook(preload_hook, data=batch, caseid=case_id, init_user=user_name)
+
+        object_ids, batch_errors = import_batch(batch)
+        errors.extend(batch_errors)
+
+        if object_ids:
+            objects = get_imported(object_ids)
+            add_import_activities([activity_message(obj) for obj in objects], case_id=case_id, user_id=user_id,
+                                  is_from_api=is_from_api)
+            update_state(caseid=case_id, userid=user_id)
+            db.session.commit()
+
+            call_modules_hook(postload_hook, data=objects, caseid=case_id, init_user=user_name)
+            imported.extend(objects)
+
+        else:
+            db.session.commit()
+
+        if progress:
+            progress(min(start + IMPORT_BATCH_SIZE, total), total)
+
+    return imported, errors
+
+
+def bulk_import_iocs(csv_text, case_id, user_id, user_name, is_from_api=False, progress=None):
+    """
+    Imports the IOCs of an uploaded CSV in a case. The whole file is validated in one pass, then the IOCs are
+    imported by batches: the module hooks are called once per batch, with the list of the batch IOCs
+
+    Args:
+        csv_text: content of the CSV
+        case_id: id of the case
+        user_id: id of the user importing the IOCs
+        user_name: name of the user importing the IOCs
+        is_from_api: whether the import is requested through the API
+        progress: called with the number of processed rows and the total after each batch
+
+    Returns:
+        tuple: imported IOCs, list of errors
+    """
+    rows, errors = validate_iocs_rows(read_import_csv(csv_text, IOC_CSV_HEADERS))
+    register_import_tags(rows, 'ioc_tags')
+    custom_attributes = get_default_custom_attributes('ioc')
+
+    imported, import_errors = _run_import(
+        rows, case_id, user_name,
+        preload_hook='on_preload_ioc_create',
+        postload_hook='on_postload_ioc_create',
+        import_batch=lambda batch: import_iocs_batch(batch, case_id, user_id, custom_attributes),
+        get_imported=get_imported_iocs,
+        activity_message=lambda ioc: f"added ioc \"{ioc.ioc_value}\"",
+        update_state=update_ioc_state,
+        user_id=user_id,
+        is_from_api=is_from_api,
+        progress=progress
+    )
+
+    return imported, errors + import_errors
+
+
+def bulk_import_assets(csv_text, case_id, user_id, user_name, is_from_api=False, progress=None):
+    """
+    Imports the assets of an uploaded CSV in a case. The whole file is validated in one pass, then the assets are
+    imported by batches: the module hooks are called once per batch, with the list of the batch assets
+
+    Args:
+        csv_text: content of the CSV
+        case_id: id of the case
+        user_id: id of the user importing the assets
+        user_name: name of the user importing the assets
+        is_from_api: whether the import is requested through the API
+        progress: called with the number of processed rows and the total after each batch
+
+    Returns:
+        tuple: imported assets, list of errors
+    """
+    rows, errors = validate_assets_rows(read_import_csv(csv_text, ASSET_CSV_HEADERS))
+    register_import_tags(rows, 'asset_tags')
+    custom_attributes = get_default_custom_attributes('asset')
+
+    imported, import_errors = _run_import(
+        rows, case_id, user_name,
+        preload_hook='on_preload_asset_create',
+        postload_hook='on_postload_asset_create',
+        import_batch=lambda batch: import_assets_batch(batch, case_id, user_id, custom_attributes),
+        get_imported=get_imported_assets,
+        activity_message=lambda asset: f"added asset \"{asset.asset_name}\"",
+        update_state=update_assets_state,
+        user_id=user_id,
+        is_from_api=is_from_api,
+        progress=progress
+    )
+
+    return imported, errors + import_errors
@@ -0,0 +1,159 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# IMPORTS ------------------------------------------------
+from datetime import datetime
+
+
+# CONTENT ------------------------------------------------
+class CaseGraphBuilder(object):
+    """
+    Builds the nodes and edges of a case graph from the assets and IOCs linked to the events of the timeline.
+
+    Nodes and edges are indexed by their identifiers, so each link is processed in constant time. Edges linking
+    the same two nodes through several events are aggregated into a single weighted edge. Events linking more
+    objects than max_event_edges allows are rendered as a star around their first asset instead of a full mesh.
+    """
+
+    def __init__(self, dark_mode=False, max_event_edges=500):
+        self._dark_mode = dark_mode
+        self._max_event_edges = max_event_edges
+        self._nodes = {}
+        self._edges = {}
+        self._dates = {}
+        self._events = {}
+
+    def add_link(self, event):
+        """
+        Add an event <-> asset or event <-> IOC link, as returned by get_case_events_assets_graph
+        or get_case_events_ioc_graph
+        """
+        if hasattr(event, 'asset_compromise_status_id'):
+            if event.asset_compromise_status_id == 1:
+                img = event.asset_icon_compromised
+
+            else:
+                img = event.asset_icon_not_compromised
+
+            if event.asset_ip:
+                title = "{} -{}".format(event.asset_ip, event.asset_description)
+            else:
+                title = "{}".format(event.asset_description)
+            label = event.asset_name
+            idx = f'a{event.asset_id}'
+            node_type = 'asset'
+
+        else:
+            img = 'virus-covid-solid.png'
+            label = event.ioc_value
+            title = event.ioc_description
+            idx = f'b{event.ioc_id}'
+            node_type = 'ioc'
+
+        if event.event_date:
+            date = "{}-{}-{}".format(event.event_date.day, event.event_date.month, event.event_date.year)
+            if date not in self._dates:
+                self._dates[date] = datetime.timestamp(event.event_date)
+
+        if idx not in self._nodes:
+            new_node = {
+                'id': idx,
+                'label': label,
+                'image': '/static/assets/img/graph/' + img,
+                'shape': 'image',
+                'title': title,
+                'value': 1
+            }
+
+            if self._dark_mode:
+                new_node['font'] = "12px verdana white"
+
+            self._nodes[idx] = new_node
+
+        event_nodes = self._events.setdefault(event.event_id, {
+            'title': "{} - {}".format(event.event_date, event.event_title),
+            'nodes': {}
+        })
+        event_nodes['nodes'].setdefault(idx, node_type)
+
+    def _add_edge(self, from_node, to_node, title, dashes):
+        key = (from_node, to_node) if from_node < to_node else (to_node, from_node)
+
+        edge = self._edges.get(key)
+        if edge is None:
+            self._edges[key] = {
+                'from': from_node,
+                'to': to_node,
+                'title': title,
+                'dashes': dashes,
+                'value': 1
+            }
+            return
+
+        edge['value'] += 1
+        edge['dashes'] = edge['dashes'] and dashes
+
+    def _link_event(self, event):
+        nodes = list(event['nodes'].items())
+        assets = [node for node in nodes if node[1] == 'asset']
+        iocs_count = len(nodes) - len(assets)
+
+        # IOCs are only linked together when they are the only two objects of the event
+        edges_count = len(assets) * (len(assets) - 1) // 2 + len(assets) * iocs_count
+        if len(nodes) == 2 and not assets:
+            edges_count = 1
+
+        if edges_count <= self._max_event_edges:
+            for i, (from_node, from_type) in enumerate(nodes):
+                for to_node, to_type in nodes[i + 1:]:
+                    if from_type == 'ioc' and to_type == 'ioc' and len(nodes) != 2:
+                        continue
+
+                    self._add_edge(from_node, to_node, event['title'],
+                                   from_type == 'ioc' or to_type == 'ioc')
+            return
+
+        hub_node, hub_type = assets[0] if assets else nodes[0]
+        for node, node_type in nodes:
+            if node == hub_node:
+                continue
+
+            self._add_edge(hub_node, node, event['title'], hub_type == 'ioc' or node_type == 'ioc')
+
+    def build(self):
+        """
+        Returns the graph as expected by the graph view
+        """
+        self._edges = {}
+        for event in self._events.values():
+            self._link_event(event)
+
+        edges = []
+        for edge in self._edges.values():
+            if edge['value'] > 1:
+                edge['title'] = f"{edge['title']} (+{edge['value'] - 1} other events)"
+            edges.append(edge)
+
+        return {
+            'nodes': list(self._nodes.values()),
+            'edges': edges,
+            'dates': {
+                'human': list(self._dates.keys()),
+                'machine': list(self._dates.values())
+            }
+        }
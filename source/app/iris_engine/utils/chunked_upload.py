@@ -0,0 +1,262 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# IMPORTS ------------------------------------------------
+import hashlib
+import json
+import re
+import shutil
+import time
+from pathlib import Path
+
+from app import app
+
+# CONTENT ------------------------------------------------
+UPLOAD_ID_RE = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+
+def _get_assembly_path():
+    assembly_path = Path(app.config['CHUNKED_UPLOADS_PATH'])
+
+    if not assembly_path.is_dir():
+        assembly_path.mkdir(parents=True, exist_ok=True)
+
+    return assembly_path
+
+
+def _get_upload_path(upload_id):
+    if not upload_id or not UPLOAD_ID_RE.match(upload_id):
+        return None
+
+    return _get_assembly_path() / upload_id
+
+
+def _write_meta(upload_path, meta):
+    tmp_meta = upload_path / 'meta.json.tmp'
+    tmp_meta.write_text(json.dumps(meta))
+    tmp_meta.replace(upload_path / 'meta.json')
+
+
+def _read_meta(upload_path):
+    try:
+        return json.loads((upload_path / 'meta.json').read_text())
+
+    except (OSError, ValueError):
+        return None
+
+
+def chunked_upload_purge_stale(max_age=None):
+    """
+    Deletes the uploads which did not receive any chunk for more than max_age seconds
+
+    Args:
+        max_age: age in seconds, CHUNKED_UPLOADS_MAX_AGE if not provided
+
+    Returns:
+        Number of deleted uploads
+    """
+    if max_age is None:
+        max_age = app.config['CHUNKED_UPLOADS_MAX_AGE']
+
+    limit = time.time() - max_age
+    purged = 0
+
+    for upload_path in _get_assembly_path().iterdir():
+        try:
+            if upload_path.is_dir() and upload_path.stat().st_mtime < limit:
+                shutil.rmtree(upload_path, ignore_errors=True)
+                purged += 1
+
+        except OSError:
+            continue
+
+    return purged
+
+
+def chunked_upload_received_chunks(upload_id):
+    upload_path = _get_upload_path(upload_id)
+    if upload_path is None or not (upload_path / 'chunks').is_dir():
+        return []
+
+    return sorted(int(marker.name) for marker in (upload_path / 'chunks').iterdir() if marker.name.isdigit())
+
+
+def chunked_upload_get(upload_id, case_id, user_id):
+    """
+    Returns the description of an upload, if it belongs to the given case and user
+
+    Args:
+        upload_id: id of the upload
+        case_id: id of the case the upload is made for
+        user_id: id of the user making the upload
+
+    Returns:
+        dict or None
+    """
+    upload_path = _get_upload_path(upload_id)
+    if upload_path is None or not upload_path.is_dir():
+        return None
+
+    meta = _read_meta(upload_path)
+    if meta is None or meta.get('case_id') != case_id or meta.get('user_id') != user_id:
+        return None
+
+    meta['received_chunks'] = chunked_upload_received_chunks(upload_id)
+
+    return meta
+
+
+def chunked_upload_init(upload_id, file_name, file_size, chunk_size, case_id, user_id):
+    """
+    Prepares the assembly of an upload. Initializing an upload that already exists with the same parameters returns
+    its current state, so an interrupted upload can resume from its missing chunks
+
+    Args:
+        upload_id: id of the upload, chosen by the client
+        file_name: name of the uploaded file
+        file_size: size of the uploaded file
+        chunk_size: size of every chunk but the last one
+        case_id: id of the case the upload is made for
+        user_id: id of the user making the upload
+
+    Returns:
+        tuple: has_error, error message or description of the upload
+    """
+    upload_path = _get_upload_path(upload_id)
+    if upload_path is None:
+        return True, 'Invalid upload ID'
+
+    if file_size < 0 or chunk_size <= 0 or chunk_size > app.config['CHUNKED_UPLOADS_MAX_CHUNK_SIZE']:
+        return True, 'Invalid file or chunk size'
+
+    if file_size > app.config['DROPZONE_MAX_FILE_SIZE']:
+        return True, 'File too big'
+
+    chunked_upload_purge_stale()
+
+    meta = {
+        'upload_id': upload_id,
+        'file_name': file_name,
+        'file_size': file_size,
+        'chunk_size': chunk_size,
+        'chunk_count': max(1, -(-file_size // chunk_size)),
+        'case_id': case_id,
+        'user_id': user_id
+    }
+
+    if upload_path.is_dir():
+        current_meta = chunked_upload_get(upload_id, case_id, user_id)
+        if current_meta is None or any(current_meta.get(k) != v for k, v in meta.items()):
+            return True, 'Upload ID already in use'
+
+        return False, current_meta
+
+    (upload_path / 'chunks').mkdir(parents=True)
+    with open(upload_path / 'data', 'wb') as fout:
+        fout.truncate(file_size)
+
+    _write_meta(upload_path, meta)
+    meta['received_chunks'] = []
+
+    return False, meta
+
+
+def chunked_upload_append(meta, chunk_index, stream, chunk_sha256=None):
+    """
+    Writes a chunk at its place in the upload. Chunks can be sent in any order, in parallel, and again
+
+    Args:
+        meta: description of the upload, as returned by chunked_upload_get
+        chunk_index: index of the chunk
+        stream: readable binary stream of the chunk content
+        chunk_sha256: expected SHA-256 of the chunk, if the client provides it
+
+    Returns:
+        tuple: has_error, error message or number of received chunks
+    """
+    if chunk_index < 0 or chunk_index >= meta['chunk_count']:
+        return True, 'Invalid chunk index'
+
+    upload_path = _get_upload_path(meta['upload_id'])
+    offset = chunk_index * meta['chunk_size']
+    expected_size = min(meta['chunk_size'], meta['file_size'] - offset)
+
+    chunk_marker = upload_path / 'chunks' / str(chunk_index)
+    chunk_marker.unlink(missing_ok=True)
+
+    chunk_hash = hashlib.sha256()
+    written = 0
+
+    with open(upload_path / 'data', 'r+b') as fout:
+        fout.seek(offset)
+        for block in iter(lambda: stream.read(1024 * 1024), b""):
+            written += len(block)
+            if written > expected_size:
+                return True, 'Chunk bigger than expected'
+
+            chunk_hash.update(block)
+            fout.write(block)
+
+    if written != expected_size:
+        return True, f'Chunk size mismatch, expected {expected_size} bytes, got {written}'
+
+    chunk_hash = chunk_hash.hexdigest()
+    if chunk_sha256 and chunk_sha256.lower() != chunk_hash:
+        return True, 'Chunk checksum mismatch'
+
+    chunk_marker.write_text(chunk_hash)
+    # Keeps the upload from being purged while chunks are arriving
+    upload_path.touch()
+
+    return False, len(chunked_upload_received_chunks(meta['upload_id']))
+
+
+def chunked_upload_finalize(meta, file_sha256=None):
+    """
+    Checks that every chunk of an upload was received, and verifies the hash of the assembled file
+
+    Args:
+        meta: description of the upload, as returned by chunked_upload_get
+        file_sha256: expected SHA-256 of the file, if the client provides it
+
+    Returns:
+        tuple: has_error, error message or (path of the assembled file, size, upper case hex SHA-256)
+    """
+    missing = set(range(meta['chunk_count'])) - set(chunked_upload_received_chunks(meta['upload_id']))
+    if missing:
+        return True, f'{len(missing)} chunks are missing'
+
+    upload_path = _get_upload_path(meta['upload_id'])
+    data_file = upload_path / 'data'
+
+    sha256_hash = hashlib.sha256()
+    with open(data_file, 'rb') as fin:
+        for block in iter(lambda: fin.read(1024 * 1024), b""):
+            sha256_hash.update(block)
+
+    file_hash = sha256_hash.hexdigest().upper()
+    if file_sha256 and file_sha256.upper() != file_hash:
+        return True, 'File checksum mismatch'
+
+    return False, (data_file, meta['file_size'], file_hash)
+
+
+def chunked_upload_discard(upload_id):
+    upload_path = _get_upload_path(upload_id)
+    if upload_path is not None:
+        shutil.rmtree(upload_path, ignore_errors=True)
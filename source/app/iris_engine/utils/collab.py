@@ -31,3 +31,248 @@ def collab_notify(case_id: int,
 def socket_join_case_obj_notif(data):
     room = data['channel']
     join_room(room=room)
+
+
+# Maximum number of deltas kept since the last save of a document, to bring the joining editors up to date
+COLLAB_MAX_LOGGED_DELTAS = 2000
+
+# Maximum number of seq remembered for the documents dropped once saved
+COLLAB_MAX_SEQ_FLOORS = 10000
+
+_collab_documents = {}
+
+# Seq of the documents dropped once saved. A document created again continues from its own seq, so its editors
+# see no gap and keep applying the changes
+_collab_seq_floors = {}
+
+# Highest seq of the floors forgotten beyond COLLAB_MAX_SEQ_FLOORS. Such a document starts from it, so its editors
+# never see its seq go back, only a gap they catch up with through a snapshot
+_collab_seq_floor = 0
+
+
+def _parse_delta(delta):
+    if isinstance(delta, str):
+        try:
+            delta = json.loads(delta)
+        except ValueError:
+            return None
+
+    if not isinstance(delta, dict) or delta.get('action') not in ('insert', 'remove'):
+        return None
+
+    try:
+        return {
+            'action': delta['action'],
+            'start': {'row': int(delta['start']['row']), 'column': int(delta['start']['column'])},
+            'end': {'row': int(delta['end']['row']), 'column': int(delta['end']['column'])},
+            'lines': [str(line) for line in delta['lines']]
+        }
+
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _join_lines(first, second):
+    return first[:-1] + [first[-1] + second[0]] + second[1:]
+
+
+def _merge_deltas(previous, delta):
+    """
+    Merges a delta into the previous one of the same editor when they continue each other,
+    i.e. a word being typed or erased. Returns None when they cannot be merged
+    """
+    if previous['action'] != delta['action']:
+        return None
+
+    if delta['action'] == 'insert' and previous['end'] == delta['start']:
+        return {
+            'action': 'insert',
+            'start': previous['start'],
+            'end': delta['end'],
+            'lines': _join_lines(previous['lines'], delta['lines'])
+        }
+
+    if delta['action'] == 'remove' and delta['end'] == previous['start']:
+        return {
+            'action': 'remove',
+            'start': delta['start'],
+            'end': previous['end'],
+            'lines': _join_lines(delta['lines'], previous['lines'])
+        }
+
+    return None
+
+
+def _get_collab_document(event, channel, document_id):
+    key = (event, channel, document_id)
+    if key not in _collab_documents:
+        _collab_documents[key] = {
+            'seq': _collab_seq_floors.pop(key, _collab_seq_floor),
+            'pending': [],
+            'users': [],
+            'flush_scheduled': False,
+            'log': [],
+            'log_complete': True
+        }
+
+    return _collab_documents[key]
+
+
+def _drop_collab_document(event, channel, document_id):
+    """
+    Forgets a document which has no pending nor logged change, so the documents kept are only the ones being edited
+    """
+    global _collab_seq_floor
+
+    key = (event, channel, document_id)
+    document = _collab_documents.get(key)
+    if document is None or document['pending'] or document['log']:
+        return
+
+    _collab_seq_floors[key] = document['seq']
+    if len(_collab_seq_floors) > COLLAB_MAX_SEQ_FLOORS:
+        oldest = next(iter(_collab_seq_floors))
+        _collab_seq_floor = max(_collab_seq_floor, _collab_seq_floors.pop(oldest))
+
+    del _collab_documents[key]
+
+
+def _flush_collab_document(event, channel, document_id):
+    document = _collab_documents.get((event, channel, document_id))
+    if document is None:
+        return
+
+    document['flush_scheduled'] = False
+
+    if not document['pending']:
+        return
+
+    document['seq'] += 1
+    changes = document['pending']
+    users = document['users']
+    document['pending'] = []
+    document['users'] = []
+
+    document['log'].append((document['seq'], changes))
+    if sum(len(logged) for _, logged in document['log']) > COLLAB_MAX_LOGGED_DELTAS:
+        document['log'].pop(0)
+        document['log_complete'] = False
+
+    app.socket_io.emit(event, {
+        'channel': channel,
+        'note_id': document_id,
+        'seq': document['seq'],
+        'changes': changes,
+        'last_change': ', '.join(users)
+    }, room=channel)
+
+
+def _delayed_flush_collab_document(event, channel, document_id):
+    app.socket_io.sleep(app.app.config.get('COLLAB_COALESCE_WINDOW') / 1000)
+    _flush_collab_document(event, channel, document_id)
+
+
+def collab_push_delta(event: str, channel: str, document_id, delta, origin: str, user: str):
+    """
+    Buffers the delta of an editor. The deltas received during the coalescing window are merged when they
+    continue each other, and broadcast to the room as a single numbered change
+
+    Args:
+        event: event the changes are broadcast with
+        channel: room of the document
+        document_id: id of the document within the room, None for the case summary
+        delta: ace delta, as an object or a JSON string
+        origin: socket id of the editor, so it can ignore its own deltas
+        user: login of the editor
+
+    Returns:
+        False if the delta is invalid
+    """
+    delta = _parse_delta(delta)
+    if delta is None:
+        return False
+
+    document = _get_collab_document(event, channel, document_id)
+    pending = document['pending']
+
+    merged = None
+    if pending and pending[-1]['origin'] == origin:
+        merged = _merge_deltas(pending[-1]['delta'], delta)
+
+    if merged:
+        pending[-1]['delta'] = merged
+    else:
+        pending.append({'origin': origin, 'delta': delta})
+
+    if user not in document['users']:
+        document['users'].append(user)
+
+    if not app.app.config.get('COLLAB_COALESCE_WINDOW'):
+        _flush_collab_document(event, channel, document_id)
+
+    elif not document['flush_scheduled']:
+        document['flush_scheduled'] = True
+        app.socket_io.start_background_task(_delayed_flush_collab_document, event, channel, document_id)
+
+    return True
+
+
+def collab_mark_saved(event: str, channel: str, document_id):
+    """
+    Forgets the logged changes of a document once it is saved, the saved content including them
+    """
+    _flush_collab_document(event, channel, document_id)
+
+    document = _collab_documents.get((event, channel, document_id))
+    if document is None:
+        return
+
+    document['log'] = []
+    document['log_complete'] = True
+
+    _drop_collab_document(event, channel, document_id)
+
+
+def collab_clear_document(event: str, channel: str, document_id):
+    """
+    Drops the pending and logged changes of a document whose content was cleared
+    """
+    document = _collab_documents.get((event, channel, document_id))
+    if document is None:
+        return
+
+    document['pending'] = []
+    document['users'] = []
+    document['log'] = []
+    document['log_complete'] = True
+
+    _drop_collab_document(event, channel, document_id)
+
+
+def collab_get_snapshot(event: str, channel: str, document_id):
+    """
+    Returns the changes made to a document since its last save, to be applied by an editor over the saved content
+
+    Returns:
+        dict: seq of the last change, changes and whether the log is complete
+    """
+    _flush_collab_document(event, channel, document_id)
+
+    document = _collab_documents.get((event, channel, document_id))
+    if document is None:
+        # Nothing changed since the last save
+        return {
+            'channel': channel,
+            'note_id': document_id,
+            'seq': _collab_seq_floors.get((event, channel, document_id), _collab_seq_floor),
+            'changes': [],
+            'complete': True
+        }
+
+    return {
+        'channel': channel,
+        'note_id': document_id,
+        'seq': document['seq'],
+        'changes': [change for _, changes in document['log'] for change in changes],
+        'complete': document['log_complete']
+    }
@@ -0,0 +1,60 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# IMPORTS ------------------------------------------------
+import importlib
+import resource
+import time
+
+from app import app
+
+log = app.logger
+
+
+# CONTENT ------------------------------------------------
+def import_components(component, module_names):
+    """
+    Imports the modules making up a component of IRIS, and logs the time it took. With IMPORT_TIMING enabled,
+    the time taken by each module is logged as well, dependencies being accounted to the first module importing them
+
+    Args:
+        component: name of the component, for the logs
+        module_names: modules to import, in order
+
+    Returns:
+        dict: module name -> module
+    """
+    modules = {}
+    timings = []
+
+    start = time.perf_counter()
+    for module_name in module_names:
+        module_start = time.perf_counter()
+        modules[module_name] = importlib.import_module(module_name)
+        timings.append((module_name, time.perf_counter() - module_start))
+
+    elapsed = time.perf_counter() - start
+
+    if app.config.get('IMPORT_TIMING'):
+        for module_name, module_elapsed in sorted(timings, key=lambda timing: timing[1], reverse=True):
+            log.info(f'{component} import: {module_name} took {module_elapsed * 1000:.1f} ms')
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+    log.info(f'Imported {len(module_names)} {component} modules in {elapsed * 1000:.0f} ms, max RSS {max_rss} MiB')
+
+    return modules
@@ -18,8 +18,14 @@
 
 # IMPORTS ------------------------------------------------
 from datetime import datetime
+from flask import g
+from flask import has_app_context
+from flask import has_request_context
 from flask import request
 from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
 import app
 from app import db
@@ -27,13 +33,154 @@ from app.models import UserActivity
 
 log = app.app.logger
 
-
 # CONTENT ------------------------------------------------
-def track_activity(message, caseid=None, ctx_less=False, user_input=False, display_in_ui=True):
+# Number of activities a request can queue before they are written, without waiting for its end
+ACTIVITY_BUFFER_MAX_SIZE = 500
+
+
+def _activity_row(ua):
+    return {
+        'user_id': ua.user_id,
+        'case_id': ua.case_id,
+        'activity_date': ua.activity_date,
+        'activity_desc': ua.activity_desc,
+        'user_input': ua.user_input,
+        'is_from_api': ua.is_from_api,
+        'display_in_ui': ua.display_in_ui
+    }
+
+
+def _write_activities(rows):
+    db.session.execute(insert(UserActivity), rows)
+
+
+def _has_uncommitted_writes():
+    return db.session.info.get('iris_uncommitted_writes', False)
+
+
+def _queued_activities():
+    if not has_app_context():
+        return None
+
+    return g.get('iris_activities')
+
+
+@event.listens_for(Session, 'after_flush')
+def _on_flush(session, flush_context):
+    session.info['iris_uncommitted_writes'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _on_execute(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['iris_uncommitted_writes'] = True
+
+
+@event.listens_for(Session, 'before_commit')
+def _write_activities_before_commit(session):
+    """
+    Writes the queued activities within the transaction being committed, so they are committed with the changes
+    they describe
+    """
+    if not _queued_activities():
+        return
+
+    rows = g.pop('iris_activities')
+    session.execute(insert(UserActivity), [row for _, row in rows])
+
+
+@event.listens_for(Session, 'after_commit')
+def _on_commit(session):
+    session.info['iris_uncommitted_writes'] = False
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_activities_on_rollback(session):
+    """
+    Drops the queued activities of the changes which were rolled back. Those queued once their changes were
+    committed are kept
+    """
+    session.info['iris_uncommitted_writes'] = False
+
+    activities = _queued_activities()
+    if activities:
+        g.iris_activities = [(committed, row) for committed, row in activities if committed]
+
+
+def flush_activities(commit=True):
+    """
+    Writes the activities queued by the current request with a single insert
+
+    Args:
+        commit: commits the session once the activities are written
+    """
+    rows = g.pop('iris_activities', None)
+    if not rows:
+        return
+
+    _write_activities([row for _, row in rows])
+
+    if commit:
+        db.session.commit()
+
+
+def _flush_activities_buffer():
+    """
+    Writes the queued activities before the end of the request. The activities of committed changes are committed
+    on their own, the others are written within the transaction of their changes and follow its outcome
+    """
+    rows = g.pop('iris_activities')
+
+    committed_rows = [row for committed, row in rows if committed]
+    if committed_rows:
+        with db.engine.begin() as connection:
+            connection.execute(insert(UserActivity), committed_rows)
+
+    pending_rows = [row for committed, row in rows if not committed]
+    if pending_rows:
+        _write_activities(pending_rows)
+
+
+@app.app.after_request
+def _flush_activities_after_request(response):
+    """
+    Writes the activities of the request once its response is ready. As track_activity used to commit the
+    session, the changes the request left pending are committed along with them
+    """
+    flush_activities()
+
+    return response
+
+
+@app.app.teardown_request
+def _flush_activities_on_teardown(exception=None):
+    """
+    Writes the activities still queued, i.e. those of the socket events, which have no response, and those of the
+    requests which failed. In the latter case, the rollback drops the activities of the changes it undoes, and only
+    those of the changes already committed are written
+    """
+    if not g.get('iris_activities'):
+        return
+
+    try:
+        if exception is not None:
+            db.session.rollback()
+
+        flush_activities()
+
+    except Exception as e:
+        log.exception(f"Unable to write the activities of the request: {e}")
+        db.session.rollback()
+
+
+def track_activity(message, caseid=None, ctx_less=False, user_input=False, display_in_ui=True, sync=False):
     """
     Register a user activity in DB.
+    Within a request, and unless ACTIVITY_TRACKING_SYNC is set, the activity is queued and written with the
+    other activities of the request once the response is ready.
     :param message: Message to save as activity
-    :return: Nothing
+    :param sync: Writes and commits the activity right away
+    :return: The activity
     """
     ua = UserActivity()
 
@@ -62,7 +209,22 @@ def track_activity(message, caseid=None, ctx_less=False, user_input=False, displ
 
     ua.is_from_api = (request.cookies.get('session') is None if request else False)
 
-    db.session.add(ua)
-    db.session.commit()
+    if sync or not has_request_context() or app.app.config.get('ACTIVITY_TRACKING_SYNC'):
+        db.session.add(ua)
+        db.session.commit()
+
+        return ua
+
+    # The pending changes of the caller are flushed as a commit would have, so their ids and defaults are set
+    db.session.flush()
+
+    # The activity is kept along with whether the changes it describes are already committed, to know whether a
+    # rollback undoes them
+    activities = g.setdefault('iris_activities', [])
+    activities.append((not _has_uncommitted_writes(), _activity_row(ua)))
+
+    if len(activities) >= ACTIVITY_BUFFER_MAX_SIZE:
+        # Bounds the memory used by the loops tracking an activity per object
+        _flush_activities_buffer()
 
     return ua
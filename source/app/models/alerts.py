@@ -4,8 +4,10 @@ import uuid
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy import BigInteger, Table, Boolean
 from sqlalchemy import Column
+from sqlalchemy import Computed
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import Text
 from sqlalchemy import text
@@ -14,6 +16,8 @@ from sqlalchemy.orm import relationship, backref
 
 from app import db
 from app.models import Base, alert_assets_association, alert_iocs_association
+from app.models import ASSET_NAME_HASH_SQL
+from app.models import IOC_VALUE_HASH_SQL
 from app.models.cases import Cases
 
 
@@ -89,11 +93,19 @@ class AlertResolutionStatus(db.Model):
 
 class SimilarAlertsCache(db.Model):
     __tablename__ = 'similar_alerts_cache'
+    __table_args__ = (
+        Index('ix_similar_alerts_cache_customer_id_ioc', 'customer_id', 'ioc_value_hash', 'ioc_type_id'),
+        Index('ix_similar_alerts_cache_customer_id_asset', 'customer_id', 'asset_name_hash', 'asset_type_id'),
+        Index('ix_similar_alerts_cache_alert_id', 'alert_id'),
+    )
 
     id = Column(BigInteger, primary_key=True)
     customer_id = Column(BigInteger, ForeignKey('client.client_id'), nullable=False)
     asset_name = Column(Text, nullable=True)
     ioc_value = Column(Text, nullable=True)
+    # Normalized hashes of the values, the same way as the IOCs and the case assets
+    asset_name_hash = Column(UUID(as_uuid=True), Computed(ASSET_NAME_HASH_SQL, persisted=True))
+    ioc_value_hash = Column(UUID(as_uuid=True), Computed(IOC_VALUE_HASH_SQL, persisted=True))
     alert_id = Column(BigInteger, ForeignKey('alerts.alert_id'), nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=text("now()"))
 
@@ -24,8 +24,12 @@ import uuid
 from sqlalchemy import BigInteger, UniqueConstraint, Table
 from sqlalchemy import Boolean
 from sqlalchemy import Column
+from sqlalchemy import DDL
+from sqlalchemy import Computed
 from sqlalchemy import DateTime
+from sqlalchemy import Float
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import LargeBinary
 from sqlalchemy import Sequence
@@ -33,7 +37,9 @@ from sqlalchemy import String
 from sqlalchemy import TIMESTAMP
 from sqlalchemy import Text
 from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import INET
 from sqlalchemy.dialects.postgresql import JSON, JSONB
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
@@ -167,15 +173,37 @@ alert_iocs_association = Table(
 )
 
 
+ASSET_NAME_HASH_SQL = 'md5(lower(btrim(asset_name)))::uuid'
+
+# Parses the text values which hold an IP address or network, returns NULL for any other value
+TEXT_TO_INET_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION iris_text_to_inet(value text) RETURNS inet
+    LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+BEGIN
+    IF value !~ '^ *([0-9]{1,3}(\\.[0-9]{1,3}){3}|[0-9A-Fa-f]*:[0-9A-Fa-f:.]*)(/[0-9]{1,3})? *$' THEN
+        RETURN NULL;
+    END IF;
+    RETURN btrim(value)::inet;
+EXCEPTION WHEN data_exception THEN
+    RETURN NULL;
+END;
+$$
+"""
+
+
 class CaseAssets(db.Model):
     __tablename__ = 'case_assets'
 
     asset_id = Column(BigInteger, primary_key=True)
     asset_uuid = Column(UUID(as_uuid=True), server_default=text("gen_random_uuid()"), nullable=False)
     asset_name = Column(Text)
+    # Hash of the trimmed and lowercased name, maintained by the database to correlate the assets across cases
+    asset_name_hash = Column(UUID(as_uuid=True), Computed(ASSET_NAME_HASH_SQL, persisted=True))
     asset_description = Column(Text)
     asset_domain = Column(Text)
     asset_ip = Column(Text)
+    # IP address or network of the asset, maintained by the database from asset_ip
+    asset_ip_inet = Column(INET, Computed('iris_text_to_inet(asset_ip)', persisted=True))
     asset_info = Column(Text)
     asset_compromise_status_id = Column(Integer, nullable=True)
     asset_type_id = Column(ForeignKey('assets_type.asset_id'))
@@ -189,6 +217,11 @@ class CaseAssets(db.Model):
     asset_enrichment = Column(JSONB)
     modification_history = Column(JSON)
 
+    __table_args__ = (
+        Index('ix_case_assets_asset_name_hash_type_id', asset_name_hash, asset_type_id),
+        Index('ix_case_assets_asset_ip_inet', asset_ip_inet, postgresql_using='gist',
+              postgresql_ops={'asset_ip_inet': 'inet_ops'}, postgresql_where=asset_ip_inet.isnot(None)),
+    )
 
     case = relationship('Cases')
     user = relationship('User')
@@ -317,6 +350,40 @@ class ObjectState(db.Model):
     updated_by = relationship('User')
 
 
+class ObjectHistory(db.Model):
+    __tablename__ = 'object_history'
+    __table_args__ = (
+        Index('ix_object_history_object_type_object_id_ts', 'object_type', 'object_id', 'ts'),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    object_type = Column(Text, nullable=False)
+    object_id = Column(BigInteger, nullable=False)
+    ts = Column(TIMESTAMP, nullable=False)
+    user_id = Column(ForeignKey('user.id'), nullable=True)
+    user_name = Column(Text)
+    action = Column(Text)
+
+
+class CaseStats(db.Model):
+    __tablename__ = 'case_stats'
+
+    case_id = Column(ForeignKey('cases.case_id', ondelete='CASCADE'), primary_key=True)
+    owner_id = Column(ForeignKey('user.id'), nullable=True, index=True)
+    case_open = Column(Boolean, nullable=False, default=True, server_default=text('true'))
+    open_tasks = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    closed_tasks = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    iocs_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    assets_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    events_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    last_activity = Column(TIMESTAMP, nullable=True)
+    stale = Column(Boolean, nullable=False, default=True, server_default=text('true'), index=True)
+    stale_version = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    refreshed_at = Column(TIMESTAMP, nullable=True)
+
+    case = relationship('Cases')
+
+
 class EventCategory(db.Model):
     __tablename__ = 'event_category'
 
@@ -399,12 +466,19 @@ class Tlp(db.Model):
     tlp_bscolor = Column(Text)
 
 
+IOC_VALUE_HASH_SQL = 'md5(lower(btrim(ioc_value)))::uuid'
+
+
 class Ioc(db.Model):
     __tablename__ = 'ioc'
 
     ioc_id = Column(BigInteger, primary_key=True)
     ioc_uuid = Column(UUID(as_uuid=True), server_default=text("gen_random_uuid()"), nullable=False)
     ioc_value = Column(Text)
+    # Hash of the trimmed and lowercased value, maintained by the database on every write
+    ioc_value_hash = Column(UUID(as_uuid=True), Computed(IOC_VALUE_HASH_SQL, persisted=True))
+    # IP address or network held by the value, if any
+    ioc_value_inet = Column(INET, Computed('iris_text_to_inet(ioc_value)', persisted=True))
     ioc_type_id = Column(ForeignKey('ioc_type.type_id'))
     ioc_description = Column(Text)
     ioc_tags = Column(String(512))
@@ -415,6 +489,21 @@ class Ioc(db.Model):
     ioc_enrichment = Column(JSONB)
     modification_history = Column(JSON)
 
+    # Values are looked up by hash, and matched by prefix or suffix on their first 255 characters,
+    # which are enough for domains and IPs and keep the index entries small. IP values are also
+    # matched by network containment or overlap
+    __table_args__ = (
+        Index('ix_ioc_value_hash_type_id', 'ioc_value_hash', 'ioc_type_id'),
+        Index('ix_ioc_value_prefix',
+              func.left(func.lower(ioc_value), 255).label('ioc_value_prefix'),
+              postgresql_ops={'ioc_value_prefix': 'text_pattern_ops'}),
+        Index('ix_ioc_value_suffix',
+              func.left(func.reverse(func.lower(ioc_value)), 255).label('ioc_value_suffix'),
+              postgresql_ops={'ioc_value_suffix': 'text_pattern_ops'}),
+        Index('ix_ioc_value_inet', ioc_value_inet, postgresql_using='gist',
+              postgresql_ops={'ioc_value_inet': 'inet_ops'}, postgresql_where=ioc_value_inet.isnot(None)),
+    )
+
     user = relationship('User')
     tlp = relationship('Tlp')
     ioc_type = relationship('IocType')
@@ -422,6 +511,10 @@ class Ioc(db.Model):
     alerts = relationship('Alert', secondary=alert_iocs_association, back_populates='iocs')
 
 
+for _inet_table in (CaseAssets.__table__, Ioc.__table__):
+    event.listen(_inet_table, 'before_create', DDL(TEXT_TO_INET_FUNCTION_SQL))
+
+
 class CustomAttribute(db.Model):
     __tablename__ = 'custom_attribute'
 
@@ -438,7 +531,7 @@ class DataStorePath(db.Model):
     path_id = Column(BigInteger, primary_key=True)
     path_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4)
     path_name = Column(Text, nullable=False)
-    path_parent_id = Column(BigInteger)
+    path_parent_id = Column(BigInteger, index=True)
     path_is_root = Column(Boolean)
     path_case_id = Column(ForeignKey('cases.case_id'), nullable=False)
 
@@ -459,8 +552,8 @@ class DataStoreFile(db.Model):
     file_is_ioc = Column(Boolean)
     file_is_evidence = Column(Boolean)
     file_password = Column(Text)
-    file_parent_id = Column(ForeignKey('data_store_path.path_id'), nullable=False)
-    file_sha256 = Column(Text)
+    file_parent_id = Column(ForeignKey('data_store_path.path_id'), nullable=False, index=True)
+    file_sha256 = Column(Text, index=True)
     added_by_user_id = Column(ForeignKey('user.id'), nullable=False)
     modification_history = Column(JSON)
     file_case_id = Column(ForeignKey('cases.case_id'), nullable=False)
@@ -470,6 +563,21 @@ class DataStoreFile(db.Model):
     data_parent = relationship('DataStorePath')
 
 
+class DataStoreBlob(db.Model):
+    __tablename__ = 'data_store_blob'
+    __table_args__ = (
+        UniqueConstraint('blob_sha256', 'blob_password', name='uq_data_store_blob_sha256_password'),
+    )
+
+    blob_id = Column(BigInteger, primary_key=True)
+    blob_sha256 = Column(Text, nullable=False)
+    blob_password = Column(Text, nullable=False, default='', server_default=text("''"))
+    blob_local_name = Column(Text, nullable=False, unique=True)
+    blob_size = Column(BigInteger)
+    blob_ref_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    blob_date_added = Column(DateTime)
+
+
 class IocType(db.Model):
     __tablename__ = 'ioc_type'
 
@@ -483,6 +591,10 @@ class IocType(db.Model):
 
 class IocLink(db.Model):
     __tablename__ = 'ioc_link'
+    __table_args__ = (
+        Index('ix_ioc_link_ioc_id_case_id', 'ioc_id', 'case_id'),
+        Index('ix_ioc_link_case_id', 'case_id'),
+    )
 
     ioc_link_id = Column(Integer, primary_key=True)
     ioc_id = Column(ForeignKey('ioc.ioc_id'))
@@ -687,7 +799,7 @@ class TaskAssignee(db.Model):
 
     id = Column(BigInteger, primary_key=True, nullable=False)
     user_id = Column(BigInteger, ForeignKey('user.id'), nullable=False)
-    task_id = Column(BigInteger, ForeignKey('case_tasks.id'), nullable=False)
+    task_id = Column(BigInteger, ForeignKey('case_tasks.id'), nullable=False, index=True)
 
     user = relationship('User')
     task = relationship('CaseTasks')
@@ -721,6 +833,10 @@ class GlobalTasks(db.Model):
 
 class UserActivity(db.Model):
     __tablename__ = "user_activity"
+    __table_args__ = (
+        Index('ix_user_activity_activity_date_id', 'activity_date', 'id'),
+        Index('ix_user_activity_case_id_activity_date', 'case_id', 'activity_date'),
+    )
 
     id = Column(BigInteger, primary_key=True)
     user_id = Column(ForeignKey('user.id'), nullable=True)
@@ -750,6 +866,7 @@ class ServerSettings(db.Model):
     password_policy_lower_case = Column(Boolean)
     password_policy_digit = Column(Boolean)
     password_policy_special_chars = Column(Text)
+    seed_fingerprint = Column(Text)
 
 
 class Comments(db.Model):
@@ -786,7 +903,7 @@ class TaskComments(db.Model):
 
     id = Column(BigInteger, primary_key=True)
     comment_id = Column(ForeignKey('comments.comment_id'))
-    comment_task_id = Column(ForeignKey('case_tasks.id'))
+    comment_task_id = Column(ForeignKey('case_tasks.id'), index=True)
 
     task = relationship('CaseTasks')
     comment = relationship('Comments')
@@ -950,10 +1067,10 @@ class CeleryTaskMeta(db.Model):
     __tablename__ = 'celery_taskmeta'
 
     id = Column(BigInteger, Sequence('task_id_sequence'), primary_key=True)
-    task_id = Column(String(155))
+    task_id = Column(String(155), index=True)
     status = Column(String(50))
     result = Column(LargeBinary)
-    date_done = Column(DateTime)
+    date_done = Column(DateTime, index=True)
     traceback = Column(Text)
     name = Column(String(155))
     args = Column(LargeBinary)
@@ -966,6 +1083,24 @@ class CeleryTaskMeta(db.Model):
         return str(self.id) + ' - ' + str(self.user)
 
 
+class DimTaskSummary(db.Model):
+    __bind_key__ = 'iris_tasks'
+    __tablename__ = 'dim_task_summary'
+
+    id = Column(BigInteger, primary_key=True)
+    task_id = Column(String(155), nullable=False, unique=True)
+    name = Column(String(155), index=True)
+    module = Column(Text)
+    hook = Column(Text)
+    case_id = Column(Integer)
+    user_name = Column(Text)
+    state = Column(String(50))
+    success = Column(Boolean)
+    date_start = Column(DateTime)
+    date_done = Column(DateTime, index=True)
+    duration = Column(Float)
+
+
 def create_safe_attr(session, attribute_display_name, attribute_description, attribute_for, attribute_content):
     cat = CustomAttribute.query.filter(
         CustomAttribute.attribute_display_name == attribute_display_name,
@@ -17,14 +17,12 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 import datetime
 import dateutil.parser
+import io
 import marshmallow
 import os
-import pyminizip
 import random
 import re
-import shutil
 import string
-import tempfile
 from flask_login import current_user
 from marshmallow import ValidationError
 from marshmallow import fields
@@ -32,7 +30,6 @@ from marshmallow import post_load
 from marshmallow import pre_load
 from marshmallow.validate import Length
 from marshmallow_sqlalchemy import auto_field
-from pathlib import Path
 from sqlalchemy import func
 from typing import Any, Dict, List, Optional, Tuple, Union
 from werkzeug.datastructures import FileStorage
@@ -40,10 +37,13 @@ from werkzeug.datastructures import FileStorage
 from app import app
 from app import db
 from app import ma
-from app.datamgmt.datastore.datastore_db import datastore_get_standard_path
+from app.datamgmt.datastore.datastore_db import datastore_store_blob
+from app.datamgmt.datastore.datastore_db import datastore_store_blob_file
 from app.datamgmt.manage.manage_attribute_db import merge_custom_attributes
 from app.datamgmt.manage.manage_tags_db import add_db_tag
 from app.iris_engine.access_control.utils import ac_mask_from_val_list
+from app.iris_engine.utils.chunked_upload import chunked_upload_discard
+from app.iris_engine.utils.chunked_upload import chunked_upload_finalize
 from app.models import AnalysisStatus, CaseClassification, SavedFilter, DataStorePath, IrisModuleHook, Tags, \
     ReviewStatus, EvidenceTypes, CaseStatus, NoteDirectory
 from app.models import AssetsType
@@ -71,7 +71,7 @@ from app.models.authorization import Group
 from app.models.authorization import Organisation
 from app.models.authorization import User
 from app.models.cases import CaseState, CaseProtagonist
-from app.util import file_sha256sum, str_to_bool, assert_type_mml
+from app.util import str_to_bool, assert_type_mml
 from app.util import stream_sha256sum
 
 ALLOWED_EXTENSIONS = {'png', 'svg'}
@@ -401,6 +401,7 @@ class CaseNoteSchema(ma.SQLAlchemyAutoSchema):
         model = Notes
         load_instance = True
         include_fk = True
+        exclude = ['modification_history']
 
     def verify_directory_id(self, data: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
         """Verifies that the directory ID is valid.
@@ -655,6 +656,7 @@ class CaseAssetsSchema(ma.SQLAlchemyAutoSchema):
         model = CaseAssets
         include_fk = True
         load_instance = True
+        exclude = ['modification_history', 'asset_name_hash', 'asset_ip_inet']
 
     @pre_load
     def verify_data(self, data: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
@@ -876,6 +878,7 @@ class IocSchema(ma.SQLAlchemyAutoSchema):
         model = Ioc
         load_instance = True
         include_fk = True
+        exclude = ['modification_history', 'ioc_value_hash', 'ioc_value_inet']
 
     @pre_load
     def verify_data(self, data: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
@@ -976,8 +979,7 @@ class EventSchema(ma.SQLAlchemyAutoSchema):
 
     This schema defines the fields to include when serializing and deserializing Event objects.
     It includes fields for the event ID, event title, assets associated with the event, IOCs associated with the event,
-    the date and time of the event, the time zone of the event, the category ID of the event, and the modification history
-    of the event.
+    the date and time of the event, the time zone of the event and the category ID of the event.
 
     """
     event_title: str = auto_field('event_title', required=True, validate=Length(min=2), allow_none=False)
@@ -987,7 +989,6 @@ class EventSchema(ma.SQLAlchemyAutoSchema):
     event_tz: str = fields.String(required=True, allow_none=False)
     event_category_id: int = fields.Integer(required=True, allow_none=False)
     event_date_wtz: datetime = fields.DateTime("%Y-%m-%dT%H:%M:%S.%f", required=False, allow_none=False)
-    modification_history: str = auto_field('modification_history', required=False, readonly=True)
     event_comments_map: List[int] = fields.List(fields.Integer, required=False, allow_none=True)
     event_sync_iocs_assets: bool = fields.Boolean(required=False)
     children = fields.Nested('EventSchema', many=True, required=False)
@@ -996,6 +997,7 @@ class EventSchema(ma.SQLAlchemyAutoSchema):
         model = CasesEvent
         load_instance = True
         include_fk = True
+        exclude = ['modification_history']
 
     def validate_date(self, event_date: str, event_tz: str):
         """Validates the date and time of the event.
@@ -1156,6 +1158,7 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
         model = DataStoreFile
         include_fk = True
         load_instance = True
+        exclude = ['modification_history']
 
     def ds_store_file_b64(self, filename: str, file_content: bytes, dsp: DataStorePath, cid: int) -> Tuple[
         DataStoreFile, bool]:
@@ -1181,7 +1184,11 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
             filename = filename.rstrip().replace('\t', '').replace('\n', '').replace('\r', '')
             file_hash = stream_sha256sum(file_content)
 
-            dsf = DataStoreFile.query.filter(DataStoreFile.file_sha256 == file_hash).first()
+            dsf = DataStoreFile.query.filter(
+                DataStoreFile.file_sha256 == file_hash,
+                DataStoreFile.file_case_id == cid,
+                DataStoreFile.file_password == ""
+            ).first()
             if dsf:
                 exists = True
 
@@ -1196,19 +1203,12 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
                 dsf.file_case_id = cid
                 dsf.file_date_added = datetime.datetime.now()
                 dsf.added_by_user_id = current_user.id
-                dsf.file_local_name = 'tmp_xc'
                 dsf.file_parent_id = dsp.path_id
-                dsf.file_sha256 = file_hash
+                dsf.file_local_name, dsf.file_size, dsf.file_sha256 = datastore_store_blob(io.BytesIO(file_content))
 
                 db.session.add(dsf)
                 db.session.commit()
 
-                dsf.file_local_name = datastore_get_standard_path(dsf, cid).as_posix()
-                db.session.commit()
-
-                with open(dsf.file_local_name, 'wb') as fout:
-                    fout.write(file_content)
-
                 exists = False
 
         except Exception as e:
@@ -1221,17 +1221,17 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
 
         return dsf, exists
 
-    def ds_store_file(self, file_storage: FileStorage, location: Path, is_ioc: bool, password: Optional[str]) -> Tuple[
+    def ds_store_file(self, file_storage: FileStorage, is_ioc: bool, password: Optional[str]) -> Tuple[
         str, int, str]:
         """Stores a file in the data store.
 
-        This method stores a file in the data store. If the file is an IOC and no password is provided, it uses a default
-        password. If a password is provided, it encrypts the file with the password. It returns the path, size, and hash
+        This method stores a file in the content-addressable blob store of the data store. If the file is an IOC and no
+        password is provided, it uses a default password. If a password is provided, it encrypts the file with the
+        password. Files with the same content and password share the same blob. It returns the path, size, and hash
         of the stored file.
 
         Args:
             file_storage: The file to store.
-            location: The location where the file should be stored.
             is_ioc: Whether the file is an IOC.
             password: The password to use for encrypting the file.
 
@@ -1251,63 +1251,78 @@ class DSFileSchema(ma.SQLAlchemyAutoSchema):
         if not file_storage.filename:
             return None
 
-        passwd = None
+        passwd = self._ds_file_password(is_ioc, password)
 
         try:
-            if is_ioc and not password:
-                passwd = 'infected'
-            elif password:
-                passwd = password
+            file_path, file_size, file_hash = datastore_store_blob(file_storage.stream, passwd)
+            file_storage.close()
 
-            if passwd is not None:
-                try:
-                    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-                        file_storage.save(tmp)
-                        file_storage.close()
+        except Exception as e:
+            log.exception(e)
+            raise marshmallow.exceptions.ValidationError(
+                str(e),
+                field_name='file_password' if passwd is not None else 'file_content'
+            )
 
-                        fn = tmp
+        setattr(self, 'file_local_path', file_path)
 
-                    file_hash = file_sha256sum(fn.name)
-                    file_size = os.stat(fn.name).st_size
+        return file_path, file_size, file_hash
 
-                    file_path = location.as_posix() + '.zip'
+    def ds_store_upload(self, upload: Dict[str, Any], file_sha256: Optional[str], is_ioc: bool,
+                        password: Optional[str]) -> Tuple[str, int, str]:
+        """Stores a chunked upload in the data store.
 
-                    shutil.copyfile(fn.name, Path(fn.name).parent / file_hash)
+        This method verifies that every chunk of the upload was received and that the assembled file matches the
+        provided hash, then moves it to the blob store of the data store with the same password rules as
+        ds_store_file. The upload is discarded once stored.
 
-                    pyminizip.compress((Path(fn.name).parent / file_hash).as_posix(), None, file_path, passwd, 0)
-                    os.unlink(Path(tmp.name).parent / file_hash)
-                    os.unlink(fn.name)
+        Args:
+            upload: The description of the upload, as returned by chunked_upload_get.
+            file_sha256: The expected SHA-256 of the file, if provided by the client.
+            is_ioc: Whether the file is an IOC.
+            password: The password to use for encrypting the file.
 
-                except Exception as e:
-                    log.exception(e)
-                    raise marshmallow.exceptions.ValidationError(
-                        str(e),
-                        field_name='file_password'
-                    )
+        Returns:
+            A tuple containing the path, size, and hash of the stored file.
 
-            else:
-                file_storage.save(location)
-                file_storage.close()
-                file_path = location.as_posix()
-                file_size = location.stat().st_size
-                file_hash = file_sha256sum(file_path)
+        Raises:
+            ValidationError: If the upload is incomplete or corrupted, or if there is an error storing the file.
 
-        except Exception as e:
+        """
+        has_error, res = chunked_upload_finalize(upload, file_sha256)
+        if has_error:
             raise marshmallow.exceptions.ValidationError(
-                str(e),
-                field_name='file_content'
+                res,
+                field_name='upload_id'
             )
 
-        if location is None:
+        assembled_file, file_size, file_hash = res
+        passwd = self._ds_file_password(is_ioc, password)
+
+        try:
+            file_path = datastore_store_blob_file(assembled_file, file_size, file_hash, passwd)
+
+        except Exception as e:
+            log.exception(e)
             raise marshmallow.exceptions.ValidationError(
-                f"Unable to save file in target location",
-                field_name='file_content'
+                str(e),
+                field_name='file_password' if passwd is not None else 'upload_id'
             )
 
-        setattr(self, 'file_local_path', str(location))
+        finally:
+            chunked_upload_discard(upload['upload_id'])
+
+        setattr(self, 'file_local_path', file_path)
 
         return file_path, file_size, file_hash
 
+    @staticmethod
+    def _ds_file_password(is_ioc: bool, password: Optional[str]) -> Optional[str]:
+        if is_ioc and not password:
+            return 'infected'
+
+        return password or None
+
 
 class ServerSettingsSchema(ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing ServerSettings objects.
@@ -1456,7 +1471,7 @@ class CaseSchema(ma.SQLAlchemyAutoSchema):
         model = Cases
         include_fk = True
         load_instance = True
-        exclude = ['name', 'description', 'soc_id', 'client_id', 'initial_date']
+        exclude = ['modification_history', 'name', 'description', 'soc_id', 'client_id', 'initial_date']
 
     @pre_load
     def classification_filter(self, data: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
@@ -1733,6 +1748,7 @@ class CaseTaskSchema(ma.SQLAlchemyAutoSchema):
         model = CaseTasks
         load_instance = True
         include_fk = True
+        exclude = ['modification_history']
 
     @pre_load
     def verify_data(self, data: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
@@ -1820,6 +1836,7 @@ class CaseEvidenceSchema(ma.SQLAlchemyAutoSchema):
         load_instance = True
         include_relationships = True
         include_fk = True
+        exclude = ['modification_history']
 
     @post_load
     def custom_attributes_merge(self, data: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
@@ -2163,6 +2180,7 @@ class AlertSchema(ma.SQLAlchemyAutoSchema):
         include_relationships = True
         include_fk = True
         load_instance = True
+        exclude = ['modification_history']
 
     @pre_load
     def verify_data(self, data: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
@@ -2277,3 +2295,4 @@ class CaseDetailsSchema(ma.SQLAlchemyAutoSchema):
         include_fk = True
         load_instance = True
         include_relationships = True
+        exclude = ['modification_history']
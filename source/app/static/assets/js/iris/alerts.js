@@ -1231,20 +1231,39 @@ function init_module_processing_alert(alert_id, hook_name, hook_ui_name, module_
 let modulesOptionsAlertReq = null;
 let modulesOptionsIocReq = null;
 
-async function showAlertHistory(alertId) {
-    const alertDataReq = await fetchAlert(alertId);
-    if (!notify_auto_api(alertDataReq, true)) {
+async function fetchAlertHistory(alertId, page) {
+    const response = get_raw_request_api(`/alerts/${alertId}/history?cid=${get_caseid()}&page=${page}`);
+    return await response;
+}
+
+async function showAlertHistory(alertId, page=1) {
+    const historyReq = await fetchAlertHistory(alertId, page);
+    if (!notify_auto_api(historyReq, true)) {
         return;
     }
-    let alertData = alertDataReq.data;
+    let historyData = historyReq.data;
     let entryDiv = $('#modal_alert_history_content');
+    if (page === 1) {
+        entryDiv.empty();
+    }
+    entryDiv.find('.load-more-history').remove();
+
+    for (let entry of historyData.history)  {
+        let dateStr = new Date(entry.date + 'Z').toLocaleString();
+        let row = $('<div class="row"></div>');
+        row.append($('<div class="col-3"></div>').text(dateStr));
+        row.append($('<div class="col-3"></div>').text(entry.user));
+        row.append($('<div class="col-6"></div>').text(entry.action));
+        entryDiv.append(row);
+    }
 
-    for (let entry in alertData.modification_history)  {
-        let date = new Date(Math.floor(entry) * 1000);
-        let dateStr = date.toLocaleString();
-        let entryStr = alertData.modification_history[entry];
-        entryDiv.append('<div class="row"><div class="col-3">' + dateStr + '</div><div class="col-3">' + entryStr.user + '</div><div class="col-6">'+ entryStr.action +'</div></div>');
-
+    if (historyData.next_page !== null) {
+        let loadMore = $('<a href="#" class="load-more-history">Load older entries</a>');
+        loadMore.on('click', function(e) {
+            e.preventDefault();
+            showAlertHistory(alertId, historyData.next_page);
+        });
+        entryDiv.append(loadMore);
     }
 
     $('#modal_alert_history').modal('show');
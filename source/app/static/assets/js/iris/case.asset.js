@@ -315,7 +315,15 @@ function upload_assets() {
         post_request_api('/case/assets/upload', JSON.stringify(data), true)
         .done((data) => {
             jsdata = data;
-            if (jsdata.status == "success") {
+            if (jsdata.status == "success" && jsdata.data && jsdata.data.task_id) {
+                $('#modal_upload_assets').modal('hide');
+                notify_success("Import queued, the table will refresh once it completes");
+                wait_import_task(jsdata.data.task_id, function (status) {
+                    reload_assets();
+                    swal(status.status == "success" ? "Got news for you" : "Got bad news for you", status.message,
+                        status.status == "success" ? "success" : "error");
+                });
+            } else if (jsdata.status == "success") {
                 reload_assets();
                 $('#modal_upload_assets').modal('hide');
                 swal("Got news for you", data.message, "success");
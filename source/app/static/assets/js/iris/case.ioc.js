@@ -324,7 +324,15 @@ function upload_ioc() {
         post_request_api('/case/ioc/upload', JSON.stringify(data), true)
         .done((data) => {
             jsdata = data;
-            if (jsdata.status == "success") {
+            if (jsdata.status == "success" && jsdata.data && jsdata.data.task_id) {
+                $('#modal_upload_ioc').modal('hide');
+                notify_success("Import queued, the table will refresh once it completes");
+                wait_import_task(jsdata.data.task_id, function (status) {
+                    reload_iocs();
+                    swal(status.status == "success" ? "Got news for you" : "Got bad news for you", status.message,
+                        status.status == "success" ? "success" : "error");
+                });
+            } else if (jsdata.status == "success") {
                 reload_iocs();
                 $('#modal_upload_ioc').modal('hide');
                 swal("Got news for you", data.message, "success");
@@ -4,6 +4,9 @@ let session_id = null ;
 let collaborator = null ;
 let collaborator_socket = null ;
 let last_applied_change = null ;
+let last_seq = 0;
+let awaiting_snapshot = false;
+let snapshot_incomplete = false;
 let just_cleared_buffer = null ;
 let is_typing = "";
 let ppl_viewing = new Map();
@@ -28,6 +31,7 @@ function Collaborator( session_id, n_id ) {
     this.channel = "case-" + session_id + "-notes";
 
     this.collaboration_socket.off("change-note");
+    this.collaboration_socket.off("snapshot-note");
     this.collaboration_socket.off("clear_buffer-note");
     this.collaboration_socket.off("save-note");
     this.collaboration_socket.off("leave-note");
@@ -40,12 +44,43 @@ function Collaborator( session_id, n_id ) {
         // Set as int to avoid type mismatch
         if (parseInt(data.note_id) !== parseInt(note_id)) return;
 
-        let delta = JSON.parse(data.delta);
-        last_applied_change = delta;
+        // Changes older than the snapshot being loaded are part of it
+        if (awaiting_snapshot || data.seq <= last_seq) return;
+        if (data.seq !== last_seq + 1) {
+            // Some changes were missed, reload the saved note and the changes made since
+            awaiting_snapshot = true;
+            sync_note(note_id).then(function () {
+                collaborator.snapshot(note_id);
+            });
+            return;
+        }
+        last_seq = data.seq;
+
         $("#content_typing").text(data.last_change + " is typing..");
-        if (delta !== null && delta !== undefined) {
-            note_editor.session.getDocument().applyDeltas([delta]);
+        apply_collab_changes(data.changes);
+    }.bind());
+
+    this.collaboration_socket.on("snapshot-note", function (data) {
+        if (parseInt(data.note_id) !== parseInt(note_id)) return;
+
+        last_seq = data.seq;
+        if (!data.complete) {
+            // Too many changes were made since the last save to replay them. Ignore the next ones, which apply
+            // to content we do not have, until the note is saved again and reloaded
+            if (!snapshot_incomplete) {
+                notify_warning('The changes made by the other editors could not be loaded. The note is read-only until it is saved again.');
+            }
+            snapshot_incomplete = true;
+            note_editor.setReadOnly(true);
+            return;
         }
+
+        awaiting_snapshot = false;
+        if (snapshot_incomplete) {
+            snapshot_incomplete = false;
+            note_editor.setReadOnly(false);
+        }
+        apply_collab_changes(data.changes);
     }.bind());
 
     this.collaboration_socket.on("clear_buffer-note", function () {
@@ -58,6 +93,10 @@ function Collaborator( session_id, n_id ) {
         if (parseInt(data.note_id) !== parseInt(note_id)) return;
         sync_note(note_id)
             .then(function () {
+                if (snapshot_incomplete) {
+                    // The saved note now holds the changes we could not load
+                    collaborator.snapshot(note_id);
+                }
                 $("#content_last_saved_by").text("Last saved by " + data.last_saved);
                 $('#btn_save_note').text("Saved").addClass('btn-success').removeClass('btn-danger').removeClass('btn-warning');
                 $('#last_saved').removeClass('btn-danger').addClass('btn-success');
@@ -103,6 +142,19 @@ Collaborator.prototype.save = function( note_id ) {
     this.collaboration_socket.emit( "save-note", { 'channel': this.channel, 'note_id': note_id } ) ;
 }
 
+Collaborator.prototype.snapshot = function( note_id ) {
+    this.collaboration_socket.emit( "snapshot-note", { 'channel': this.channel, 'note_id': note_id } ) ;
+}
+
+function apply_collab_changes(changes) {
+    for (const change of changes) {
+        // Our own changes are already in the editor
+        if (change.origin === collaborator_socket.id) continue;
+        last_applied_change = change.delta;
+        note_editor.session.getDocument().applyDeltas([change.delta]);
+    }
+}
+
 Collaborator.prototype.close = function( note_id ) {
     this.collaboration_socket.emit( "leave-note", { 'channel': this.channel, 'note_id': note_id } ) ;
 }
@@ -135,8 +187,8 @@ async function sync_note(node_id) {
     // Get the local note
     let local_note = note_editor.getValue();
 
-    // If the local note is empty, set it to the remote note
-    if (local_note === '') {
+    // If the local note is empty or out of date, hence read-only, set it to the remote note
+    if (local_note === '' || snapshot_incomplete) {
         note_editor.setValue(remote_note.data.note_content, -1);
         return;
     }
@@ -319,6 +371,12 @@ async function note_detail(id) {
             last_applied_change = null ;
             just_cleared_buffer = false ;
 
+            // Catch up with the changes made since the last save of the note
+            last_seq = 0;
+            awaiting_snapshot = true;
+            snapshot_incomplete = false;
+            collaborator.snapshot(note_id);
+
             load_menu_mod_options_modal(id, 'note', $("#note_modal_quick_actions"));
 
             collaborator_socket.emit('ping-note', { 'channel': 'case-' + get_caseid() + '-notes', 'note_id': note_id });
@@ -17,8 +17,42 @@ Dropzone.prototype.getErroredFiles = function () {
     return _results;
 };
 
+/* Files are sent in chunks, then referenced by their upload ID in the pipeline upload request */
 var dropUpdate = new Dropzone("div#files_drop_1", {
-    url: "/manage/cases/upload_files" + case_param(),
+    url: function (files) {
+        return `/datastore/upload/${files[0].upload.uuid}/chunk` + case_param();
+    },
+    paramName: "chunk",
+    chunking: true,
+    forceChunking: true,
+    chunkSize: UPLOAD_CHUNK_SIZE,
+    parallelChunkUploads: false,
+    retryChunks: true,
+    retryChunksLimit: UPLOAD_CHUNK_RETRIES,
+    params: function (files, xhr, chunk) {
+        return {
+            'chunk_index': chunk.index,
+            'csrf_token': $('#csrf_token').val()
+        };
+    },
+    accept: function (file, done) {
+        init_chunked_upload(file, file.upload.uuid)
+        .done(() => done())
+        .fail((jqXHR) => done(jqXHR.responseJSON ? jqXHR.responseJSON.message : "Unable to initialize the upload"));
+    },
+    chunksUploaded: function (file, done) {
+        let formData = new FormData();
+        formData.append('upload_id', file.upload.uuid);
+        formData.append('is_update', true);
+        formData.append('pipeline', $('#update_pipeline_selector').val());
+        formData.append('csrf_token', $('#csrf_token').val());
+
+        post_request_data_api("/manage/cases/upload_files", formData, false)
+        .done(() => done())
+        .fail((jqXHR) => {
+            dropUpdate._errorProcessing([file], jqXHR.responseJSON ? jqXHR.responseJSON.message : "Upload failed", jqXHR);
+        });
+    },
     addRemoveLinks: true,
     autoProcessQueue: false,
     parallelUploads: 40,
@@ -41,13 +75,6 @@ var dropUpdate = new Dropzone("div#files_drop_1", {
     }
 });
 
-/* Add of field for file upload */
-dropUpdate.on('sending', function (file, xhr, formData) {
-    formData.append('is_update', true);
-    formData.append('pipeline', $('#update_pipeline_selector').val() );
-    formData.append('csrf_token', $('#csrf_token').val());
-});
-
 /* Update case function. start the update task */
 
 function send_update_case_data() {
@@ -4,6 +4,9 @@ var buffer_dumped = false ;
 var last_applied_change = null ;
 var just_cleared_buffer = null ;
 var from_sync = null;
+var last_seq = 0;
+var awaiting_snapshot = false;
+var snapshot_incomplete = false;
 
 var editor = ace.edit("editor_summary",
     {
@@ -20,11 +23,37 @@ function Collaborator( session_id ) {
     this.collaboration_socket.emit('join', { 'channel': this.channel });
 
     this.collaboration_socket.on( "change", function(data) {
-        delta = JSON.parse( data.delta ) ;
-        console.log(delta);
-        last_applied_change = delta ;
+        // Changes older than the snapshot being loaded are part of it
+        if (awaiting_snapshot || data.seq <= last_seq) return;
+        if (data.seq !== last_seq + 1) {
+            // Some changes were missed, reload the saved content and the changes made since
+            sync_editor(true);
+            return;
+        }
+        last_seq = data.seq;
         $("#content_typing").text(data.last_change + " is typing..");
-        editor.getSession().getDocument().applyDeltas( [delta] ) ;
+        apply_collab_changes(data.changes);
+    }.bind() ) ;
+
+    this.collaboration_socket.on( "snapshot", function(data) {
+        last_seq = data.seq;
+        if (!data.complete) {
+            // Too many changes were made since the last save to replay them. Ignore the next ones, which apply
+            // to content we do not have, until the summary is saved again and reloaded
+            if (!snapshot_incomplete) {
+                notify_warning('The changes made by the other editors could not be loaded. The summary is read-only until it is saved again.');
+            }
+            snapshot_incomplete = true;
+            editor.setReadOnly(true);
+            return;
+        }
+
+        awaiting_snapshot = false;
+        if (snapshot_incomplete) {
+            snapshot_incomplete = false;
+            editor.setReadOnly(false);
+        }
+        apply_collab_changes(data.changes);
     }.bind() ) ;
 
     this.collaboration_socket.on( "clear_buffer", function() {
@@ -51,6 +80,19 @@ Collaborator.prototype.save = function() {
     this.collaboration_socket.emit( "save", { 'channel': this.channel } ) ;
 }
 
+Collaborator.prototype.snapshot = function() {
+    this.collaboration_socket.emit( "snapshot", { 'channel': this.channel } ) ;
+}
+
+function apply_collab_changes(changes) {
+    for (const change of changes) {
+        // Our own changes are already in the editor
+        if (change.origin === collaborator.collaboration_socket.id) continue;
+        last_applied_change = change.delta;
+        editor.getSession().getDocument().applyDeltas( [change.delta] ) ;
+    }
+}
+
 function body_loaded() {
 
     collaborator = new Collaborator( get_caseid() ) ;
@@ -165,6 +207,9 @@ function sync_editor(no_check) {
                 // Set the content from remote server
                 from_sync = true;
                 editor.getSession().setValue(data.data.case_description);
+                // Catch up with the changes made since the last save
+                awaiting_snapshot = true;
+                collaborator.snapshot();
 
                 // Set the CRC in page
                 $('#fetched_crc').val(data.data.crc32.toString());
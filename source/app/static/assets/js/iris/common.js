@@ -226,6 +226,28 @@ function notify_success(message) {
     });
 }
 
+function notify_warning(message) {
+    let p = $('<p>')
+    p.text(message);
+    $.notify({
+        icon: 'fas fa-triangle-exclamation',
+        message: p.prop('outerHTML'),
+        title: 'Warning'
+    }, {
+        type: 'warning',
+        placement: {
+            from: 'bottom',
+            align: 'left'
+        },
+        z_index: 2000,
+        timer: 8000,
+        animate: {
+            enter: 'animated fadeIn',
+            exit: 'animated fadeOut'
+        }
+    });
+}
+
 function notify_auto_api(data, silent_success, silent_failure) {
     if (data.status === 'success') {
         if (silent_success === undefined || silent_success === false) {
@@ -468,6 +490,113 @@ function notify_redirect() {
     }
 }
 
+/* Chunked uploads - large files are sent in chunks which can be retried and resumed */
+const UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+const UPLOAD_CHUNK_RETRIES = 3;
+
+function new_upload_id() {
+    if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+        return window.crypto.randomUUID();
+    }
+    return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function (c) {
+        let r = Math.random() * 16 | 0;
+        return (c === 'x' ? r : (r & 0x3 | 0x8)).toString(16);
+    });
+}
+
+function upload_resume_key(file) {
+    return `iris-upload:${get_caseid()}:${file.name}:${file.size}:${file.lastModified}`;
+}
+
+async function chunk_sha256(blob) {
+    if (!window.crypto || !window.crypto.subtle) {
+        return null;
+    }
+    let digest = await window.crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+function init_chunked_upload(file, upload_id) {
+    return $.ajax({
+        url: '/datastore/upload/init' + case_param(),
+        type: 'POST',
+        data: JSON.stringify({
+            'upload_id': upload_id,
+            'file_name': file.name,
+            'file_size': file.size,
+            'chunk_size': UPLOAD_CHUNK_SIZE,
+            'csrf_token': $('#csrf_token').val()
+        }),
+        dataType: "json",
+        contentType: "application/json;charset=UTF-8"
+    });
+}
+
+async function send_upload_chunk(upload_id, file, index) {
+    let chunk = file.slice(index * UPLOAD_CHUNK_SIZE, (index + 1) * UPLOAD_CHUNK_SIZE);
+    let formData = new FormData();
+    formData.append('chunk', chunk, file.name);
+    formData.append('chunk_index', index);
+    formData.append('csrf_token', $('#csrf_token').val());
+
+    let checksum = await chunk_sha256(chunk);
+    if (checksum !== null) {
+        formData.append('chunk_sha256', checksum);
+    }
+
+    for (let attempt = 0; ; attempt++) {
+        try {
+            return await $.ajax({
+                url: `/datastore/upload/${upload_id}/chunk` + case_param(),
+                type: 'POST',
+                data: formData,
+                dataType: "json",
+                contentType: false,
+                processData: false
+            });
+        } catch (error) {
+            if (attempt >= UPLOAD_CHUNK_RETRIES) {
+                throw error;
+            }
+        }
+    }
+}
+
+/* Uploads a file in chunks and returns the upload ID to reference it in the final request.
+ * Chunks already received by the server, from an interrupted upload of the same file, are skipped. */
+async function upload_file_chunked(file, on_progress) {
+    let resume_key = upload_resume_key(file);
+    let upload_id = localStorage.getItem(resume_key) || new_upload_id();
+    let upload;
+
+    try {
+        upload = await init_chunked_upload(file, upload_id);
+    } catch (error) {
+        upload = null;
+    }
+    if (upload === null || upload.status !== 'success') {
+        upload_id = new_upload_id();
+        upload = await init_chunked_upload(file, upload_id);
+    }
+    localStorage.setItem(resume_key, upload_id);
+
+    let received = new Set(upload.data.received_chunks);
+    for (let index = 0; index < upload.data.chunk_count; index++) {
+        if (!received.has(index)) {
+            await send_upload_chunk(upload_id, file, index);
+        }
+        if (typeof on_progress === 'function') {
+            on_progress(index + 1, upload.data.chunk_count);
+        }
+    }
+
+    return upload_id;
+}
+
+function end_chunked_upload(file) {
+    localStorage.removeItem(upload_resume_key(file));
+}
+
 function case_param() {
     var params = {
         cid: get_caseid
@@ -475,6 +604,26 @@ function case_param() {
     return '?'+ $.param(params);
 }
 
+function wait_import_task(task_id, on_done) {
+    /* Follows a background CSV import until it completes, then calls on_done with its final status */
+    get_request_api('/case/import/status/' + task_id)
+    .done((data) => {
+        if (data.data.state === 'pending' || data.data.state === 'progress') {
+            if (data.data.state === 'progress') {
+                set_page_warning('Importing ' + data.data.current + ' / ' + data.data.total + ' rows');
+            }
+            setTimeout(function () { wait_import_task(task_id, on_done); }, 2000);
+            return;
+        }
+        set_page_warning('');
+        on_done(data);
+    })
+    .fail((jqXHR) => {
+        set_page_warning('');
+        on_done(jqXHR.responseJSON ? jqXHR.responseJSON : {'status': 'error', 'message': 'Import failed'});
+    });
+}
+
 var last_state = null;
 var need_check = true;
 function update_last_resfresh() {
@@ -288,19 +288,28 @@ async function save_ds_multi_files(node, index_i) {
         return;
     }
     let file = $('#input_upload_ds_files').prop('files')[index];
-    formData.append('file_content', file);
+    let upload_title = `File ${file.name} is uploading. (${index}/${totalFiles} files)`;
+    try {
+        await append_ds_file_content(formData, file, upload_title);
+    } catch (error) {
+        window.swal.close();
+        notify_error(`Unable to upload ${file.name}`);
+        return;
+    }
     formData.append('file_original_name', file.name);
     let uri = '/datastore/file/add/' + node;
     await post_request_data_api(uri, formData, true, function () {
         window.swal({
-            title: `File ${file.name} is uploading. (${index}/${totalFiles} files)`,
+            title: upload_title,
             text: "Please wait. This window will close automatically when the file is uploaded.",
             icon: "/static/assets/img/loader.gif",
             button: false,
             allowOutsideClick: false
         });
     }).then((data) => {
-        notify_auto_api(data);
+        if (notify_auto_api(data)) {
+            end_chunked_upload(file);
+        }
         index += 1;
         save_ds_multi_files(node, index);
         load_datastore();
@@ -309,9 +318,40 @@ async function save_ds_multi_files(node, index_i) {
     });
 }
 
-function save_ds_file(node, file_id) {
+/* Files bigger than a chunk are uploaded beforehand in chunks, and referenced by their upload ID */
+async function append_ds_file_content(formData, file, upload_title) {
+    if (file === undefined) {
+        return;
+    }
+
+    if (file.size <= UPLOAD_CHUNK_SIZE) {
+        formData.append('file_content', file);
+        return;
+    }
+
+    window.swal({
+        title: upload_title,
+        text: "Please wait. This window will close automatically when the file is uploaded.",
+        icon: "/static/assets/img/loader.gif",
+        button: false,
+        allowOutsideClick: false
+    });
+    let upload_id = await upload_file_chunked(file, function (sent, total) {
+        $('.swal-text').text(`Uploaded ${Math.round(sent * 100 / total)}%. This window will close automatically when the file is uploaded.`);
+    });
+    formData.append('upload_id', upload_id);
+}
+
+async function save_ds_file(node, file_id) {
     var formData = new FormData($('#form_new_ds_file')[0]);
-    formData.append('file_content', $('#input_upload_ds_file').prop('files')[0]);
+    let file = $('#input_upload_ds_file').prop('files')[0];
+    try {
+        await append_ds_file_content(formData, file, "File is uploading");
+    } catch (error) {
+        window.swal.close();
+        notify_error("Unable to upload the file");
+        return;
+    }
     let uri = '';
 
     if (file_id === undefined) {
@@ -331,6 +371,9 @@ function save_ds_file(node, file_id) {
     })
     .done(function (data){
         if(notify_auto_api(data)){
+            if (file !== undefined) {
+                end_chunked_upload(file);
+            }
             $('#modal_ds_file').modal("hide");
             reset_ds_file_view();
             load_datastore();
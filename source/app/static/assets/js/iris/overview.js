@@ -318,10 +318,8 @@ function show_case_view(row_index) {
     let owner_col1 = $('<div/>').addClass('col-md-6');
     let owner_col2 = $('<div/>').addClass('col-md-6');
     let timeSinceLastUpdateStr = '';
-    let modifications = case_data.modification_history;
-    if (modifications != null) {
-        let timestamps = Object.keys(modifications).map(parseFloat);
-        let lastUpdatedTimestamp = Math.max(...timestamps);
+    let lastUpdatedTimestamp = case_data.last_update;
+    if (lastUpdatedTimestamp != null) {
 
         let currentTime = Date.now() / 1000; // convert to seconds
         let timeSinceLastUpdate = currentTime - lastUpdatedTimestamp;
@@ -126,6 +126,63 @@ Table_comments = $("#comments_search_table").DataTable({
 });
 $("#comments_search_table").css("font-size", 12);
 
+Table_assets = $("#assets_search_table").DataTable({
+    dom: 'Bfrtip',
+    aaData: [],
+    aoColumns: [
+      { "data": "asset_name",
+        "render": function (data, type, row, meta) {
+            if (type === 'display') { data = sanitizeHTML(data);}
+            return data;
+          }
+      },
+      { "data": "asset_description",
+        "render": function (data, type, row, meta) {
+            if (type === 'display') {
+                return ret_obj_dt_description(data);
+            }
+            return data;
+          }
+      },
+      { "data": "asset_ip",
+        "render": function (data, type, row, meta) {
+            if (type === 'display') { data = sanitizeHTML(data);}
+            return data;
+          }
+      },
+      { "data": "type_name",
+        "render": function (data, type, row, meta) {
+            if (type === 'display') { data = sanitizeHTML(data);}
+            return data;
+          }
+      },
+      { "data": "case_name",
+         "render": function (data, type, row, meta) {
+            let a_anchor = $('<a>');
+            a_anchor.attr('href', 'case?cid=' + row["case_id"]);
+            a_anchor.attr('target', '_blank');
+            a_anchor.text(data);
+            return a_anchor[0].outerHTML;
+          }},
+      { "data": "customer_name",
+         "render": function (data, type, row, meta) {
+            if (type === 'display') { data = sanitizeHTML(data);}
+            return data;
+          }
+      }
+    ],
+    filter: true,
+    info: true,
+    ordering: true,
+    processing: true,
+    retrieve: true,
+    buttons: [
+    { "extend": 'csvHtml5', "text":'Export',"className": 'btn btn-primary btn-border btn-round btn-sm float-left mr-4 mt-2' },
+    { "extend": 'copyHtml5', "text":'Copy',"className": 'btn btn-primary btn-border btn-round btn-sm float-left mr-4 mt-2' },
+    ]
+});
+$("#assets_search_table").css("font-size", 12);
+
 $('#submit_search').click(function () {
     search();
 });
@@ -142,9 +199,11 @@ function search() {
               $('#notes_msearch_list').empty();
               Table_1.clear();
               Table_comments.clear();
+              Table_assets.clear();
               $('#search_table_wrapper_1').hide();
               $('#search_table_wrapper_2').hide();
               $('#search_table_wrapper_3').hide();
+              $('#search_table_wrapper_4').hide();
             val = $("input[type='radio']:checked").val();
             if (val == "ioc") {
                 Table_1.rows.add(data.data);
@@ -182,6 +241,10 @@ function search() {
                         $('.popover').popover('hide');
                         $(e.target).popover('toggle');
                 });
+            } else if (val == "assets") {
+                Table_assets.rows.add(data.data);
+                Table_assets.columns.adjust().draw();
+                $('#search_table_wrapper_4').show();
             }
         }
     })
@@ -27,12 +27,13 @@ import logging as log
 import marshmallow
 import pickle
 import random
-import requests
 import shutil
 import string
+import time
 import traceback
 import uuid
 import weakref
+from collections.abc import Iterator
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives import hmac
@@ -40,31 +41,44 @@ from flask import Request
 from flask import render_template
 from flask import request
 from flask import session
+from flask import stream_with_context
 from flask import url_for
 from flask_login import current_user
 from flask_login import login_user
 from flask_wtf import FlaskForm
 from functools import wraps
-from jwt import PyJWKClient
 from pathlib import Path
 from pyunpack import Archive
-from requests.auth import HTTPBasicAuth
 from sqlalchemy.ext.declarative import DeclarativeMeta
-from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import inspect as sa_inspect
 from werkzeug.utils import redirect
 
 from app import TEMPLATE_PATH
 from app import app
 from app import db
 from app.datamgmt.case.case_db import get_case
+from app.datamgmt.history.history_db import add_object_history_entry
 from app.datamgmt.manage.manage_access_control_db import user_has_client_access
 from app.datamgmt.manage.manage_users_db import get_user
+from app.iris_engine.access_control.oidc_handler import cache_verified_token
+from app.iris_engine.access_control.oidc_handler import get_cached_token_subject
+from app.iris_engine.access_control.oidc_handler import get_signing_key
+from app.iris_engine.access_control.oidc_handler import introspect_token
 from app.iris_engine.access_control.utils import ac_fast_check_user_has_case_access
+from app.iris_engine.access_control.utils import ac_get_access_generation
 from app.iris_engine.access_control.utils import ac_get_effective_permissions_of_user
 from app.iris_engine.utils.tracker import track_activity
 from app.models import Cases
 from app.models.authorization import CaseAccessLevel
 
+# Delay after which the authorization of a socket connection on a case is checked again, so an access change
+# made by another process is eventually applied
+SOCKET_ACCESS_MAX_AGE = 60
+
+# Size of the chunks written by the streamed responses, so the rows are not sent one write at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
 
 def response(msg, data):
     rsp = {
@@ -99,6 +113,100 @@ def response_success(msg='', data=None):
                               mimetype='application/json')
 
 
+def response_success_stream(msg='', data=None):
+    """
+    Streams a success response, for the endpoints returning large lists. The iterators held by data, e.g. generators
+    over a query run with yield_per, are encoded as JSON lists while they are consumed, so neither the whole rows nor
+    the whole document are held in memory. The document is the one response_success returns once the iterators are
+    turned into lists, keys in the same order.
+
+    The clients accepting application/x-ndjson rather receive a first line with the status, the message and the data
+    which is not streamed, then one line per streamed row, as {"<key>": row}, or the row itself if data is an iterator.
+
+    As the status is sent before the rows are read, an error raised while streaming truncates the response
+    """
+    if request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return app.response_class(response=stream_with_context(_chunked(_iterencode_ndjson(msg, data))),
+                                  status=200,
+                                  mimetype=NDJSON_MIMETYPE)
+
+    rsp = {
+        "status": "success",
+        "message": msg,
+        "data": data if data is not None else []
+    }
+    return app.response_class(response=stream_with_context(_chunked(_iterencode_json(rsp))),
+                              status=200,
+                              mimetype='application/json')
+
+
+def _iterencode_json(obj):
+    """
+    Encodes obj as json.dumps(obj, cls=AlchemyEncoder) would once its iterators are turned into lists, the iterators
+    it holds, directly or in its dicts, being encoded as lists one row at a time
+    """
+    if isinstance(obj, dict):
+        yield '{'
+        for index, (key, value) in enumerate(obj.items()):
+            # Same key conversion as json.dumps
+            if isinstance(key, (int, float)) or key is None:
+                key = json.dumps(key)
+            elif not isinstance(key, str):
+                raise TypeError(f'keys must be str, int, float, bool or None, not {key.__class__.__name__}')
+
+            yield f'{", " if index else ""}{json.dumps(key)}: '
+            yield from _iterencode_json(value)
+        yield '}'
+
+    elif isinstance(obj, Iterator):
+        yield '['
+        for index, row in enumerate(obj):
+            yield f'{", " if index else ""}{json.dumps(row, cls=AlchemyEncoder)}'
+        yield ']'
+
+    else:
+        yield json.dumps(obj, cls=AlchemyEncoder)
+
+
+def _iterencode_ndjson(msg, data):
+    streams = {}
+    if isinstance(data, Iterator):
+        streams[None] = data
+        data = None
+
+    elif isinstance(data, dict):
+        streams = {key: value for key, value in data.items() if isinstance(value, Iterator)}
+        data = {key: value for key, value in data.items() if key not in streams}
+
+    yield from _iterencode_json({
+        "status": "success",
+        "message": msg,
+        "data": data if data is not None else []
+    })
+    yield '\n'
+
+    for key, rows in streams.items():
+        for row in rows:
+            yield json.dumps(row if key is None else {key: row}, cls=AlchemyEncoder)
+            yield '\n'
+
+
+def _chunked(parts):
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+
+        if size >= STREAM_CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+
+    if buffer:
+        yield ''.join(buffer)
+
+
 def g_db_commit():
     db.session.commit()
 
@@ -363,7 +471,18 @@ def _local_authentication_process(incoming_request: Request):
     return current_user.is_authenticated
 
 
+def _session_is_bound_to(user_email):
+    return (current_user.is_authenticated and current_user.is_active
+            and current_user.email == user_email
+            and 'permissions' in session and 'current_case' in session)
+
+
 def _authenticate_with_email(user_email):
+    # The proxy asserts the identity on every request. The login, and the computation of the permissions, only
+    # happen when the session is established or when the identity changes, as with the local authentication
+    if _session_is_bound_to(user_email):
+        return True
+
     user = get_user(user_email, id_key="email")
     if not user:
         log.error(f'User with email {user_email} is not registered in the IRIS')
@@ -400,36 +519,42 @@ def _oidc_proxy_authentication_process(incoming_request: Request):
         if user_email:
             return _authenticate_with_email(user_email.split(',')[0])
 
-    elif app.config.get("AUTHENTICATION_TOKEN_VERIFY_MODE") == 'introspection':
+        return False
+
+    elif app.config.get("AUTHENTICATION_TOKEN_VERIFY_MODE") not in ('introspection', 'signature'):
+        log.error("ERROR DURING TOKEN INTROSPECTION PROCESS")
+        return False
+
+    if not authentication_token:
+        log.info("USER IS NOT AUTHENTICATED")
+        return False
+
+    # A token verified recently is trusted until it expires, without contacting the authentication server again
+    user_email = get_cached_token_subject(authentication_token)
+    if user_email:
+        return _authenticate_with_email(user_email)
+
+    if app.config.get("AUTHENTICATION_TOKEN_VERIFY_MODE") == 'introspection':
         # Use the authentication server's token introspection endpoint in order to determine if the request is valid /
         # authenticated. The TLS_ROOT_CA is used to validate the authentication server's certificate.
         # The other solution was to skip the certificate verification, BUT as the authentication server might be
         # located on another server, this check is necessary.
+        try:
+            user_email, token_exp = introspect_token(authentication_token)
 
-        introspection_body = {"token": authentication_token}
-        introspection = requests.post(
-            app.config.get("AUTHENTICATION_TOKEN_INTROSPECTION_URL"),
-            auth=HTTPBasicAuth(app.config.get('AUTHENTICATION_CLIENT_ID'), app.config.get('AUTHENTICATION_CLIENT_SECRET')),
-            data=introspection_body,
-            verify=app.config.get("TLS_ROOT_CA")
-        )
-        if introspection.status_code == 200:
-            response_json = introspection.json()
-
-            if response_json.get("active", False) is True:
-                user_email = response_json.get("sub")
-                return _authenticate_with_email(user_email=user_email)
+        except Exception as e:
+            log.error(f"Error during token introspection. {e.__str__()}")
+            return False
 
-            else:
-                log.info("USER IS NOT AUTHENTICATED")
-                return False
+        if not user_email:
+            log.info("USER IS NOT AUTHENTICATED")
+            return False
 
-    elif app.config.get("AUTHENTICATION_TOKEN_VERIFY_MODE") == 'signature':
+    else:
         # Use the JWKS urls provided by the OIDC discovery to fetch the signing keys
         # and check the signature of the token
         try:
-            jwks_client = PyJWKClient(app.config.get("AUTHENTICATION_JWKS_URL"))
-            signing_key = jwks_client.get_signing_key_from_jwt(authentication_token)
+            signing_key = get_signing_key(authentication_token)
 
             try:
 
@@ -451,12 +576,11 @@ def _oidc_proxy_authentication_process(incoming_request: Request):
 
         # Extract the user email
         user_email = data.get("sub")
+        token_exp = data.get("exp")
 
-        return _authenticate_with_email(user_email)
+    cache_verified_token(authentication_token, user_email, token_exp)
 
-    else:
-        log.error("ERROR DURING TOKEN INTROSPECTION PROCESS")
-        return False
+    return _authenticate_with_email(user_email)
 
 
 def not_authenticated_redirection_url(request_url: str):
@@ -554,24 +678,75 @@ def ac_case_requires(*access_level):
     return inner_wrap
 
 
+def _get_socket_access_key(case_id, access_level):
+    return f"{case_id}-{sum(acl.value for acl in access_level)}"
+
+
+def _socket_access_is_cached(access_key):
+    # The socket session is kept by the connection, so the authorization only has to be checked on the first
+    # events, or again when the effective accesses changed or the check is too old
+    socket_access = session.get('socket_access')
+    if not socket_access:
+        return False
+
+    if (socket_access.get('user_id') != session.get('_user_id')
+            or socket_access.get('generation') != ac_get_access_generation()):
+        return False
+
+    checked_at = socket_access['cases'].get(access_key)
+
+    return checked_at is not None and time.time() - checked_at < SOCKET_ACCESS_MAX_AGE
+
+
+def _cache_socket_access(access_key):
+    socket_access = session.get('socket_access')
+    generation = ac_get_access_generation()
+
+    if (not socket_access or socket_access.get('user_id') != session.get('_user_id')
+            or socket_access.get('generation') != generation):
+        socket_access = {
+            'user_id': session.get('_user_id'),
+            'user': current_user.user,
+            'generation': generation,
+            'cases': {}
+        }
+
+    socket_access['cases'][access_key] = time.time()
+    session['socket_access'] = socket_access
+
+
+def get_socket_user_login():
+    """
+    Returns the login of the user of the current socket connection, without loading the user
+    """
+    return session['socket_access']['user']
+
+
 def ac_socket_requires(*access_level):
     def inner_wrap(f):
         @wraps(f)
         def wrap(*args, **kwargs):
+            chan_id = args[0].get('channel') if args and isinstance(args[0], dict) else None
+            if chan_id:
+                case_id = int(chan_id.replace('case-', '').split('-')[0])
+                access_key = _get_socket_access_key(case_id, access_level)
+
+                if _socket_access_is_cached(access_key):
+                    return f(*args, **kwargs)
+
             if not is_user_authenticated(request):
                 return redirect(not_authenticated_redirection_url(request.full_path))
 
             else:
-                chan_id = args[0].get('channel')
-                if chan_id:
-                    case_id = int(chan_id.replace('case-', '').split('-')[0])
-                else:
+                if not chan_id:
                     return ac_return_access_denied(caseid=0)
 
                 access = ac_fast_check_user_has_case_access(current_user.id, case_id, access_level)
                 if not access:
                     return ac_return_access_denied(caseid=case_id)
 
+                _cache_socket_access(access_key)
+
                 return f(*args, **kwargs)
 
         return wrap
@@ -740,28 +915,21 @@ def get_random_suffix(length):
 
 
 def add_obj_history_entry(obj, action, commit=False):
-    if hasattr(obj, 'modification_history'):
-
-        if isinstance(obj.modification_history, dict):
-
-            obj.modification_history.update({
-                datetime.datetime.now().timestamp(): {
-                    'user': current_user.user,
-                    'user_id': current_user.id,
-                    'action': action
-                }
-            })
-
-        else:
+    """
+    Appends a modification entry to the history of a DB object.
+    Entries are stored in the append-only object_history table, so the object row itself is untouched.
+    Objects not yet in database are flushed first, to get their identifier.
+    """
+    state = sa_inspect(obj)
+    if state.identity is None:
+        db.session.add(obj)
+        db.session.flush()
 
-            obj.modification_history = {
-                datetime.datetime.now().timestamp(): {
-                    'user': current_user.user,
-                    'user_id': current_user.id,
-                    'action': action
-                }
-            }
-    flag_modified(obj, "modification_history")
+    add_object_history_entry(object_type=obj.__tablename__,
+                             object_id=state.identity[0],
+                             action=action,
+                             user_name=current_user.user,
+                             user_id=current_user.id)
     if commit:
         db.session.commit()
 
@@ -792,6 +960,31 @@ def file_sha256sum(file_path):
         return sha256_hash.hexdigest().upper()
 
 
+def stream_to_file(stream, file_path, chunk_size=1024 * 1024):
+    """
+    Writes a stream to a file, computing its size and SHA-256 as the bytes are read,
+    so the content is written once and never read back
+
+    Args:
+        stream: readable binary stream
+        file_path: destination of the content
+        chunk_size: number of bytes read at once
+
+    Returns:
+        tuple: size, upper case hex SHA-256
+    """
+    sha256_hash = hashlib.sha256()
+    file_size = 0
+
+    with open(file_path, "wb") as fout:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            sha256_hash.update(chunk)
+            fout.write(chunk)
+            file_size += len(chunk)
+
+    return file_size, sha256_hash.hexdigest().upper()
+
+
 def stream_sha256sum(stream):
 
     return hashlib.sha256(stream).hexdigest().upper()
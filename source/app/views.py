@@ -24,90 +24,56 @@
 
 from app import app
 from app import lm
-from app.blueprints.activities.activities_routes import activities_blueprint
-from app.blueprints.alerts.alerts_routes import alerts_blueprint
-from app.blueprints.api.api_routes import api_blueprint
-from app.blueprints.case.case_routes import case_blueprint
-from app.blueprints.context.context import ctx_blueprint
-# Blueprints
-from app.blueprints.dashboard.dashboard_routes import dashboard_blueprint
-from app.blueprints.datastore.datastore_routes import datastore_blueprint
-from app.blueprints.demo_landing.demo_landing import demo_blueprint
-from app.blueprints.dim_tasks.dim_tasks import dim_tasks_blueprint
-from app.blueprints.filters.filters_routes import saved_filters_blueprint
-from app.blueprints.login.login_routes import login_blueprint
-from app.blueprints.manage.manage_access_control import manage_ac_blueprint
-from app.blueprints.manage.manage_alerts_status_routes import manage_alerts_status_blueprint
-from app.blueprints.manage.manage_analysis_status_routes import manage_anastatus_blueprint
-from app.blueprints.manage.manage_assets import manage_assets_blueprint
-from app.blueprints.manage.manage_assets_type_routes import manage_assets_type_blueprint
-from app.blueprints.manage.manage_attributes_routes import manage_attributes_blueprint
-from app.blueprints.manage.manage_case_classifications import manage_case_classification_blueprint
-from app.blueprints.manage.manage_case_state import manage_case_state_blueprint
-from app.blueprints.manage.manage_evidence_types_route import manage_evidence_types_blueprint
-from app.blueprints.manage.manage_cases_routes import manage_cases_blueprint
-from app.blueprints.manage.manage_customers_routes import manage_customers_blueprint
-from app.blueprints.manage.manage_event_categories_routes import manage_event_cat_blueprint
-from app.blueprints.manage.manage_groups import manage_groups_blueprint
-from app.blueprints.manage.manage_ioc_types_routes import manage_ioc_type_blueprint
-from app.blueprints.manage.manage_modules_routes import manage_modules_blueprint
-from app.blueprints.manage.manage_objects_routes import manage_objects_blueprint
-from app.blueprints.manage.manage_severities_routes import manage_severities_blueprint
-from app.blueprints.manage.manage_srv_settings_routes import manage_srv_settings_blueprint
-from app.blueprints.manage.manage_tags import manage_tags_blueprint
-from app.blueprints.manage.manage_task_status_routes import manage_task_status_blueprint
-from app.blueprints.manage.manage_templates_routes import manage_templates_blueprint
-from app.blueprints.manage.manage_tlps_routes import manage_tlp_type_blueprint
-from app.blueprints.manage.manage_case_templates_routes import manage_case_templates_blueprint
-from app.blueprints.manage.manage_users import manage_users_blueprint
-from app.blueprints.overview.overview_routes import overview_blueprint
-from app.blueprints.profile.profile_routes import profile_blueprint
-from app.blueprints.reports.reports_route import reports_blueprint
-from app.blueprints.search.search_routes import search_blueprint
+from app.iris_engine.utils.import_timing import import_components
 from app.models.authorization import User
 from app.post_init import run_post_init
 
-app.register_blueprint(dashboard_blueprint)
-app.register_blueprint(overview_blueprint)
-app.register_blueprint(login_blueprint)
-app.register_blueprint(profile_blueprint)
-app.register_blueprint(search_blueprint)
-app.register_blueprint(manage_cases_blueprint)
-app.register_blueprint(manage_assets_type_blueprint)
-app.register_blueprint(manage_srv_settings_blueprint)
-app.register_blueprint(manage_users_blueprint)
-app.register_blueprint(manage_templates_blueprint)
-app.register_blueprint(manage_modules_blueprint)
-app.register_blueprint(manage_customers_blueprint)
-app.register_blueprint(manage_anastatus_blueprint)
-app.register_blueprint(manage_ioc_type_blueprint)
-app.register_blueprint(manage_event_cat_blueprint)
-app.register_blueprint(manage_objects_blueprint)
-app.register_blueprint(manage_tlp_type_blueprint)
-app.register_blueprint(manage_case_templates_blueprint)
-app.register_blueprint(manage_task_status_blueprint)
-app.register_blueprint(manage_attributes_blueprint)
-app.register_blueprint(manage_ac_blueprint)
-app.register_blueprint(manage_groups_blueprint)
-app.register_blueprint(manage_case_classification_blueprint)
-app.register_blueprint(manage_alerts_status_blueprint)
-app.register_blueprint(manage_severities_blueprint)
-app.register_blueprint(manage_case_state_blueprint)
-app.register_blueprint(manage_evidence_types_blueprint)
-app.register_blueprint(manage_assets_blueprint)
-app.register_blueprint(manage_tags_blueprint)
-app.register_blueprint(saved_filters_blueprint)
-
-app.register_blueprint(ctx_blueprint)
-app.register_blueprint(case_blueprint)
-app.register_blueprint(reports_blueprint)
-app.register_blueprint(activities_blueprint)
-app.register_blueprint(dim_tasks_blueprint)
-app.register_blueprint(datastore_blueprint)
-app.register_blueprint(alerts_blueprint)
-
-app.register_blueprint(api_blueprint)
-app.register_blueprint(demo_blueprint)
+# Blueprints, in registration order
+BLUEPRINTS = [
+    ('app.blueprints.dashboard.dashboard_routes', 'dashboard_blueprint'),
+    ('app.blueprints.overview.overview_routes', 'overview_blueprint'),
+    ('app.blueprints.login.login_routes', 'login_blueprint'),
+    ('app.blueprints.profile.profile_routes', 'profile_blueprint'),
+    ('app.blueprints.search.search_routes', 'search_blueprint'),
+    ('app.blueprints.manage.manage_cases_routes', 'manage_cases_blueprint'),
+    ('app.blueprints.manage.manage_assets_type_routes', 'manage_assets_type_blueprint'),
+    ('app.blueprints.manage.manage_srv_settings_routes', 'manage_srv_settings_blueprint'),
+    ('app.blueprints.manage.manage_users', 'manage_users_blueprint'),
+    ('app.blueprints.manage.manage_templates_routes', 'manage_templates_blueprint'),
+    ('app.blueprints.manage.manage_modules_routes', 'manage_modules_blueprint'),
+    ('app.blueprints.manage.manage_customers_routes', 'manage_customers_blueprint'),
+    ('app.blueprints.manage.manage_analysis_status_routes', 'manage_anastatus_blueprint'),
+    ('app.blueprints.manage.manage_ioc_types_routes', 'manage_ioc_type_blueprint'),
+    ('app.blueprints.manage.manage_event_categories_routes', 'manage_event_cat_blueprint'),
+    ('app.blueprints.manage.manage_objects_routes', 'manage_objects_blueprint'),
+    ('app.blueprints.manage.manage_tlps_routes', 'manage_tlp_type_blueprint'),
+    ('app.blueprints.manage.manage_case_templates_routes', 'manage_case_templates_blueprint'),
+    ('app.blueprints.manage.manage_task_status_routes', 'manage_task_status_blueprint'),
+    ('app.blueprints.manage.manage_attributes_routes', 'manage_attributes_blueprint'),
+    ('app.blueprints.manage.manage_access_control', 'manage_ac_blueprint'),
+    ('app.blueprints.manage.manage_groups', 'manage_groups_blueprint'),
+    ('app.blueprints.manage.manage_case_classifications', 'manage_case_classification_blueprint'),
+    ('app.blueprints.manage.manage_alerts_status_routes', 'manage_alerts_status_blueprint'),
+    ('app.blueprints.manage.manage_severities_routes', 'manage_severities_blueprint'),
+    ('app.blueprints.manage.manage_case_state', 'manage_case_state_blueprint'),
+    ('app.blueprints.manage.manage_evidence_types_route', 'manage_evidence_types_blueprint'),
+    ('app.blueprints.manage.manage_assets', 'manage_assets_blueprint'),
+    ('app.blueprints.manage.manage_tags', 'manage_tags_blueprint'),
+    ('app.blueprints.filters.filters_routes', 'saved_filters_blueprint'),
+    ('app.blueprints.context.context', 'ctx_blueprint'),
+    ('app.blueprints.case.case_routes', 'case_blueprint'),
+    ('app.blueprints.reports.reports_route', 'reports_blueprint'),
+    ('app.blueprints.activities.activities_routes', 'activities_blueprint'),
+    ('app.blueprints.dim_tasks.dim_tasks', 'dim_tasks_blueprint'),
+    ('app.blueprints.datastore.datastore_routes', 'datastore_blueprint'),
+    ('app.blueprints.alerts.alerts_routes', 'alerts_blueprint'),
+    ('app.blueprints.api.api_routes', 'api_blueprint'),
+    ('app.blueprints.demo_landing.demo_landing', 'demo_blueprint'),
+]
+
+blueprint_modules = import_components('web', [module_name for module_name, _ in BLUEPRINTS])
+for module_name, blueprint_name in BLUEPRINTS:
+    app.register_blueprint(getattr(blueprint_modules[module_name], blueprint_name))
 
 try:
 
@@ -0,0 +1,31 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# Entry point of the Celery worker, loaded instead of the views when IRIS_COMPONENT is set to worker.
+# Only the models and the modules declaring tasks are imported, the blueprints and the UI stack are not.
+from app.iris_engine.utils.import_timing import import_components
+
+WORKER_MODULES = [
+    'app.models.authorization',
+    'app.models.alerts',
+    'app.iris_engine.module_handler.module_handler',
+    'app.iris_engine.tasker.tasks',
+    'app.iris_engine.updater.updater'
+]
+
+import_components('worker', WORKER_MODULES)
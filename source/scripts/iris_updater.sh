@@ -41,6 +41,7 @@ then
   if [ $4 == "worker" ]
   then
     echo "Restarting IRIS worker"
+    export IRIS_COMPONENT=worker
     celery -A app.celery control shutdown
     sleep 2
     exec celery -A app.celery worker -E -B -l INFO
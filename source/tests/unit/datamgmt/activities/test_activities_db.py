@@ -0,0 +1,81 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import base64
+from datetime import datetime
+from unittest import TestCase
+
+from app.datamgmt.activities.activities_db import decode_activities_cursor
+from app.datamgmt.activities.activities_db import encode_activities_cursor
+
+
+def _cursor(raw):
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+class TestActivitiesCursor(TestCase):
+
+    def test_cursor_should_round_trip(self):
+        for activity in [
+            {'activity_date': datetime(2026, 10, 19, 12, 30, 5, 123456), 'id': 42},
+            {'activity_date': datetime(2026, 10, 19), 'id': 1},
+            {'activity_date': datetime(1999, 1, 1, 23, 59, 59), 'id': 2 ** 63 - 1}
+        ]:
+            cursor = encode_activities_cursor(activity)
+
+            self.assertEqual((activity['activity_date'], activity['id']), decode_activities_cursor(cursor))
+
+    def test_cursor_should_be_url_safe(self):
+        cursor = encode_activities_cursor({'activity_date': datetime(2026, 10, 19, 12, 30, 5, 999999),
+                                           'id': 2 ** 40 - 1})
+
+        self.assertNotRegex(cursor, r'[^A-Za-z0-9_=-]')
+
+    def test_decode_cursor_should_reject_malformed_cursors(self):
+        for cursor in [
+            '',
+            '%%%',
+            'not a cursor',
+            'YQ',
+            _cursor(''),
+            _cursor('2026-10-19T12:30:00'),
+            _cursor('2026-10-19T12:30:00|'),
+            _cursor('|42'),
+            _cursor('2026-10-19T12:30:00|42|1'),
+            _cursor('2026-13-19T12:30:00|42'),
+            _cursor('yesterday|42'),
+            _cursor('2026-10-19T12:30:00|forty-two'),
+            _cursor('2026-10-19T12:30:00|4.2'),
+            base64.urlsafe_b64encode(b'\xff\xfe|42').decode()
+        ]:
+            self.assertIsNone(decode_activities_cursor(cursor), cursor)
+
+    def test_decode_cursor_should_reject_tampered_cursors(self):
+        for cursor in [
+            _cursor('2026-10-19T12:30:00|-1'),
+            _cursor(f'2026-10-19T12:30:00|{2 ** 63}'),
+            _cursor('2026-10-19T12:30:00+02:00|42'),
+            _cursor("2026-10-19T12:30:00|42); DROP TABLE user_activity; --")
+        ]:
+            self.assertIsNone(decode_activities_cursor(cursor), cursor)
+
+    def test_decode_cursor_should_accept_edited_but_valid_cursors(self):
+        cursor = encode_activities_cursor({'activity_date': datetime(2026, 10, 19), 'id': 42})
+        edited = _cursor(base64.urlsafe_b64decode(cursor).decode().replace('42', '41'))
+
+        self.assertEqual((datetime(2026, 10, 19), 41), decode_activities_cursor(edited))
@@ -0,0 +1,74 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from collections import namedtuple
+from unittest import TestCase
+
+from app.datamgmt.datastore.datastore_db import build_ds_tree
+
+DsPath = namedtuple('DsPath', ['path_id', 'path_name', 'path_parent_id'])
+DsFile = namedtuple('DsFile', ['file_id', 'file_original_name', 'file_parent_id'])
+
+ROOT = DsPath(1, 'Case 1', None)
+
+
+def _folder(path_id, parent_id):
+    return DsPath(path_id, f'folder {path_id}', parent_id)
+
+
+def _file(file_id, parent_id):
+    return DsFile(file_id, f'file {file_id}', parent_id)
+
+
+class TestBuildDsTree(TestCase):
+
+    def test_build_ds_tree_should_return_root_only_for_empty_datastore(self):
+        tree = build_ds_tree(ROOT, [], [])
+
+        self.assertEqual({'d-1': {'name': 'Case 1', 'type': 'directory', 'children': {}, 'is_root': True}}, tree)
+
+    def test_build_ds_tree_should_nest_folders_and_files(self):
+        tree = build_ds_tree(ROOT, [_folder(2, 1), _folder(3, 2), _folder(4, 1)],
+                             [_file(10, 1), _file(11, 3), _file(12, 3), _file(13, 4)])
+
+        root = tree['d-1']
+        self.assertEqual({'d-2', 'd-4', 'f-10'}, set(root['children']))
+        self.assertEqual({'d-3'}, set(root['children']['d-2']['children']))
+        self.assertEqual({'f-11', 'f-12'}, set(root['children']['d-2']['children']['d-3']['children']))
+        self.assertEqual({'f-13'}, set(root['children']['d-4']['children']))
+
+    def test_build_ds_tree_should_not_depend_on_folders_order(self):
+        folders = [_folder(2, 1), _folder(3, 2), _folder(4, 3)]
+        files = [_file(10, 4)]
+
+        self.assertEqual(build_ds_tree(ROOT, folders, files), build_ds_tree(ROOT, folders[::-1], files))
+
+    def test_build_ds_tree_should_describe_folders_and_files(self):
+        tree = build_ds_tree(ROOT, [_folder(2, 1)], [_file(10, 2)])
+
+        folder = tree['d-1']['children']['d-2']
+        self.assertEqual('folder 2', folder['name'])
+        self.assertEqual('directory', folder['type'])
+        self.assertNotIn('is_root', folder)
+        self.assertEqual({'file_id': 10, 'file_original_name': 'file 10', 'file_parent_id': 2, 'type': 'file'},
+                         folder['children']['f-10'])
+
+    def test_build_ds_tree_should_attach_orphans_to_root(self):
+        tree = build_ds_tree(ROOT, [_folder(2, 99), _folder(3, None)], [_file(10, 98), _file(11, None)])
+
+        self.assertEqual({'d-2', 'd-3', 'f-10', 'f-11'}, set(tree['d-1']['children']))
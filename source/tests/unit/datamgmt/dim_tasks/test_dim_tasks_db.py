@@ -0,0 +1,110 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from datetime import timedelta
+from unittest import TestCase
+
+from app import app
+from app import db
+from app.configuration import CELERY_INTERNAL_TASKS
+from app.datamgmt.dim_tasks.dim_tasks_db import delete_internal_task_results
+from app.datamgmt.dim_tasks.dim_tasks_db import record_dim_task_summary
+from app.iris_engine.tasker.tasks import task_archive_activities
+from app.iris_engine.tasker.tasks import task_archive_dim_tasks
+from app.iris_engine.tasker.tasks import task_refresh_cases_stats
+from app.iris_engine.tasker.tasks import task_summarize_dim_tasks
+from app.models import CeleryTaskMeta
+from app.models import DimTaskSummary
+
+TASK_ID_PREFIX = 'test-dim-tasks-'
+MODULE_TASK = 'app.iris_engine.tasker.tasks.task_hook_wrapper'
+
+
+class TestDimTasksDB(TestCase):
+
+    def setUp(self) -> None:
+        self._context = app.app_context()
+        self._context.push()
+        self._delete_test_rows()
+
+    def tearDown(self) -> None:
+        self._delete_test_rows()
+        self._context.pop()
+
+    @staticmethod
+    def _delete_test_rows():
+        CeleryTaskMeta.query.filter(
+            CeleryTaskMeta.task_id.like(f'{TASK_ID_PREFIX}%')
+        ).delete(synchronize_session=False)
+        DimTaskSummary.query.filter(
+            DimTaskSummary.task_id.like(f'{TASK_ID_PREFIX}%')
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+    @staticmethod
+    def _add_result(index, name, age_days, status='SUCCESS'):
+        db.session.add(CeleryTaskMeta(
+            task_id=f'{TASK_ID_PREFIX}{index}',
+            name=name,
+            status=status,
+            date_done=datetime.utcnow() - timedelta(days=age_days)
+        ))
+        db.session.commit()
+
+    @staticmethod
+    def _remaining_results():
+        return sorted(task_id for task_id, in CeleryTaskMeta.query.with_entities(
+            CeleryTaskMeta.task_id
+        ).filter(
+            CeleryTaskMeta.task_id.like(f'{TASK_ID_PREFIX}%')
+        ).all())
+
+    def test_internal_tasks_should_not_store_results(self):
+        for task in (task_refresh_cases_stats, task_archive_activities, task_summarize_dim_tasks,
+                     task_archive_dim_tasks):
+            self.assertIn(task.name, CELERY_INTERNAL_TASKS)
+            self.assertTrue(task.ignore_result, task.name)
+
+    def test_record_dim_task_summary_should_skip_internal_tasks(self):
+        record_dim_task_summary(task_id=f'{TASK_ID_PREFIX}1', name=CELERY_INTERNAL_TASKS[0], kwargs={},
+                                state='SUCCESS', result=1)
+
+        self.assertIsNone(DimTaskSummary.query.filter(DimTaskSummary.task_id == f'{TASK_ID_PREFIX}1').first())
+
+    def test_delete_internal_task_results_should_delete_expired_internal_results_only(self):
+        self._add_result(1, CELERY_INTERNAL_TASKS[0], age_days=10)
+        self._add_result(2, CELERY_INTERNAL_TASKS[1], age_days=10, status='FAILURE')
+        self._add_result(3, CELERY_INTERNAL_TASKS[2], age_days=1)
+        self._add_result(4, CELERY_INTERNAL_TASKS[3], age_days=10, status='STARTED')
+        self._add_result(5, MODULE_TASK, age_days=10)
+
+        self.assertEqual(2, delete_internal_task_results(retention_days=7))
+
+        self.assertEqual([f'{TASK_ID_PREFIX}3', f'{TASK_ID_PREFIX}4', f'{TASK_ID_PREFIX}5'],
+                         self._remaining_results())
+
+    def test_delete_internal_task_results_without_retention_should_delete_all_completed_ones(self):
+        self._add_result(1, CELERY_INTERNAL_TASKS[0], age_days=0)
+        self._add_result(2, CELERY_INTERNAL_TASKS[2], age_days=10)
+        self._add_result(3, CELERY_INTERNAL_TASKS[3], age_days=0, status='STARTED')
+        self._add_result(4, MODULE_TASK, age_days=10)
+
+        self.assertEqual(2, delete_internal_task_results())
+
+        self.assertEqual([f'{TASK_ID_PREFIX}3', f'{TASK_ID_PREFIX}4'], self._remaining_results())
@@ -0,0 +1,139 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from collections import namedtuple
+from datetime import datetime
+from unittest import TestCase
+
+from app.iris_engine.utils.case_graph import CaseGraphBuilder
+
+AssetLink = namedtuple('AssetLink', ['event_id', 'event_title', 'event_date', 'asset_id', 'asset_name',
+                                     'asset_description', 'asset_ip', 'asset_compromise_status_id',
+                                     'asset_icon_compromised', 'asset_icon_not_compromised'])
+IocLink = namedtuple('IocLink', ['event_id', 'event_title', 'event_date', 'ioc_id', 'ioc_value', 'ioc_description'])
+
+EVENT_DATE = datetime(2026, 10, 19, 12, 30)
+
+
+def _asset(event_id, asset_id, compromised=False, event_date=EVENT_DATE):
+    return AssetLink(event_id, f'event {event_id}', event_date, asset_id, f'asset {asset_id}', 'description',
+                     '10.0.0.1' if asset_id % 2 else None, 1 if compromised else 2,
+                     'compromised.png', 'not_compromised.png')
+
+
+def _ioc(event_id, ioc_id, event_date=EVENT_DATE):
+    return IocLink(event_id, f'event {event_id}', event_date, ioc_id, f'ioc {ioc_id}', 'description')
+
+
+def _build(links, **kwargs):
+    builder = CaseGraphBuilder(**kwargs)
+    for link in links:
+        builder.add_link(link)
+
+    return builder.build()
+
+
+def _edges(graph):
+    return {frozenset((edge['from'], edge['to'])): edge for edge in graph['edges']}
+
+
+class TestCaseGraphBuilder(TestCase):
+
+    def test_build_should_return_empty_graph_without_links(self):
+        self.assertEqual({'nodes': [], 'edges': [], 'dates': {'human': [], 'machine': []}}, _build([]))
+
+    def test_add_link_should_create_one_node_per_object(self):
+        graph = _build([_asset(1, 1, compromised=True), _asset(2, 1), _asset(2, 2), _ioc(2, 1)])
+
+        nodes = {node['id']: node for node in graph['nodes']}
+        self.assertEqual({'a1', 'a2', 'b1'}, set(nodes))
+        self.assertEqual('/static/assets/img/graph/compromised.png', nodes['a1']['image'])
+        self.assertEqual('/static/assets/img/graph/not_compromised.png', nodes['a2']['image'])
+        self.assertEqual('/static/assets/img/graph/virus-covid-solid.png', nodes['b1']['image'])
+        self.assertEqual('10.0.0.1 -description', nodes['a1']['title'])
+        self.assertEqual('description', nodes['a2']['title'])
+        self.assertNotIn('font', nodes['a1'])
+
+    def test_add_link_should_set_font_in_dark_mode(self):
+        graph = _build([_asset(1, 1)], dark_mode=True)
+
+        self.assertEqual('12px verdana white', graph['nodes'][0]['font'])
+
+    def test_add_link_should_collect_dates_once(self):
+        graph = _build([_asset(1, 1), _asset(2, 2), _ioc(3, 1, event_date=datetime(2026, 10, 20)),
+                        _ioc(4, 2, event_date=None)])
+
+        self.assertEqual(['19-10-2026', '20-10-2026'], graph['dates']['human'])
+        self.assertEqual([datetime.timestamp(EVENT_DATE), datetime.timestamp(datetime(2026, 10, 20))],
+                         graph['dates']['machine'])
+
+    def test_build_should_link_assets_and_iocs_of_an_event(self):
+        graph = _build([_asset(1, 1), _asset(1, 2), _ioc(1, 1), _ioc(1, 2)])
+
+        edges = _edges(graph)
+        self.assertEqual({frozenset(('a1', 'a2')), frozenset(('a1', 'b1')), frozenset(('a1', 'b2')),
+                          frozenset(('a2', 'b1')), frozenset(('a2', 'b2'))}, set(edges))
+        self.assertFalse(edges[frozenset(('a1', 'a2'))]['dashes'])
+        self.assertTrue(edges[frozenset(('a1', 'b1'))]['dashes'])
+
+    def test_build_should_link_iocs_only_when_alone_in_event(self):
+        graph = _build([_ioc(1, 1), _ioc(1, 2), _ioc(2, 3), _ioc(2, 4), _ioc(2, 5)])
+
+        self.assertEqual({frozenset(('b1', 'b2'))}, set(_edges(graph)))
+
+    def test_build_should_aggregate_edges_of_several_events(self):
+        graph = _build([_asset(1, 1), _asset(1, 2), _asset(2, 2), _asset(2, 1), _asset(3, 1), _asset(3, 2)])
+
+        self.assertEqual(1, len(graph['edges']))
+        edge = graph['edges'][0]
+        self.assertEqual(3, edge['value'])
+        self.assertEqual('2026-10-19 12:30:00 - event 1 (+2 other events)', edge['title'])
+
+    def test_build_should_aggregate_edges_whatever_the_links_order(self):
+        graph = _build([_asset(1, 1), _ioc(1, 1), _ioc(2, 1), _asset(2, 1)])
+
+        self.assertEqual(1, len(graph['edges']))
+        self.assertEqual(2, graph['edges'][0]['value'])
+        self.assertTrue(graph['edges'][0]['dashes'])
+
+    def test_build_should_link_large_events_as_a_star(self):
+        links = [_ioc(1, 1)] + [_asset(1, asset_id) for asset_id in range(1, 11)]
+
+        graph = _build(links, max_event_edges=20)
+
+        edges = _edges(graph)
+        self.assertEqual(10, len(edges))
+        self.assertTrue(all('a1' in pair for pair in edges))
+
+    def test_build_should_link_large_events_without_asset_around_the_first_ioc(self):
+        graph = _build([_ioc(1, 1), _ioc(1, 2)], max_event_edges=0)
+
+        self.assertEqual({frozenset(('b1', 'b2'))}, set(_edges(graph)))
+
+    def test_build_should_not_exceed_max_event_edges_in_full_mesh(self):
+        links = [_asset(1, asset_id) for asset_id in range(1, 6)]
+
+        self.assertEqual(10, len(_build(links, max_event_edges=10)['edges']))
+        self.assertEqual(4, len(_build(links, max_event_edges=9)['edges']))
+
+    def test_build_should_be_repeatable(self):
+        builder = CaseGraphBuilder()
+        for link in [_asset(1, 1), _asset(1, 2), _asset(2, 1), _asset(2, 2)]:
+            builder.add_link(link)
+
+        self.assertEqual(builder.build(), builder.build())
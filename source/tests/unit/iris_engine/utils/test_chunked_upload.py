@@ -0,0 +1,245 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import hashlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from app import app
+from app.iris_engine.utils.chunked_upload import chunked_upload_append
+from app.iris_engine.utils.chunked_upload import chunked_upload_discard
+from app.iris_engine.utils.chunked_upload import chunked_upload_finalize
+from app.iris_engine.utils.chunked_upload import chunked_upload_get
+from app.iris_engine.utils.chunked_upload import chunked_upload_init
+from app.iris_engine.utils.chunked_upload import chunked_upload_purge_stale
+from app.iris_engine.utils.chunked_upload import chunked_upload_received_chunks
+
+CHUNK_SIZE = 16
+CONTENT = bytes(range(256))[:40]
+UPLOAD_ID = 'upload-0001'
+
+
+class TestChunkedUpload(TestCase):
+
+    def setUp(self) -> None:
+        self._assembly_dir = tempfile.TemporaryDirectory()
+        self._config = patch.dict(app.config, {
+            'CHUNKED_UPLOADS_PATH': self._assembly_dir.name,
+            'CHUNKED_UPLOADS_MAX_CHUNK_SIZE': CHUNK_SIZE,
+            'CHUNKED_UPLOADS_MAX_AGE': 3600,
+            'DROPZONE_MAX_FILE_SIZE': 1024
+        })
+        self._config.start()
+
+    def tearDown(self) -> None:
+        self._config.stop()
+        self._assembly_dir.cleanup()
+
+    def _init(self, upload_id=UPLOAD_ID, file_size=len(CONTENT), chunk_size=CHUNK_SIZE, case_id=1, user_id=1):
+        return chunked_upload_init(upload_id, 'evidence.bin', file_size, chunk_size, case_id, user_id)
+
+    @staticmethod
+    def _chunk(index, content=CONTENT):
+        return io.BytesIO(content[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE])
+
+    def _upload(self, content=CONTENT, order=None):
+        has_error, meta = self._init(file_size=len(content))
+        self.assertFalse(has_error, meta)
+
+        for index in order if order is not None else range(meta['chunk_count']):
+            has_error, received = chunked_upload_append(meta, index, self._chunk(index, content))
+            self.assertFalse(has_error, received)
+
+        return meta
+
+    # INIT
+    def test_init_should_describe_the_upload(self):
+        has_error, meta = self._init()
+
+        self.assertFalse(has_error)
+        self.assertEqual(3, meta['chunk_count'])
+        self.assertEqual([], meta['received_chunks'])
+        self.assertEqual(len(CONTENT), os.path.getsize(Path(self._assembly_dir.name) / UPLOAD_ID / 'data'))
+
+    def test_init_should_count_one_chunk_for_empty_file(self):
+        has_error, meta = self._init(file_size=0)
+
+        self.assertFalse(has_error)
+        self.assertEqual(1, meta['chunk_count'])
+
+    def test_init_should_reject_invalid_upload_ids(self):
+        for upload_id in (None, '', 'short', '../../etc/passwd', 'upload id', 'a' * 65, 'upload/0001'):
+            has_error, message = self._init(upload_id=upload_id)
+
+            self.assertTrue(has_error, upload_id)
+            self.assertEqual('Invalid upload ID', message)
+
+    def test_init_should_reject_invalid_sizes(self):
+        for file_size, chunk_size in ((-1, CHUNK_SIZE), (10, 0), (10, -1), (10, CHUNK_SIZE + 1)):
+            has_error, message = self._init(file_size=file_size, chunk_size=chunk_size)
+
+            self.assertTrue(has_error)
+            self.assertEqual('Invalid file or chunk size', message)
+
+        has_error, message = self._init(file_size=1025)
+        self.assertTrue(has_error)
+        self.assertEqual('File too big', message)
+
+    def test_init_again_should_resume_the_upload(self):
+        has_error, meta = self._init()
+        chunked_upload_append(meta, 1, self._chunk(1))
+
+        has_error, meta = self._init()
+
+        self.assertFalse(has_error)
+        self.assertEqual([1], meta['received_chunks'])
+
+    def test_init_again_should_reject_other_parameters_or_owner(self):
+        self._init()
+
+        for kwargs in ({'file_size': len(CONTENT) + 1}, {'chunk_size': CHUNK_SIZE - 1}, {'case_id': 2},
+                       {'user_id': 2}):
+            has_error, message = self._init(**kwargs)
+
+            self.assertTrue(has_error, kwargs)
+            self.assertEqual('Upload ID already in use', message)
+
+    # GET
+    def test_get_should_only_return_the_upload_to_its_owner(self):
+        self._init()
+
+        self.assertIsNotNone(chunked_upload_get(UPLOAD_ID, 1, 1))
+        self.assertIsNone(chunked_upload_get(UPLOAD_ID, 2, 1))
+        self.assertIsNone(chunked_upload_get(UPLOAD_ID, 1, 2))
+        self.assertIsNone(chunked_upload_get('unknown-upload', 1, 1))
+        self.assertIsNone(chunked_upload_get('../' + UPLOAD_ID, 1, 1))
+
+    # APPEND AND FINALIZE
+    def test_upload_should_assemble_chunks_in_order(self):
+        meta = self._upload()
+
+        has_error, (data_file, size, file_hash) = chunked_upload_finalize(meta)
+
+        self.assertFalse(has_error)
+        self.assertEqual(CONTENT, Path(data_file).read_bytes())
+        self.assertEqual(len(CONTENT), size)
+        self.assertEqual(hashlib.sha256(CONTENT).hexdigest().upper(), file_hash)
+
+    def test_upload_should_assemble_chunks_out_of_order_and_sent_again(self):
+        meta = self._upload(order=[2, 0, 2, 1, 0])
+
+        has_error, (data_file, _, _) = chunked_upload_finalize(meta, hashlib.sha256(CONTENT).hexdigest())
+
+        self.assertFalse(has_error)
+        self.assertEqual(CONTENT, Path(data_file).read_bytes())
+        self.assertEqual([0, 1, 2], chunked_upload_received_chunks(UPLOAD_ID))
+
+    def test_upload_should_accept_empty_file(self):
+        meta = self._upload(content=b'')
+
+        has_error, (data_file, size, file_hash) = chunked_upload_finalize(meta)
+
+        self.assertFalse(has_error)
+        self.assertEqual(0, size)
+        self.assertEqual(hashlib.sha256(b'').hexdigest().upper(), file_hash)
+
+    def test_append_should_return_received_chunks_count(self):
+        _, meta = self._init()
+
+        self.assertEqual((False, 1), chunked_upload_append(meta, 2, self._chunk(2)))
+        self.assertEqual((False, 2), chunked_upload_append(meta, 0, self._chunk(0)))
+
+    def test_append_should_reject_invalid_index(self):
+        _, meta = self._init()
+
+        for index in (-1, 3):
+            self.assertEqual((True, 'Invalid chunk index'), chunked_upload_append(meta, index, self._chunk(0)))
+
+    def test_append_should_reject_chunk_of_wrong_size(self):
+        _, meta = self._init()
+
+        self.assertEqual((True, 'Chunk bigger than expected'),
+                         chunked_upload_append(meta, 2, io.BytesIO(CONTENT[:CHUNK_SIZE])))
+        self.assertEqual((True, f'Chunk size mismatch, expected {CHUNK_SIZE} bytes, got 3'),
+                         chunked_upload_append(meta, 0, io.BytesIO(b'abc')))
+        self.assertEqual([], chunked_upload_received_chunks(UPLOAD_ID))
+
+    def test_append_should_check_chunk_checksum(self):
+        _, meta = self._init()
+        chunk = CONTENT[:CHUNK_SIZE]
+
+        self.assertEqual((True, 'Chunk checksum mismatch'),
+                         chunked_upload_append(meta, 0, io.BytesIO(chunk), hashlib.sha256(b'other').hexdigest()))
+        self.assertEqual([], chunked_upload_received_chunks(UPLOAD_ID))
+
+        self.assertEqual((False, 1),
+                         chunked_upload_append(meta, 0, io.BytesIO(chunk), hashlib.sha256(chunk).hexdigest().upper()))
+
+    def test_append_again_should_drop_the_chunk_until_it_is_valid(self):
+        _, meta = self._init()
+        chunked_upload_append(meta, 0, self._chunk(0))
+
+        chunked_upload_append(meta, 0, io.BytesIO(b'abc'))
+
+        self.assertEqual([], chunked_upload_received_chunks(UPLOAD_ID))
+
+    def test_finalize_should_report_missing_chunks(self):
+        meta = self._upload(order=[1])
+
+        self.assertEqual((True, '2 chunks are missing'), chunked_upload_finalize(meta))
+
+    def test_finalize_should_check_file_checksum(self):
+        meta = self._upload()
+
+        self.assertEqual((True, 'File checksum mismatch'),
+                         chunked_upload_finalize(meta, hashlib.sha256(b'other').hexdigest()))
+
+    # PURGE AND DISCARD
+    def test_purge_should_only_delete_stale_uploads(self):
+        self._init()
+        self._init(upload_id='upload-0002')
+
+        stale_time = time.time() - 7200
+        os.utime(Path(self._assembly_dir.name) / 'upload-0002', (stale_time, stale_time))
+
+        self.assertEqual(1, chunked_upload_purge_stale())
+        self.assertIsNotNone(chunked_upload_get(UPLOAD_ID, 1, 1))
+        self.assertIsNone(chunked_upload_get('upload-0002', 1, 1))
+
+    def test_append_should_keep_the_upload_from_being_purged(self):
+        _, meta = self._init()
+        stale_time = time.time() - 7200
+        os.utime(Path(self._assembly_dir.name) / UPLOAD_ID, (stale_time, stale_time))
+
+        chunked_upload_append(meta, 0, self._chunk(0))
+
+        self.assertEqual(0, chunked_upload_purge_stale())
+
+    def test_discard_should_delete_the_upload(self):
+        self._init()
+
+        chunked_upload_discard(UPLOAD_ID)
+        chunked_upload_discard('../' + UPLOAD_ID)
+
+        self.assertIsNone(chunked_upload_get(UPLOAD_ID, 1, 1))
+        self.assertEqual([], os.listdir(self._assembly_dir.name))
@@ -0,0 +1,226 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+import app
+from app.iris_engine.utils import collab
+from app.iris_engine.utils.collab import _merge_deltas
+from app.iris_engine.utils.collab import _parse_delta
+from app.iris_engine.utils.collab import collab_clear_document
+from app.iris_engine.utils.collab import collab_get_snapshot
+from app.iris_engine.utils.collab import collab_mark_saved
+from app.iris_engine.utils.collab import collab_push_delta
+
+
+def _delta(action, start, end, lines):
+    return {
+        'action': action,
+        'start': {'row': start[0], 'column': start[1]},
+        'end': {'row': end[0], 'column': end[1]},
+        'lines': lines
+    }
+
+
+class TestParseDelta(TestCase):
+
+    def test_parse_delta_should_accept_ace_delta_object(self):
+        delta = _delta('insert', (0, 0), (0, 1), ['a'])
+
+        self.assertEqual(delta, _parse_delta(delta))
+
+    def test_parse_delta_should_accept_ace_delta_json(self):
+        delta = _delta('remove', (2, 4), (3, 0), ['end', ''])
+
+        self.assertEqual(delta, _parse_delta(json.dumps(delta)))
+
+    def test_parse_delta_should_normalize_positions_and_lines(self):
+        parsed = _parse_delta({
+            'action': 'insert',
+            'start': {'row': '1', 'column': 2},
+            'end': {'row': 1, 'column': '3'},
+            'lines': [4],
+            'id': 12
+        })
+
+        self.assertEqual(_delta('insert', (1, 2), (1, 3), ['4']), parsed)
+
+    def test_parse_delta_should_reject_malformed_deltas(self):
+        malformed = [
+            None,
+            42,
+            'not json',
+            '["insert"]',
+            [],
+            {},
+            _delta('replace', (0, 0), (0, 1), ['a']),
+            {'action': 'insert', 'start': {'row': 0, 'column': 0}, 'lines': ['a']},
+            {'action': 'insert', 'start': {'row': 0}, 'end': {'row': 0, 'column': 1}, 'lines': ['a']},
+            _delta('insert', ('x', 0), (0, 1), ['a']),
+            _delta('insert', (None, 0), (0, 1), ['a']),
+            _delta('insert', (0, 0), (0, 1), 5),
+            _delta('insert', (0, 0), (0, 1), None)
+        ]
+
+        for delta in malformed:
+            self.assertIsNone(_parse_delta(delta), delta)
+
+
+class TestMergeDeltas(TestCase):
+
+    def test_merge_deltas_should_merge_consecutive_typing(self):
+        merged = _merge_deltas(_delta('insert', (0, 0), (0, 1), ['a']),
+                               _delta('insert', (0, 1), (0, 2), ['b']))
+
+        self.assertEqual(_delta('insert', (0, 0), (0, 2), ['ab']), merged)
+
+    def test_merge_deltas_should_merge_typing_over_new_lines(self):
+        merged = _merge_deltas(_delta('insert', (0, 0), (0, 2), ['ab']),
+                               _delta('insert', (0, 2), (1, 0), ['', '']))
+        merged = _merge_deltas(merged, _delta('insert', (1, 0), (1, 1), ['c']))
+
+        self.assertEqual(_delta('insert', (0, 0), (1, 1), ['ab', 'c']), merged)
+
+    def test_merge_deltas_should_merge_consecutive_backspaces(self):
+        merged = _merge_deltas(_delta('remove', (0, 2), (0, 3), ['c']),
+                               _delta('remove', (0, 1), (0, 2), ['b']))
+
+        self.assertEqual(_delta('remove', (0, 1), (0, 3), ['bc']), merged)
+
+    def test_merge_deltas_should_merge_backspaces_over_new_lines(self):
+        merged = _merge_deltas(_delta('remove', (1, 0), (1, 1), ['c']),
+                               _delta('remove', (0, 2), (1, 0), ['', '']))
+
+        self.assertEqual(_delta('remove', (0, 2), (1, 1), ['', 'c']), merged)
+
+    def test_merge_deltas_should_reject_non_contiguous_deltas(self):
+        not_contiguous = [
+            (_delta('insert', (0, 0), (0, 1), ['a']), _delta('insert', (0, 5), (0, 6), ['b'])),
+            (_delta('insert', (0, 1), (0, 2), ['b']), _delta('insert', (0, 0), (0, 1), ['a'])),
+            (_delta('remove', (0, 2), (0, 3), ['c']), _delta('remove', (0, 3), (0, 4), ['d'])),
+            (_delta('remove', (0, 1), (0, 2), ['b']), _delta('remove', (0, 1), (0, 2), ['c'])),
+            (_delta('remove', (4, 0), (4, 1), ['x']), _delta('remove', (0, 0), (0, 1), ['y']))
+        ]
+
+        for previous, delta in not_contiguous:
+            self.assertIsNone(_merge_deltas(previous, delta), (previous, delta))
+
+    def test_merge_deltas_should_reject_different_actions(self):
+        self.assertIsNone(_merge_deltas(_delta('insert', (0, 0), (0, 1), ['a']),
+                                        _delta('remove', (0, 0), (0, 1), ['a'])))
+        self.assertIsNone(_merge_deltas(_delta('remove', (0, 1), (0, 2), ['b']),
+                                        _delta('insert', (0, 1), (0, 2), ['b'])))
+
+
+@patch.dict(app.app.config, {'COLLAB_COALESCE_WINDOW': 0})
+@patch.object(app.socket_io, 'emit')
+class TestCollabDocuments(TestCase):
+
+    def setUp(self) -> None:
+        collab._collab_documents.clear()
+        collab._collab_seq_floors.clear()
+        collab._collab_seq_floor = 0
+
+    def tearDown(self) -> None:
+        collab._collab_documents.clear()
+        collab._collab_seq_floors.clear()
+        collab._collab_seq_floor = 0
+
+    def test_push_delta_should_broadcast_numbered_changes(self, emit):
+        self.assertTrue(collab_push_delta('change-note', 'case-1-notes', 1,
+                                          _delta('insert', (0, 0), (0, 1), ['a']), 'sid-1', 'user'))
+        self.assertTrue(collab_push_delta('change-note', 'case-1-notes', 1,
+                                          _delta('insert', (0, 1), (0, 2), ['b']), 'sid-1', 'user'))
+
+        self.assertEqual([1, 2], [call.args[1]['seq'] for call in emit.call_args_list])
+
+        snapshot = collab_get_snapshot('change-note', 'case-1-notes', 1)
+        self.assertEqual(2, snapshot['seq'])
+        self.assertTrue(snapshot['complete'])
+        self.assertEqual(2, len(snapshot['changes']))
+
+    def test_push_delta_should_reject_malformed_delta(self, emit):
+        self.assertFalse(collab_push_delta('change-note', 'case-1-notes', 1, 'not json', 'sid-1', 'user'))
+
+        emit.assert_not_called()
+        self.assertEqual({}, collab._collab_documents)
+
+    def test_mark_saved_should_drop_the_document(self, emit):
+        collab_push_delta('change-note', 'case-1-notes', 1, _delta('insert', (0, 0), (0, 1), ['a']), 'sid-1', 'user')
+
+        collab_mark_saved('change-note', 'case-1-notes', 1)
+
+        self.assertEqual({}, collab._collab_documents)
+
+    def test_clear_document_should_drop_the_document(self, emit):
+        collab_push_delta('change-note', 'case-1-notes', 1, _delta('insert', (0, 0), (0, 1), ['a']), 'sid-1', 'user')
+
+        collab_clear_document('change-note', 'case-1-notes', 1)
+
+        self.assertEqual({}, collab._collab_documents)
+
+    def test_snapshot_should_not_create_a_document(self, emit):
+        snapshot = collab_get_snapshot('change-note', 'case-1-notes', 1)
+
+        self.assertEqual([], snapshot['changes'])
+        self.assertTrue(snapshot['complete'])
+        self.assertEqual({}, collab._collab_documents)
+
+    def test_document_created_again_should_not_go_back_in_seq(self, emit):
+        for column in range(3):
+            collab_push_delta('change-note', 'case-1-notes', 1,
+                              _delta('insert', (0, column), (0, column + 1), ['a']), f'sid-{column}', 'user')
+
+        seq = collab_get_snapshot('change-note', 'case-1-notes', 1)['seq']
+        collab_mark_saved('change-note', 'case-1-notes', 1)
+
+        self.assertGreaterEqual(collab_get_snapshot('change-note', 'case-1-notes', 1)['seq'], seq)
+
+        collab_push_delta('change-note', 'case-1-notes', 1, _delta('insert', (0, 3), (0, 4), ['b']), 'sid-1', 'user')
+        self.assertGreater(emit.call_args.args[1]['seq'], seq)
+
+    def test_document_created_again_should_continue_its_own_seq(self, emit):
+        for column in range(3):
+            collab_push_delta('change-note', 'case-1-notes', 1,
+                              _delta('insert', (0, column), (0, column + 1), ['a']), f'sid-{column}', 'user')
+        collab_mark_saved('change-note', 'case-1-notes', 1)
+
+        collab_push_delta('change-note', 'case-1-notes', 2, _delta('insert', (0, 0), (0, 1), ['b']), 'sid-1', 'user')
+        collab_mark_saved('change-note', 'case-1-notes', 2)
+
+        self.assertEqual(3, collab_get_snapshot('change-note', 'case-1-notes', 1)['seq'])
+        self.assertEqual(1, collab_get_snapshot('change-note', 'case-1-notes', 2)['seq'])
+
+        collab_push_delta('change-note', 'case-1-notes', 2, _delta('insert', (0, 1), (0, 2), ['b']), 'sid-1', 'user')
+        self.assertEqual(2, emit.call_args.args[1]['seq'])
+
+    def test_forgotten_seq_floors_should_not_go_back_in_seq(self, emit):
+        with patch.object(collab, 'COLLAB_MAX_SEQ_FLOORS', 1):
+            for column in range(3):
+                collab_push_delta('change-note', 'case-1-notes', 1,
+                                  _delta('insert', (0, column), (0, column + 1), ['a']), f'sid-{column}', 'user')
+            collab_mark_saved('change-note', 'case-1-notes', 1)
+
+            collab_push_delta('change-note', 'case-1-notes', 2,
+                              _delta('insert', (0, 0), (0, 1), ['b']), 'sid-1', 'user')
+            collab_mark_saved('change-note', 'case-1-notes', 2)
+
+        self.assertEqual([('change-note', 'case-1-notes', 2)], list(collab._collab_seq_floors))
+        self.assertEqual(3, collab_get_snapshot('change-note', 'case-1-notes', 1)['seq'])
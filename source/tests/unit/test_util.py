@@ -0,0 +1,141 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import datetime
+import json
+import uuid
+from unittest import TestCase
+
+from app.util import AlchemyEncoder
+from app.util import STREAM_CHUNK_SIZE
+from app.util import _chunked
+from app.util import _iterencode_json
+from app.util import _iterencode_ndjson
+
+
+def _rows():
+    return [
+        {'ioc_id': 1, 'ioc_value': 'evil.com', 'ioc_date': datetime.datetime(2026, 10, 19, 12, 30)},
+        {'ioc_id': 2, 'ioc_value': 'café "quoted"', 'ioc_uuid': uuid.UUID(int=2)},
+        {'ioc_id': 3, 'ioc_value': None, 'tags': ['a', 'b']}
+    ]
+
+
+class TestIterencodeJson(TestCase):
+
+    def assert_same_as_dumps(self, streamed, materialized):
+        self.assertEqual(json.dumps(materialized, cls=AlchemyEncoder), ''.join(_iterencode_json(streamed)))
+
+    def test_iterencode_json_should_match_dumps_on_plain_values(self):
+        for value in ('text', 1, 1.5, True, None, [1, 'a'], (1, 2), {}, datetime.date(2026, 10, 19)):
+            self.assert_same_as_dumps(value, value)
+
+    def test_iterencode_json_should_match_dumps_on_response_with_iterator(self):
+        self.assert_same_as_dumps(
+            {'status': 'success', 'message': '', 'data': iter(_rows())},
+            {'status': 'success', 'message': '', 'data': _rows()}
+        )
+
+    def test_iterencode_json_should_match_dumps_on_nested_dicts(self):
+        self.assert_same_as_dumps(
+            {'status': 'success', 'data': {'tim': (row for row in _rows()), 'state': {'object_state': 3},
+                                           'nested': {'deeper': {'rows': iter(_rows())}}}},
+            {'status': 'success', 'data': {'tim': _rows(), 'state': {'object_state': 3},
+                                           'nested': {'deeper': {'rows': _rows()}}}}
+        )
+
+    def test_iterencode_json_should_keep_keys_order(self):
+        streamed = ''.join(_iterencode_json({'tim': iter([]), 'comments_map': {}, 'state': None}))
+
+        self.assertEqual(['tim', 'comments_map', 'state'], list(json.loads(streamed).keys()))
+
+    def test_iterencode_json_should_convert_non_str_keys_as_dumps(self):
+        self.assert_same_as_dumps(
+            {7: 'int', 2.5: 'float', True: 'bool', None: 'null', 'str': {3: iter([{4: 'row'}])}},
+            {7: 'int', 2.5: 'float', True: 'bool', None: 'null', 'str': {3: [{4: 'row'}]}}
+        )
+
+    def test_iterencode_json_should_reject_keys_dumps_rejects(self):
+        with self.assertRaises(TypeError):
+            json.dumps({(1, 2): 'tuple'}, cls=AlchemyEncoder)
+
+        with self.assertRaises(TypeError):
+            ''.join(_iterencode_json({(1, 2): 'tuple'}))
+
+    def test_iterencode_json_should_encode_empty_iterators_as_empty_lists(self):
+        self.assert_same_as_dumps(iter([]), [])
+        self.assert_same_as_dumps({'data': (row for row in [])}, {'data': []})
+        self.assert_same_as_dumps({'a': iter([]), 'b': iter([])}, {'a': [], 'b': []})
+
+
+class TestIterencodeNdjson(TestCase):
+
+    @staticmethod
+    def read_lines(parts):
+        text = ''.join(parts)
+        return text, [json.loads(line) for line in text.split('\n')[:-1]]
+
+    def test_iterencode_ndjson_should_send_one_line_per_row_of_iterator(self):
+        text, lines = self.read_lines(_iterencode_ndjson('ok', iter(_rows())))
+
+        self.assertTrue(text.endswith('\n'))
+        self.assertEqual({'status': 'success', 'message': 'ok', 'data': []}, lines[0])
+        self.assertEqual(json.loads(json.dumps(_rows(), cls=AlchemyEncoder)), lines[1:])
+
+    def test_iterencode_ndjson_should_key_the_rows_of_dict_iterators(self):
+        text, lines = self.read_lines(_iterencode_ndjson('ok', {
+            'tim': iter(_rows()[:2]),
+            'state': {'object_state': 3},
+            'assets': iter(_rows()[2:])
+        }))
+
+        self.assertEqual({'status': 'success', 'message': 'ok', 'data': {'state': {'object_state': 3}}}, lines[0])
+
+        rows = json.loads(json.dumps(_rows(), cls=AlchemyEncoder))
+        self.assertEqual([{'tim': rows[0]}, {'tim': rows[1]}, {'assets': rows[2]}], lines[1:])
+
+    def test_iterencode_ndjson_should_send_header_only_for_empty_iterators(self):
+        text, lines = self.read_lines(_iterencode_ndjson('ok', {'tim': iter([])}))
+
+        self.assertEqual(1, text.count('\n'))
+        self.assertEqual([{'status': 'success', 'message': 'ok', 'data': {}}], lines)
+
+    def test_iterencode_ndjson_should_send_plain_data_in_header(self):
+        text, lines = self.read_lines(_iterencode_ndjson('ok', None))
+
+        self.assertEqual([{'status': 'success', 'message': 'ok', 'data': []}], lines)
+
+    def test_iterencode_ndjson_rows_should_not_contain_newlines(self):
+        text, lines = self.read_lines(_iterencode_ndjson('ok', iter([{'note': 'first\nsecond'}])))
+
+        self.assertEqual(2, len(lines))
+        self.assertEqual({'note': 'first\nsecond'}, lines[1])
+
+
+class TestChunked(TestCase):
+
+    def test_chunked_should_keep_the_content(self):
+        parts = ['x' * 1000 for _ in range(200)]
+
+        chunks = list(_chunked(iter(parts)))
+
+        self.assertEqual(''.join(parts), ''.join(chunks))
+        self.assertTrue(all(len(chunk) >= STREAM_CHUNK_SIZE for chunk in chunks[:-1]))
+
+    def test_chunked_should_yield_nothing_for_no_parts(self):
+        self.assertEqual([], list(_chunked(iter([]))))